@@ -29,6 +29,21 @@ def read_txt_file(filename, encoding):
         except AttributeError:
             raise IOError('Provided file can\'t be read')
 
+    return decode_txt(binary, encoding, filename)
+
+
+def decode_txt(binary, encoding, filename=None):
+    """
+    Decode the content of a text file.
+
+    Args:
+        binary (bytes): content of the text-file.
+        encoding (str): Encoding of the text-file (falls back to 'utf8', 'iso-8859-1' and 'windows-1252' if wrong).
+        filename (str or pathlib.Path): Path/filename to text-file (for the warning).
+
+    Returns:
+        str: Content of the text-file (without carriage returns).
+    """
     for e in (encoding, 'utf8', 'iso-8859-1', 'windows-1252'):
         try:
             return binary.decode(encoding=e).replace('\r', '')
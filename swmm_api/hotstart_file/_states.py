@@ -0,0 +1,280 @@
+"""
+States of the objects for a hotstart file, derived from the input file and the results of an out-file.
+
+The hotstart file stores the states in the internal units of SWMM (ft, cfs, ft²),
+independent of the flow unit of the model; the concentrations are in the units of the pollutants.
+"""
+
+import datetime
+
+import numpy as np
+
+from ..input_file import SEC
+from ..input_file.macros.collection import nodes_dict
+from ..input_file.sections.subcatch import InfiltrationGreenAmpt, InfiltrationCurveNumber
+from ..output_file.definitions import OBJECTS, VARIABLES
+from ..output_file.extract import _FLOW_UNITS_METRIC
+
+# flow conversion factor from cfs to the flow unit (``Qcf`` in SWMM)
+_FLOW_FACTORS = {'CFS': 1., 'GPM': 448.831, 'MGD': 0.64632, 'CMS': 0.02832, 'LPS': 28.317, 'MLD': 2.4466}
+
+_FT_PER_M = 1 / 0.3048
+_FT2_PER_ACRE = 43560.
+_FT2_PER_HA = 107639.104
+
+# Snowpack state at the start of a simulation: no snow, antecedent temperature at freezing (deg F), AWESI = 1
+_SNOWPACK_INITIAL = {'depth_snow': 0., 'depth_free_water_snow': 0., 'cold_content': 0.,
+                     'antecedent_temperature': 32., 'initial_AWESI': 1.}
+
+_BASE_DATE = datetime.datetime(1899, 12, 30)
+
+
+def _get_unit_factors(unit):
+    """
+    Get the factors to convert values in the units of the model to the internal units.
+
+    Args:
+        unit (str): flow unit of the model.
+
+    Returns:
+        tuple[float, float, float]: factor for flows (to cfs), lengths (to ft) and areas (to ft²)
+    """
+    if unit in _FLOW_UNITS_METRIC:
+        return 1 / _FLOW_FACTORS[unit], _FT_PER_M, _FT2_PER_HA
+    return 1 / _FLOW_FACTORS[unit], 1., _FT2_PER_ACRE
+
+
+def _is_missing(value):
+    return isinstance(value, str) or np.isnan(value)
+
+
+def _get_groundwater_parameters(inp, subcatchment, length_factor):
+    """
+    Get the groundwater parameters of a subcatchment (local values override the values of the aquifer).
+
+    Args:
+        inp (swmm_api.SwmmInput): inp-file-data.
+        subcatchment (str): label of the subcatchment.
+        length_factor (float): factor to convert the elevations to ft.
+
+    Returns:
+        dict[str, float]: elevations ``Esurf``, ``Ebot``, ``Egw`` (in ft), moisture content ``Umc`` and porosity ``Por``.
+    """
+    groundwater = next(gw for gw in inp[SEC.GROUNDWATER].values() if gw.subcatchment == subcatchment)
+    aquifer = inp[SEC.AQUIFERS][groundwater.aquifer]
+    parameters = {'Esurf': groundwater.Esurf, 'Por': aquifer.Por}
+    for key in ['Ebot', 'Egw', 'Umc']:
+        value = getattr(groundwater, key)
+        parameters[key] = getattr(aquifer, key) if _is_missing(value) else value
+    for key in ['Esurf', 'Ebot', 'Egw']:
+        parameters[key] = float(parameters[key]) * length_factor
+    return parameters
+
+
+def _get_max_infiltration_volume(inp, subcatchment, parameters, theta, elevation):
+    # maximum infiltration volume (ft) the upper zone can accept, relative to the pervious area
+    fraction_pervious = 1 - float(inp[SEC.SUBCATCHMENTS][subcatchment].imperviousness) / 100
+    if fraction_pervious <= 0:
+        return 0.
+    return max(parameters['Esurf'] - elevation, 0.) * (parameters['Por'] - theta) / fraction_pervious
+
+
+def set_initial_states(hst, inp, date):
+    """
+    Set the states of all objects as at the start of a simulation.
+
+    - ponded depths, runoff, flows and concentrations are zero.
+    - the infiltration, groundwater and snowpack states are the initial states of SWMM.
+    - the streets were last swept at ``date`` minus the days since the last sweeping of the landuse.
+
+    Args:
+        hst (swmm_api.SwmmHotstart): hotstart data with the layout of the model.
+        inp (swmm_api.SwmmInput): inp-file-data.
+        date (datetime.datetime): start of the simulation.
+    """
+    _, length_factor, _ = _get_unit_factors(hst.unit)
+    columns = hst.columns_subcatchment[1:]
+    values = hst.subcatchments_array
+    values[:] = 0
+    if 'theta' in columns:
+        values[~hst.has_groundwater, columns.index('theta'):columns.index('maxInfilVol') + 1] = np.nan
+    if 'plowable_depth_snow' in columns:
+        values[~hst.has_snowpack, columns.index('plowable_depth_snow'):columns.index('perv_initial_AWESI') + 1] = np.nan
+
+    for i, label in enumerate(hst.labels_subcatchment):
+        # Infiltration state
+        infiltration = inp[SEC.INFILTRATION][label] if SEC.INFILTRATION in inp else None
+        if isinstance(infiltration, InfiltrationGreenAmpt):
+            # IMD = initial moisture deficit
+            values[i, columns.index('Infiltration_0')] = infiltration.moisture_deficit_init
+        elif isinstance(infiltration, InfiltrationCurveNumber):
+            # S = Se = max. infiltration capacity (ft)
+            s_max = (1000 / float(infiltration.curve_no) - 10) / 12
+            values[i, columns.index('Infiltration_0')] = s_max
+            values[i, columns.index('Infiltration_4')] = s_max
+
+        if hst.has_groundwater[i]:
+            parameters = _get_groundwater_parameters(inp, label, length_factor)
+            values[i, columns.index('theta')] = parameters['Umc']
+            values[i, columns.index('bottomElev+lowerDepth')] = parameters['Egw']
+            values[i, columns.index('maxInfilVol')] = _get_max_infiltration_volume(inp, label, parameters,
+                                                                                   parameters['Umc'], parameters['Egw'])
+
+        if hst.has_snowpack[i]:
+            for field, value in _SNOWPACK_INITIAL.items():
+                for surface in ['plowable', 'imperv', 'perv']:
+                    values[i, columns.index(f'{surface}_{field}')] = value
+
+    for landuse in hst.landuses:
+        column = f'{landuse}_lastSwept'
+        if column in columns:
+            days_since_sweep = inp[SEC.LANDUSES][landuse].last_sweep
+            if _is_missing(days_since_sweep):
+                days_since_sweep = 0
+            values[:, columns.index(column)] = (date - _BASE_DATE) / datetime.timedelta(days=1) - days_since_sweep
+
+    hst.nodes_array[:] = 0
+    hst.storages_array[:] = 0
+    # setting of the links: fully open
+    hst.links_array[:] = 0
+    hst.links_array[:, hst.columns_link.index('setting') - 2] = 1
+
+
+def _get_period_values(out, kind, labels, variables, i_period):
+    """
+    Get the values of one period for the objects in the out-file.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: positions of the objects in ``labels`` which are in the out-file and
+            2D-array (objects x variables) with the values (NaN for variables not in the out-file).
+    """
+    available = set(out.labels[kind])
+    positions = np.array([i for i, label in enumerate(labels) if label in available], dtype=int)
+    values = np.full((positions.size, len(variables)), np.nan)
+    variables_available = [j for j, variable in enumerate(variables) if variable in out.variables[kind]]
+    if positions.size and variables_available:
+        columns = [(kind, labels[i], variables[j]) for i in positions for j in variables_available]
+        period = out._get_values(columns, i_period, 1)[0].astype('f8')
+        values[:, variables_available] = period.reshape(positions.size, len(variables_available))
+    return positions, values
+
+
+def _get_link_directions(hst, inp, positions, length_factor):
+    """
+    Get the direction of the links like SWMM (``Link.direction`` in ``link.c``).
+
+    With dynamic wave routing, SWMM reverses conduits with an adverse slope (upstream invert lower than the downstream
+    invert) and stores the flow of these conduits with the opposite sign as reported in the out-file.
+
+    Args:
+        hst (swmm_api.SwmmHotstart): hotstart data with the layout of the model.
+        inp (swmm_api.SwmmInput): inp-file-data.
+        positions (numpy.ndarray): positions of the links in the hotstart data.
+        length_factor (float): factor to convert the elevations to ft.
+
+    Returns:
+        numpy.ndarray: direction (``1`` or ``-1``) per link.
+    """
+    directions = np.ones(positions.size)
+    if (SEC.OPTIONS not in inp) or (str(inp.OPTIONS.get('FLOW_ROUTING', 'KINWAVE')).upper() != 'DYNWAVE'):
+        return directions
+
+    nodes = nodes_dict(inp)
+    offsets_as_elevation = str(inp.OPTIONS.get('LINK_OFFSETS', 'DEPTH')).upper() == 'ELEVATION'
+
+    def _get_invert(node, offset):
+        elevation = nodes[node].elevation
+        if _is_missing(offset):
+            return elevation
+        if offsets_as_elevation:
+            # negative offsets are set to zero by SWMM
+            return max(offset, elevation)
+        return elevation + max(offset, 0)
+
+    for j, i in enumerate(positions):
+        if hst.kind_link[i] != SEC.CONDUITS:
+            continue
+        conduit = inp[SEC.CONDUITS][hst.labels_link[i]]
+        if SEC.XSECTIONS in inp and hst.labels_link[i] in inp[SEC.XSECTIONS] and \
+                inp[SEC.XSECTIONS][hst.labels_link[i]].shape == 'DUMMY':
+            continue
+        drop = (_get_invert(conduit.from_node, conduit.offset_upstream)
+                - _get_invert(conduit.to_node, conduit.offset_downstream)) * length_factor
+        # drops below MIN_DELTA_Z (0.001 ft) are treated as positive minimal slope
+        if drop <= -0.001:
+            directions[j] = -1
+    return directions
+
+
+def _set_values(array, positions, columns, values, targets):
+    """Write the not-NaN values of the out-file into the state array."""
+    for j, target in enumerate(targets):
+        if target is None:
+            continue
+        column = values[:, j]
+        valid = ~np.isnan(column)
+        array[positions[valid], columns.index(target)] = column[valid]
+
+
+def set_out_states(hst, inp, out, i_period):
+    """
+    Set the states of the objects from the results of a period in an out-file.
+
+    - subcatchments: runoff, runoff concentrations and the groundwater state.
+    - nodes: depth, lateral inflow and concentrations.
+    - links: flow, depth, concentrations and the setting of pumps and regulators (``capacity``).
+
+    Objects or variables, which are not in the out-file, are kept.
+
+    Args:
+        hst (swmm_api.SwmmHotstart): hotstart data with the layout of the model.
+        inp (swmm_api.SwmmInput): inp-file-data.
+        out (swmm_api.SwmmOutput): out-file-data.
+        i_period (int): number of the period in the out-file.
+    """
+    flow_factor, length_factor, area_factor = _get_unit_factors(hst.unit)
+    pollutants = hst.pollutants
+
+    # ---
+    columns = hst.columns_subcatchment[1:]
+    variables = [VARIABLES.SUBCATCHMENT.RUNOFF, VARIABLES.SUBCATCHMENT.SOIL_MOISTURE,
+                 VARIABLES.SUBCATCHMENT.GW_ELEVATION, VARIABLES.SUBCATCHMENT.GW_OUTFLOW] + pollutants
+    positions, values = _get_period_values(out, OBJECTS.SUBCATCHMENT, hst.labels_subcatchment, variables, i_period)
+    values[:, 0] *= flow_factor
+    values[:, 2] *= length_factor
+    # groundwater flow is stored as flow per area
+    areas = np.array([float(inp[SEC.SUBCATCHMENTS][hst.labels_subcatchment[i]].area) for i in positions]) * area_factor
+    values[:, 3] *= flow_factor / areas
+    groundwater = hst.has_groundwater[positions]
+    values[~groundwater, 1:4] = np.nan
+    _set_values(hst.subcatchments_array, positions, columns, values,
+                ['runoff'] + (['theta', 'bottomElev+lowerDepth', 'newFlow'] if 'theta' in columns else [None] * 3)
+                + [f'runoff_{p}' if f'runoff_{p}' in columns else None for p in pollutants])
+
+    for i in positions[groundwater]:
+        label = hst.labels_subcatchment[i]
+        theta = hst.subcatchments_array[i, columns.index('theta')]
+        elevation = hst.subcatchments_array[i, columns.index('bottomElev+lowerDepth')]
+        hst.subcatchments_array[i, columns.index('maxInfilVol')] = _get_max_infiltration_volume(
+            inp, label, _get_groundwater_parameters(inp, label, length_factor), theta, elevation)
+
+    # ---
+    variables = [VARIABLES.NODE.DEPTH, VARIABLES.NODE.LATERAL_INFLOW] + pollutants
+    targets = ['depth', 'lateral_flow'] + pollutants
+    for array, labels, columns in ((hst.nodes_array, hst.labels_node, hst.columns_node),
+                                   (hst.storages_array, hst.labels_storage, hst.columns_storage)):
+        positions, values = _get_period_values(out, OBJECTS.NODE, labels, variables, i_period)
+        values[:, 0] *= length_factor
+        values[:, 1] *= flow_factor
+        _set_values(array, positions, columns[2:], values, targets)
+
+    # ---
+    variables = [VARIABLES.LINK.FLOW, VARIABLES.LINK.DEPTH, VARIABLES.LINK.CAPACITY] + pollutants
+    positions, values = _get_period_values(out, OBJECTS.LINK, hst.labels_link, variables, i_period)
+    # the out-file has the flow in the direction of the input, the hotstart file in the internal direction of SWMM
+    values[:, 0] *= flow_factor * _get_link_directions(hst, inp, positions, length_factor)
+    values[:, 1] *= length_factor
+    # capacity is the fraction filled for conduits and the control setting for the other links
+    is_conduit = np.array([hst.kind_link[i] == SEC.CONDUITS for i in positions], dtype=bool)
+    values[is_conduit, 2] = np.nan
+    _set_values(hst.links_array, positions, hst.columns_link[2:], values, ['flow', 'depth', 'setting'] + pollutants)
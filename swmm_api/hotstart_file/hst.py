@@ -1,27 +1,212 @@
+import struct
 from io import SEEK_SET
 
+import numpy as np
 import pandas as pd
 
 from .._io_helpers._read_bin import BinaryReader
 from ..input_file import SEC
-from ..output_file.extract import _FLOW_UNITS
+from ..output_file.extract import _FLOW_UNITS, SwmmExtractValueError
 
 _FILESTAMP = "SWMM5-HOTSTART4"
 
+_SUBAREAS = ['imperv_zero', 'imperv', 'perv']
+_SNOW_SURFACES = ['plowable', 'imperv', 'perv']
+_SNOW_VARIABLES = ['depth_snow', 'depth_free_water_snow', 'cold_content', 'antecedent_temperature', 'initial_AWESI']
+_GROUNDWATER_VARIABLES = ['theta', 'bottomElev+lowerDepth', 'newFlow', 'maxInfilVol']
+
+
+def _get_subcatchment_fields(groundwater, snowpack, pollutants, landuses):
+    """
+    Get the names of the values of a subcatchment record.
+
+    Args:
+        groundwater (bool): if the record has a groundwater block.
+        snowpack (bool): if the record has a snowpack block.
+        pollutants (list[str]): labels of the pollutants.
+        landuses (list[str]): labels of the landuses.
+
+    Returns:
+        list[str]: names of the values (all are doubles).
+    """
+    # Ponded depths for each sub-area & total runoff (4 elements)
+    #   impervious w/o depression storage
+    #   impervious w/ depression storage
+    #   pervious
+    fields = [*[f'depth_{s}' for s in _SUBAREAS], 'runoff']
+
+    # Infiltration state (max. of 6 elements)
+    # immer 6 elemente, aber nur die ersten belegt
+
+    #   HORTON:
+    #       tp present time on infiltration curve (sec)
+    #       Fe cumulative infiltration (ft)
+    #   GREEN_AMPT:
+    #       IMD current initial soil moisture deficit
+    #       F   current cumulative infiltrated volume (ft)
+    #       Fu  current upper zone infiltrated volume (ft)
+    #       Sat saturation flag
+    #       T   time until start of next rain event (sec)
+    #   CURVE_NUMBER:
+    #       S   current infiltration capacity (ft)
+    #       P   current cumulative precipitation (ft)
+    #       F   current cumulative infiltration (ft)
+    #       T   current inter-event time (sec)
+    #       Se  current event infiltration capacity (ft)
+    #       f   previous infiltration rate (ft/sec)
+    fields += [f'Infiltration_{i}' for i in range(6)]
+
+    # Groundwater state (4 elements)
+    #   theta
+    #   bottomElev + lowerDepth
+    #   newFlow
+    #   maxInfilVol
+    if groundwater:
+        fields += _GROUNDWATER_VARIABLES
+
+    # Snowpack state (5 elements for each of 3 snow surfaces)
+    #   depth_snow depth of snow pack (ft)
+    #   depth_free_water_snow    depth of free water in snow pack (ft)
+    #   cold_content cold content of snow pack
+    #   antecedent_temperature   antecedent temperature index (deg F)
+    #   initial_AWESI   initial AWESI of linear ADC
+    if snowpack:
+        fields += [f'{s}_{v}' for s in _SNOW_SURFACES for v in _SNOW_VARIABLES]
+
+    # Water quality
+    #   Runoff quality
+    #   Ponded quality
+    #   Buildup and when streets were last swept
+    if pollutants:
+        for v in ['runoff', 'ponded']:
+            fields += [f'{v}_{p}' for p in pollutants]
+
+        for landuse in landuses:
+            fields += [f'{landuse}_{p}_buildup' for p in pollutants]
+            fields += [f'{landuse}_lastSwept']
+    return fields
+
+
+def _get_node_fields(storage, pollutants):
+    """
+    Get the names of the values of a node record.
+
+    Args:
+        storage (bool): if the node is a storage (with the hydraulic residence time).
+        pollutants (list[str]): labels of the pollutants.
+
+    Returns:
+        list[str]: names of the values (all are floats).
+    """
+    fields = ['depth', 'lateral_flow']
+    if storage:
+        fields += ['hydraulic_residence_time']
+    return fields + pollutants
+
+
+def _get_link_fields(pollutants):
+    """
+    Get the names of the values of a link record.
+
+    Args:
+        pollutants (list[str]): labels of the pollutants.
+
+    Returns:
+        list[str]: names of the values (all are floats).
+    """
+    return ['flow', 'depth', 'setting'] + pollutants
+
+
+def _get_dtype(fields, base):
+    # structured dtype of a record
+    return np.dtype([(f, base) for f in fields])
+
+
+def _decode_segments(buffer, offset, layouts, dtypes, columns):
+    """
+    Decode records with a varying layout in bulk.
+
+    Consecutive records with the same layout are decoded at once as structured array.
+
+    Args:
+        buffer (bytes): raw data.
+        offset (int): position of the first record in the buffer.
+        layouts (numpy.ndarray): layout number of each record.
+        dtypes (dict[int, numpy.dtype]): structured dtype of each layout.
+        columns (list[str]): names of the columns of the result (fields missing in a layout are NaN).
+
+    Returns:
+        tuple[numpy.ndarray, int]: 2D-array (records x columns) and the position after the last record in the buffer.
+    """
+    base = dtypes[0][0] if dtypes else np.dtype('f8')
+    values = np.full((layouts.size, len(columns)), np.nan, dtype=base)
+    column_index = {c: j for j, c in enumerate(columns)}
+
+    bounds = np.r_[0, np.nonzero(np.diff(layouts))[0] + 1, layouts.size] if layouts.size else []
+    for i, j in zip(bounds[:-1], bounds[1:]):
+        dtype = dtypes[layouts[i]]
+        records = np.frombuffer(buffer, dtype=dtype, count=j - i, offset=offset)
+        positions = [column_index[f] for f in dtype.names]
+        values[i:j, positions] = records.view(base).reshape(j - i, len(dtype.names))
+        offset += dtype.itemsize * (j - i)
+    return values, offset
+
+
+def _encode_segments(values, layouts, dtypes, columns):
+    """
+    Encode records with a varying layout in bulk (reverse of :func:`_decode_segments`).
+
+    Args:
+        values (numpy.ndarray): 2D-array (records x columns).
+        layouts (numpy.ndarray): layout number of each record.
+        dtypes (dict[int, numpy.dtype]): structured dtype of each layout.
+        columns (list[str]): names of the columns of ``values``.
+
+    Returns:
+        bytes: raw data of all records.
+    """
+    column_index = {c: j for j, c in enumerate(columns)}
+    parts = []
+    bounds = np.r_[0, np.nonzero(np.diff(layouts))[0] + 1, layouts.size] if layouts.size else []
+    for i, j in zip(bounds[:-1], bounds[1:]):
+        dtype = dtypes[layouts[i]]
+        base = dtype[0]
+        positions = [column_index[f] for f in dtype.names]
+        records = np.ascontiguousarray(values[i:j, positions], dtype=base)
+        parts.append(records.view(dtype).tobytes())
+    return b''.join(parts)
+
 
 class SwmmHotstart(BinaryReader):
     """
     SWMM-hotstart-file class.
 
+    The records of all objects are decoded in bulk as numpy arrays.
+    The layout of the subcatchment records depends on the groundwater, snowpack, pollutants and landuses;
+    objects without the optional blocks have NaN in these columns.
+
+    The data can be edited (``*_frame`` properties or ``*_array`` attributes) and written with :meth:`write_file`.
+    Use :meth:`from_out` to create the data from a timestep of an out-file.
+
     Attributes:
         columns_link (list[str]): columns_link
         columns_node (list[str]): columns_node
         columns_storage (list[str]): columns_storage
         columns_subcatchment (list[str]): columns_subcatchment
-        links (list[tuple]): links
-        nodes (list[tuple]): nodes
-        storages (list[tuple]): storages
-        subcatchments (list[tuple]): subcatchments
+        subcatchments_array (numpy.ndarray): values of the subcatchments (float64; columns as ``columns_subcatchment[1:]``)
+        nodes_array (numpy.ndarray): values of the nodes without storages (float32; columns as ``columns_node[2:]``)
+        storages_array (numpy.ndarray): values of the storages (float32; columns as ``columns_storage[2:]``)
+        links_array (numpy.ndarray): values of the links (float32; columns as ``columns_link[2:]``)
+        labels_subcatchment (list[str]): labels of the subcatchments.
+        has_groundwater (numpy.ndarray): if the subcatchments have a groundwater block.
+        has_snowpack (numpy.ndarray): if the subcatchments have a snowpack block.
+        labels_node (list[str]): labels of the nodes (without storages).
+        kind_node (list[str]): section of the nodes (without storages).
+        labels_storage (list[str]): labels of the storages.
+        labels_link (list[str]): labels of the links.
+        kind_link (list[str]): section of the links.
+        pollutants (list[str]): labels of the pollutants.
+        landuses (list[str]): labels of the landuses.
         unit (str): unit
         filename (str): Path to the hotstart-file (.hst).
     """
@@ -44,13 +229,41 @@ class SwmmHotstart(BinaryReader):
         n_links = self._next()
         n_pollutants = self._next()
         i_flow_unit = self._next()
-        self.unit = _FLOW_UNITS[i_flow_unit]
+        self._set_model(inp, _FLOW_UNITS[i_flow_unit])
+
+        # all records at once
+        buffer = self.fp.read()
+
+        # ---------------------------------------------------------------------------
+        # Runoff
+        layouts, dtypes = self._get_subcatchment_layouts()
+        self.subcatchments_array, offset = _decode_segments(buffer, 0, layouts, dtypes, self.columns_subcatchment[1:])
+
+        # ---------------------------------------------------------------------------
+        # Routing
+        layouts, dtypes = self._get_node_layouts()
+        nodes_array, offset = _decode_segments(buffer, offset, layouts, dtypes, self.columns_storage[2:])
+        self._split_nodes(nodes_array)
+
+        dtypes = {0: _get_dtype(_get_link_fields(self.pollutants), '<f4')}
+        self.links_array, offset = _decode_segments(buffer, offset, np.zeros(n_links, dtype=int), dtypes,
+                                                    self.columns_link[2:])
+
+    def _set_model(self, inp, unit):
+        """
+        Set the labels of the objects and the layout of the records from the inp-file-data.
+
+        Args:
+            inp (swmm_api.SwmmInput): inp-file-data.
+            unit (str): flow unit of the model.
+        """
+        self.unit = unit
 
         # ---------
         # get inp-file-data information
-        pollutants = list(inp.POLLUTANTS.keys()) if inp.POLLUTANTS else []
-        landuses = list(inp.LANDUSES.keys()) if inp.LANDUSES else []
-        labels_subcatchments = list(inp.SUBCATCHMENTS.keys()) if inp.SUBCATCHMENTS else []
+        self.pollutants = list(inp.POLLUTANTS.keys()) if inp.POLLUTANTS else []
+        self.landuses = list(inp.LANDUSES.keys()) if inp.LANDUSES else []
+        self.labels_subcatchment = list(inp.SUBCATCHMENTS.keys()) if inp.SUBCATCHMENTS else []
 
         kind_nodes = []
         node_labels = []
@@ -60,141 +273,196 @@ class SwmmHotstart(BinaryReader):
                 kind_nodes += [sec] * len(inp[sec].keys())
                 node_labels += list(inp[sec].keys())
 
-        kind_links = []
-        links_labels = []
+        self.kind_link = []
+        self.labels_link = []
         for sec in inp._original_section_order:
             if sec in [SEC.CONDUITS, SEC.ORIFICES, SEC.PUMPS, SEC.WEIRS, SEC. OUTLETS] and sec in inp:
-                kind_links += [sec] * len(inp[sec].keys())
-                links_labels += list(inp[sec].keys())
-
-        # ---------------------------------------------------------------------------
-        # Runoff
+                self.kind_link += [sec] * len(inp[sec].keys())
+                self.labels_link += list(inp[sec].keys())
 
-        subareas = ['imperv_zero', 'imperv', 'perv']
-        self.columns_subcatchment = ['label', *[f'depth_{s}' for s in subareas], 'runoff']
-        # Infiltration
-        self.columns_subcatchment += [f'Infiltration_{i}' for i in range(6)]
+        self._is_storage = np.array([k == SEC.STORAGE for k in kind_nodes], dtype=bool)
+        self.labels_node = [label for label, storage in zip(node_labels, self._is_storage) if not storage]
+        self.kind_node = [kind for kind, storage in zip(kind_nodes, self._is_storage) if not storage]
+        self.labels_storage = [label for label, storage in zip(node_labels, self._is_storage) if storage]
 
+        # ---------
+        # optional blocks of the subcatchments
+        subcatchments_groundwater = set()
         if SEC.GROUNDWATER in inp:
-            self.columns_subcatchment += ['theta', 'bottomElev+lowerDepth', 'newFlow', 'maxInfilVol']
+            subcatchments_groundwater = {gw.subcatchment for gw in inp[SEC.GROUNDWATER].values()}
+        self.has_groundwater = np.array([sc in subcatchments_groundwater for sc in self.labels_subcatchment], dtype=bool)
 
+        self.has_snowpack = np.zeros(len(self.labels_subcatchment), dtype=bool)
         if SEC.SNOWPACKS in inp:
-            for s in [subareas]:
-                for v in ['depth_snow', 'depth_free_water_snow', 'cold_content',
-                                              'antecedent_temperature', 'initial_AWESI']:
-
-                    self.columns_subcatchment.append(f'{s}_{v}')
-
-        if n_pollutants:
-            for v in ['runoff', 'ponded']:
-                for i_pollutant in range(n_pollutants):
-                    self.columns_subcatchment.append(f'{v}_{pollutants[i_pollutant]}')
-
-            for i_landuse in range(n_landuse):
-                self.columns_subcatchment += [f'{landuses[i_landuse]}_{pollutants[i_pollutant]}_buildup' for i_pollutant in range(n_pollutants)]
-                self.columns_subcatchment += [f'{landuses[i_landuse]}_lastSwept']
-
-        self.subcatchments = []
-        for i_sc in range(n_subcatchments):
-            subcatchment = [labels_subcatchments[i_sc]]
-            # Ponded depths for each sub-area & total runoff (4 elements)
-            #   impervious w/o depression storage
-            #   impervious w/ depression storage
-            #   pervious
-            subcatchment += self._next_doubles(4)
-
-            # Infiltration state (max. of 6 elements)
-            # immer 6 elemente, aber nur die ersten belegt
-
-            #   HORTON:
-            #       tp present time on infiltration curve (sec)
-            #       Fe cumulative infiltration (ft)
-            #   GREEN_AMPT:
-            #       IMD current initial soil moisture deficit
-            #       F   current cumulative infiltrated volume (ft)
-            #       Fu  current upper zone infiltrated volume (ft)
-            #       Sat saturation flag
-            #       T   time until start of next rain event (sec)
-            #   CURVE_NUMBER:
-            #       S   current infiltration capacity (ft)
-            #       P   current cumulative precipitation (ft)
-            #       F   current cumulative infiltration (ft)
-            #       T   current inter-event time (sec)
-            #       Se  current event infiltration capacity (ft)
-            #       f   previous infiltration rate (ft/sec)
-
-            subcatchment += self._next_doubles(6)
-
-            # Groundwater state (4 elements)
-            if SEC.GROUNDWATER in inp:
-                if labels_subcatchments[i_sc] in inp[SEC.GROUNDWATER]:
-                    # theta
-                    # bottomElev + lowerDepth
-                    # newFlow
-                    # maxInfilVol
-                    subcatchment += self._next_doubles(4)
-                else:
-                    subcatchment += [None] * 4
-
-            # Snowpack state (5 elements for each of 3 snow surfaces)
-            if SEC.SNOWPACKS in inp:
-                if labels_subcatchments[i_sc] in inp[SEC.SNOWPACKS]:
-                    for i_snow_surface in range(3):
-                        # depth_snow depth of snow pack (ft)
-                        # depth_free_water_snow    depth of free water in snow pack (ft)
-                        # cold_content cold content of snow pack
-                        # antecedent_temperature   antecedent temperature index (deg F)
-                        # initial_AWESI   initial AWESI of linear ADC
-                        subcatchment += self._next_doubles(5)
-                else:
-                    subcatchment += [None] * 3*5
-
-            if n_pollutants:
-                # Water quality
-                #   Runoff quality
-                #   Ponded quality
-                #   Buildup and when streets were last swept
-                subcatchment += self._next_doubles(2*n_pollutants)
-
-                for i_landuse in range(n_landuse):
-                    subcatchment += self._next_doubles(n_pollutants + 1)
-
-            self.subcatchments.append(subcatchment)
+            self.has_snowpack = np.array([isinstance(inp.SUBCATCHMENTS[sc].snow_pack, str)
+                                          for sc in self.labels_subcatchment], dtype=bool)
+
+        self.columns_subcatchment = ['label'] + _get_subcatchment_fields(SEC.GROUNDWATER in inp, SEC.SNOWPACKS in inp,
+                                                                         self.pollutants, self.landuses)
+        self.columns_node = ['label', 'kind', 'depth', 'lateral_flow'] + self.pollutants
+        self.columns_storage = ['label', 'kind', 'depth', 'lateral_flow', 'hydraulic_residence_time'] + self.pollutants
+        self.columns_link = ['label', 'kind', 'flow', 'depth', 'setting'] + self.pollutants
+
+    def _get_subcatchment_layouts(self):
+        # layout number: bit 1 = groundwater, bit 2 = snowpack
+        layouts = self.has_groundwater.astype(int) + 2 * self.has_snowpack.astype(int)
+        dtypes = {layout: _get_dtype(_get_subcatchment_fields(bool(layout & 1), bool(layout & 2),
+                                                              self.pollutants, self.landuses), '<f8')
+                  for layout in range(4)}
+        return layouts, dtypes
+
+    def _get_node_layouts(self):
+        dtypes = {int(storage): _get_dtype(_get_node_fields(storage, self.pollutants), '<f4')
+                  for storage in (False, True)}
+        return self._is_storage.astype(int), dtypes
+
+    def _split_nodes(self, nodes_array):
+        # all nodes (with the columns of the storages) -> nodes and storages
+        self.nodes_array = np.delete(nodes_array[~self._is_storage],
+                                     self.columns_storage.index('hydraulic_residence_time') - 2, axis=1)
+        self.storages_array = nodes_array[self._is_storage]
+
+    def _join_nodes(self):
+        # nodes and storages -> all nodes (with the columns of the storages)
+        nodes_array = np.full((self._is_storage.size, len(self.columns_storage) - 2), np.nan, dtype='f4')
+        nodes_array[~self._is_storage] = np.insert(self.nodes_array,
+                                                   self.columns_storage.index('hydraulic_residence_time') - 2,
+                                                   np.nan, axis=1)
+        nodes_array[self._is_storage] = self.storages_array
+        return nodes_array
+
+    @classmethod
+    def from_out(cls, out, inp, time=None, base=None):
+        """
+        Create the hotstart data from the results of a timestep in an out-file.
 
-        # ---------------------------------------------------------------------------
-        # Routing
-        self.columns_node = ['label', 'kind', 'depth', 'lateral_flow'] + pollutants
-        self.columns_storage = ['label', 'kind', 'depth', 'lateral_flow', 'hydraulic_residence_time'] + pollutants
-
-        self.nodes = []
-        self.storages = []
-
-        for i_node in range(n_nodes):
-            if kind_nodes[i_node] == SEC.STORAGE:
-                # if is storage
-                # read 3 Parameters
-                #   depth
-                #   lateral_flow
-                #   hydraulic_residence_time
-                # + Pollutants
-                self.storages.append((node_labels[i_node], kind_nodes[i_node], *self._next_floats(n_pollutants + 3)))
-            else:
-                # read 2 Parameters
-                #   depth
-                #   lateral_flow
-                #  + Pollutants
-                self.nodes.append((node_labels[i_node], kind_nodes[i_node], *self._next_floats(n_pollutants + 2)))
-
-        self.columns_link = ['label', 'kind', 'flow', 'depth', 'setting'] + pollutants
-
-        self.links = []
-        for i_link in range(n_links):
-            # read 3 Parameters
-            #   flow
-            #   depth
-            #   setting
-            #  + Pollutants
-            self.links.append((links_labels[i_link], kind_links[i_link], *self._next_floats(n_pollutants + 3)))
+        Used to seed the runs of many scenarios with the state at the end of a single spin-up run.
+        The out-file must be created with the same model (same objects, pollutants and landuses).
+
+        The following states are taken from the out-file:
+
+        - subcatchments: runoff, runoff concentrations and the groundwater state (soil moisture, elevation, flow).
+        - nodes and storages: depth, lateral inflow and concentrations.
+        - links: flow, depth, concentrations and the setting of pumps and regulators.
+          The flow of conduits with an adverse slope is reversed like in SWMM (with dynamic wave routing).
+
+        All other states (i.e. infiltration, snowpack, buildup, ponded depths, hydraulic residence time) are taken from
+        the ``base`` hotstart or are the initial states of a simulation starting at the timestep.
+        Objects or variables, which are not reported in the out-file, are also taken from ``base`` or are initial states.
+
+        Args:
+            out (swmm_api.SwmmOutput): out-file-data.
+            inp (swmm_api.SwmmInput): inp-file-data of the model.
+            time (datetime.datetime): datetime of the timestep. Default: last timestep.
+                If there is no timestep at this datetime, the last timestep before it is used.
+            base (SwmmHotstart): hotstart data of the same model (i.e. saved by SWMM at the end of the spin-up run)
+                for the states which are not in the out-file.
+
+        Returns:
+            SwmmHotstart: hotstart data (write it with :meth:`write_file`).
+        """
+        from ._states import set_initial_states, set_out_states
+
+        i_period = out._get_period_range(end=time)[1] - 1
+        if i_period < 0:
+            raise SwmmExtractValueError(f'There is no timestep in the out-file at or before "{time}".')
+
+        hst = cls.__new__(cls)
+        hst.fp = None
+        hst.filename = '<out>'
+        hst.encoding = out.encoding
+        hst._set_model(inp, inp.OPTIONS.get('FLOW_UNITS', 'CFS') if SEC.OPTIONS in inp else 'CFS')
+
+        hst.subcatchments_array = np.zeros((len(hst.labels_subcatchment), len(hst.columns_subcatchment) - 1))
+        hst._split_nodes(np.zeros((hst._is_storage.size, len(hst.columns_storage) - 2), dtype='f4'))
+        hst.links_array = np.zeros((len(hst.labels_link), len(hst.columns_link) - 2), dtype='f4')
+
+        if base is None:
+            set_initial_states(hst, inp, out.start_date + i_period * out.report_interval)
+        else:
+            for attr in ['labels_subcatchment', 'labels_node', 'labels_storage', 'labels_link', 'columns_subcatchment',
+                         'columns_node', 'columns_link']:
+                if getattr(base, attr) != getattr(hst, attr):
+                    raise SwmmExtractValueError(f'The base hotstart data doesn\'t fit the model ({attr}).')
+            for attr in ['subcatchments_array', 'nodes_array', 'storages_array', 'links_array']:
+                getattr(hst, attr)[:] = getattr(base, attr)
+
+        set_out_states(hst, inp, out, i_period)
+        return hst
+
+    def write_file(self, filename):
+        """
+        Write the data as SWMM binary hotstart file (___.hst).
+
+        Edit the data before with the ``*_frame`` properties (i.e. ``hst.nodes_frame = frame``)
+        or directly in the ``*_array`` attributes.
+
+        Args:
+            filename (str | Path): Path to the new hotstart-file.
+        """
+        with open(filename, 'wb') as fp:
+            fp.write(_FILESTAMP.encode())
+            fp.write(struct.pack('<6i', len(self.labels_subcatchment), len(self.landuses), self._is_storage.size,
+                                 len(self.labels_link), len(self.pollutants), _FLOW_UNITS.index(self.unit)))
+
+            layouts, dtypes = self._get_subcatchment_layouts()
+            fp.write(_encode_segments(self.subcatchments_array, layouts, dtypes, self.columns_subcatchment[1:]))
+
+            layouts, dtypes = self._get_node_layouts()
+            fp.write(_encode_segments(self._join_nodes(), layouts, dtypes, self.columns_storage[2:]))
+
+            fp.write(np.ascontiguousarray(self.links_array, dtype='<f4').tobytes())
+
+    @property
+    def subcatchments(self):
+        """list[tuple]: initial values of the subcatchments as records (None for missing groundwater or snowpack values)."""
+        records = self.subcatchments_array.astype(object)
+        columns = self.columns_subcatchment[1:]
+        for mask, fields in ((self.has_groundwater, _GROUNDWATER_VARIABLES),
+                             (self.has_snowpack, [f'{s}_{v}' for s in _SNOW_SURFACES for v in _SNOW_VARIABLES])):
+            positions = [columns.index(f) for f in fields if f in columns]
+            if positions:
+                records[np.ix_(~mask, positions)] = None
+        return [(label, *r) for label, r in zip(self.labels_subcatchment, records.tolist())]
+
+    @property
+    def nodes(self):
+        """list[tuple]: initial values of the nodes (without storages) as records."""
+        return [(label, kind, *r) for label, kind, r in zip(self.labels_node, self.kind_node, self.nodes_array.tolist())]
+
+    @property
+    def storages(self):
+        """list[tuple]: initial values of the storages as records."""
+        return [(label, SEC.STORAGE, *r) for label, r in zip(self.labels_storage, self.storages_array.tolist())]
+
+    @property
+    def links(self):
+        """list[tuple]: initial values of the links as records."""
+        return [(label, kind, *r) for label, kind, r in zip(self.labels_link, self.kind_link, self.links_array.tolist())]
+
+    @staticmethod
+    def _to_frame(values, columns, **labels):
+        df = pd.DataFrame(values, columns=columns[len(labels):])
+        for i, (column, values) in enumerate(labels.items()):
+            df.insert(i, column, values)
+        return df
+
+    @staticmethod
+    def _from_frame(array, labels, columns, frame):
+        """
+        Write the values of an edited table into the array.
+
+        Only the rows (matched by the ``label`` column) and the columns in the table are changed.
+        """
+        if 'label' in frame.columns:
+            frame = frame.set_index('label')
+        position = {label: i for i, label in enumerate(labels)}
+        unknown = [label for label in frame.index if label not in position]
+        if unknown:
+            raise KeyError(f'Unknown objects in the table: {unknown}')
+        frame_columns = [c for c in frame.columns if c in columns]
+        rows = [position[label] for label in frame.index]
+        array[np.ix_(rows, [columns.index(c) for c in frame_columns])] = frame[frame_columns].to_numpy(dtype=array.dtype)
 
     @property
     def links_frame(self):
@@ -205,9 +473,11 @@ class SwmmHotstart(BinaryReader):
         Returns:
             pandas.DataFrame: table with the initial values of all links.
         """
-        df = pd.DataFrame.from_records(self.links)
-        df.columns = self.columns_link
-        return df
+        return self._to_frame(self.links_array, self.columns_link, label=self.labels_link, kind=self.kind_link)
+
+    @links_frame.setter
+    def links_frame(self, frame):
+        self._from_frame(self.links_array, self.labels_link, self.columns_link[2:], frame)
 
     @property
     def nodes_frame(self):
@@ -218,9 +488,11 @@ class SwmmHotstart(BinaryReader):
         Returns:
             pandas.DataFrame: table with the initial values of all nodes.
         """
-        df = pd.DataFrame.from_records(self.nodes)
-        df.columns = self.columns_node
-        return df
+        return self._to_frame(self.nodes_array, self.columns_node, label=self.labels_node, kind=self.kind_node)
+
+    @nodes_frame.setter
+    def nodes_frame(self, frame):
+        self._from_frame(self.nodes_array, self.labels_node, self.columns_node[2:], frame)
 
     @property
     def storages_frame(self):
@@ -231,9 +503,12 @@ class SwmmHotstart(BinaryReader):
         Returns:
             pandas.DataFrame: table with the initial values of all storages
         """
-        df = pd.DataFrame.from_records(self.storages)
-        df.columns = self.columns_storage
-        return df
+        return self._to_frame(self.storages_array, self.columns_storage, label=self.labels_storage,
+                              kind=[SEC.STORAGE] * len(self.labels_storage))
+
+    @storages_frame.setter
+    def storages_frame(self, frame):
+        self._from_frame(self.storages_array, self.labels_storage, self.columns_storage[2:], frame)
 
     @property
     def subcatchments_frame(self):
@@ -244,9 +519,11 @@ class SwmmHotstart(BinaryReader):
         Returns:
             pandas.DataFrame: table with the initial values of all subcatchments.
         """
-        df = pd.DataFrame.from_records(self.subcatchments)
-        df.columns = self.columns_subcatchment
-        return df
+        return self._to_frame(self.subcatchments_array, self.columns_subcatchment, label=self.labels_subcatchment)
+
+    @subcatchments_frame.setter
+    def subcatchments_frame(self, frame):
+        self._from_frame(self.subcatchments_array, self.labels_subcatchment, self.columns_subcatchment[1:], frame)
 
 
 read_hst_file = SwmmHotstart
@@ -1,4 +1,9 @@
 from .out import read_out_file, SwmmOutput, out2frame
+from .ensemble import SwmmOutputEnsemble
+from .compare import compare_out_files
+from .result import SwmmOutputResult
+from .shared import SwmmOutputSharedResult
+from .async_out import AsyncSwmmOutput
 from .definitions import VARIABLES, OBJECTS
 from . import definitions as OUT
 from . import parquet_helpers
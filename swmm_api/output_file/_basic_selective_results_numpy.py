@@ -0,0 +1,161 @@
+import mmap
+from io import SEEK_SET, BytesIO
+
+import numpy as np
+from tqdm import tqdm
+
+_RECORDSIZE = 4
+_CHUNK_BYTES = 2 ** 26  # read about 64 MB of the results block at a time
+_SPARSE_BYTES_PER_RANGE = 2 ** 16  # read the ranges separately if they are on average further apart than 64 kB
+
+
+def _get_contiguous_ranges(offset_list):
+    """
+    Plan the reading of the requested records as a minimal set of contiguous ranges.
+
+    Adjacent records (i.e. the variables of the same object) are merged into one range and duplicates are removed.
+
+    Args:
+        offset_list (list[int]): byte offsets of the requested records relative to the start of a period.
+
+    Returns:
+        tuple[list[tuple[int, int]], numpy.ndarray]: list of record ranges (start, stop)
+            and the position of each requested record in the concatenation of all ranges.
+    """
+    record_index = np.asarray(offset_list, dtype=np.intp) // _RECORDSIZE
+    unique, inverse = np.unique(record_index, return_inverse=True)
+    if unique.size == 0:
+        return [], inverse
+    breaks = np.nonzero(np.diff(unique) != 1)[0] + 1
+    starts = unique[np.r_[0, breaks]]
+    stops = unique[np.r_[breaks - 1, unique.size - 1]] + 1
+    return list(zip(starts.tolist(), stops.tolist())), inverse
+
+
+def _get_rows_per_chunk(bytes_per_period, chunk_bytes=_CHUNK_BYTES):
+    """number of periods (=rows) which fit in one chunk (at least one)."""
+    return max(int(chunk_bytes // bytes_per_period), 1)
+
+
+def _map_results(fp, pos_start_output: int, n_periods: int, bytes_per_period: int):
+    """
+    Get the results block as memory-mapped 2D-array without reading it.
+
+    Args:
+        fp (BytesIO): Stream of the open out-file.
+        pos_start_output (int): position of the first period.
+        n_periods (int): number of periods.
+        bytes_per_period (int): number of bytes for one period.
+
+    Returns:
+        numpy.ndarray | None: 2D-array (periods x records) with float32 values
+            (fewer periods if the file is incomplete) or None if the stream can't be mapped.
+    """
+    try:
+        buffer = fp.getbuffer()  # BytesIO
+    except AttributeError:
+        try:
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            return None
+    n_records = bytes_per_period // _RECORDSIZE
+    n_periods = max(min(n_periods, (len(buffer) - pos_start_output) // bytes_per_period), 0)
+    if n_periods == 0:
+        return np.empty((0, n_records), dtype='f4')
+    return np.frombuffer(buffer, dtype='f4', count=n_periods * n_records,
+                         offset=pos_start_output).reshape(n_periods, n_records)
+
+
+def _iter_selective_results(fp: BytesIO, offset_list: list, pos_start_output: int,
+                            n_periods: int, bytes_per_period: int, rows: int = None):
+    """
+    Iterate over the results block in chunks of periods and gather the requested records.
+
+    The requested records are merged into contiguous ranges (see :func:`_get_contiguous_ranges`).
+    If the ranges are close together, every chunk is read at once (as contiguous block of periods)
+    into a reused buffer and the ranges are sliced out of it.
+    If the ranges are far apart (huge models and few requested columns), the file is memory-mapped
+    and the records are gathered at once for all periods of a chunk, so only the pages with the ranges are read.
+
+    Args:
+        fp (BytesIO): Stream of the open out-file.
+        offset_list (list[int]): byte offsets of the requested records relative to the start of a period.
+        pos_start_output (int): position of the first period to read.
+        n_periods (int): number of periods to read.
+        bytes_per_period (int): number of bytes for one period.
+        rows (int): number of periods read at once. Default: as many as fit in about 64 MB.
+
+    Yields:
+        numpy.ndarray: 2D-array (periods x columns) with float32 values.
+            If the file is incomplete, the last array has fewer rows and the iteration stops.
+    """
+    ranges, inverse = _get_contiguous_ranges(offset_list)
+    if not ranges:
+        return
+
+    n_records = bytes_per_period // _RECORDSIZE
+    n_records_ranges = sum(stop - start for start, stop in ranges)
+
+    # if the ranges are read in order, the final reordering can be skipped
+    if np.array_equal(inverse, np.arange(n_records_ranges)):
+        inverse = None
+
+    if rows is None:
+        rows = _get_rows_per_chunk(bytes_per_period)
+    rows = max(min(rows, n_periods), 1)
+
+    results = None
+    if bytes_per_period > len(ranges) * _SPARSE_BYTES_PER_RANGE:
+        results = _map_results(fp, pos_start_output, n_periods, bytes_per_period)
+
+    if results is not None:
+        records = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        if inverse is not None:
+            records = records[inverse]
+        for i in range(0, results.shape[0], rows):
+            yield results[i:i + rows, records]  # fancy indexing -> copy of the records
+        return
+
+    buffer = np.empty(rows * n_records, dtype='f4')
+    fp.seek(pos_start_output, SEEK_SET)
+
+    for i in range(0, n_periods, rows):
+        n_rows = min(rows, n_periods - i)
+
+        n_rows_read = (fp.readinto(buffer[:n_rows * n_records]) or 0) // bytes_per_period
+        if n_rows_read == 0:
+            break
+
+        block = buffer[:n_rows_read * n_records].reshape(n_rows_read, n_records)
+        if len(ranges) == 1:
+            start, stop = ranges[0]
+            chunk = block[:, start:stop].copy()  # copy -> the buffer can be reused for the next chunk
+        else:
+            chunk = np.concatenate([block[:, start:stop] for start, stop in ranges], axis=1)
+
+        yield chunk if inverse is None else chunk[:, inverse]
+
+        if n_rows_read < n_rows:
+            break
+
+
+def _get_selective_results(fp: BytesIO, label_list: list, offset_list: list, pos_start_output: int,
+                           n_periods: int, bytes_per_period: int, progress_desc: str, show_progress: bool):
+    values = np.empty((n_periods, len(offset_list)), dtype='f4')
+
+    if show_progress:
+        progress = tqdm(total=n_periods, desc=progress_desc)
+    else:
+        progress = None
+
+    n_rows_read = 0
+    for chunk in _iter_selective_results(fp, offset_list, pos_start_output, n_periods, bytes_per_period):
+        values[n_rows_read:n_rows_read + chunk.shape[0]] = chunk
+        n_rows_read += chunk.shape[0]
+        if progress is not None:
+            progress.update(chunk.shape[0])
+
+    if progress is not None:
+        progress.close()
+
+    return {label: values[:n_rows_read, i] for i, label in enumerate(label_list)}
@@ -0,0 +1,168 @@
+"""
+Partitioned (hive-style) Parquet dataset of the results of an out-file.
+
+Layout:
+    <path>/kind=<kind>/variable=<variable>/[year=<year>/]part-<chunk>.parquet
+
+Each file is a table in long format with the columns ``datetime``, ``label`` and ``value``,
+sorted by the label and the datetime, so the row group statistics of the label can be used to skip data.
+All files share the same schema, so the whole directory is one dataset for Arrow-compatible engines
+(i.e. :func:`pyarrow.dataset.dataset` with ``partitioning='hive'``, DuckDB, Spark, polars).
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+def _get_partitions(columns):
+    """
+    Group the columns by kind and variable.
+
+    Args:
+        columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+
+    Returns:
+        dict[tuple[str, str], tuple[list[str], numpy.ndarray]]: labels and column positions per (kind, variable).
+    """
+    partitions = {}
+    for j, (kind, label, variable) in enumerate(columns):
+        labels, positions = partitions.setdefault((kind, variable), ([], []))
+        labels.append(label)
+        positions.append(j)
+    return {key: (labels, np.array(positions)) for key, (labels, positions) in partitions.items()}
+
+
+def _iter_parts(chunks, rows):
+    """
+    Regroup the chunks of periods into parts with a fixed number of periods.
+
+    The chunks are read in the size which fits the whole period of the out-file,
+    but the size of the parts only depends on the selected columns.
+
+    Args:
+        chunks (collections.abc.Iterable[tuple[int, numpy.ndarray]]): number of the first period and the 2D-array of the chunk.
+        rows (int): number of periods per part (the last part can have fewer).
+
+    Yields:
+        tuple[int, numpy.ndarray]: number of the first period in the part and the 2D-array (periods x columns).
+    """
+    pending = []
+    n_pending = 0
+    i_part = None
+    for i_period, values in chunks:
+        if i_part is None:
+            i_part = i_period
+        pending.append(values)
+        n_pending += values.shape[0]
+        if n_pending < rows:
+            continue
+        values = pending[0] if len(pending) == 1 else np.concatenate(pending)
+        n_full = n_pending - n_pending % rows
+        for i in range(0, n_full, rows):
+            yield i_part + i, values[i:i + rows]
+        pending = [values[n_full:]] if n_full < n_pending else []
+        n_pending -= n_full
+        i_part += n_full
+    if n_pending:
+        yield i_part, pending[0] if len(pending) == 1 else np.concatenate(pending)
+
+
+def _write_part(fn, datetimes, labels, values, schema, compression, compression_level, row_group_size):
+    """
+    Write one part of the dataset (used in a worker thread).
+
+    Args:
+        fn (Path): path of the parquet file.
+        datetimes (numpy.ndarray): datetime64-array of the periods.
+        labels (list[str]): labels of the objects.
+        values (numpy.ndarray): 2D-array (periods x labels) of float32 values.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    n_periods, n_labels = values.shape
+    table = pa.Table.from_arrays([
+        pa.array(np.tile(datetimes, n_labels), type=schema.field('datetime').type),
+        pa.DictionaryArray.from_arrays(np.repeat(np.arange(n_labels, dtype='i4'), n_periods), pa.array(labels)),
+        pa.array(values.T.ravel()),
+    ], schema=schema)
+    fn.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, fn, compression=compression, compression_level=compression_level,
+                   row_group_size=row_group_size)
+
+
+def write_dataset(out, path, columns, rows=None, partition_by_year=False, row_group_size=2 ** 20,
+                  compression='zstd', compression_level=None, threads=None, show_progress=True):
+    """
+    Write the columns as partitioned parquet dataset.
+
+    See :meth:`SwmmOutput.to_parquet_dataset`.
+
+    Returns:
+        Path: path to the dataset.
+    """
+    import pyarrow as pa
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from os import cpu_count
+    from ._basic_selective_results_numpy import _get_rows_per_chunk
+
+    path = Path(path)
+
+    if threads is None:
+        threads = cpu_count() or 1
+
+    schema = pa.schema([
+        ('datetime', pa.timestamp('ms')),
+        ('label', pa.dictionary(pa.int32(), pa.string())),
+        ('value', pa.float32()),
+    ], metadata={
+        'flow_unit': str(out.flow_unit),
+        'swmm_version': str(out.swmm_version),
+        'run_failed': str(out.run_failed),
+        'report_interval': str(int(out.report_interval.total_seconds())),
+    })
+
+    partitions = _get_partitions(columns)
+
+    if rows is None:
+        rows = _get_rows_per_chunk(max(len(columns), 1) * 4)
+
+    # the read chunks are limited by the size of the whole period in the file, the parts by the selected columns
+    chunks = _iter_parts(out._iter_values(columns, 0, out.n_periods), rows)
+    if show_progress:
+        import tqdm
+        chunks = tqdm.tqdm(chunks, total=-(-out.n_periods // rows), desc=f'{repr(out)}.to_parquet_dataset')
+
+    with ThreadPoolExecutor(threads) as executor:
+        pending = set()
+        for i_chunk, (i_period, values) in enumerate(chunks):
+            index = out._get_index_periods(i_period, values.shape[0])
+            datetimes = np.asarray(index, dtype='datetime64[ms]')
+
+            # split the chunk at the turn of the year
+            if partition_by_year:
+                years = np.asarray(index.year)
+                bounds = np.r_[0, np.nonzero(np.diff(years))[0] + 1, years.size]
+                slices = [(f'year={years[i]}', slice(i, j)) for i, j in zip(bounds[:-1], bounds[1:])]
+            else:
+                slices = [(None, slice(None))]
+
+            for (kind, variable), (labels, positions) in partitions.items():
+                directory = path / f'kind={kind}' / f'variable={variable}'
+                for year, rows_slice in slices:
+                    fn = (directory if year is None else directory / year) / f'part-{i_chunk:05d}.parquet'
+                    pending.add(executor.submit(_write_part, fn, datetimes[rows_slice], labels,
+                                                values[rows_slice, positions], schema,
+                                                compression, compression_level, row_group_size))
+
+            # limit the number of chunks in memory
+            while len(pending) > 2 * threads * max(len(partitions), 1):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+        for future in pending:
+            future.result()
+
+    return path
@@ -0,0 +1,112 @@
+import numpy as np
+
+_RUN_FIELDS = ['column', 'start', 'stop', 'peak', 'i_peak', 'sum', 'count']
+
+
+def _empty_runs():
+    return {field: np.array([], dtype='f8' if field in ('peak', 'sum') else np.int64) for field in _RUN_FIELDS}
+
+
+def _first_in_segment(segments, mask):
+    """
+    Get the position of the first ``True`` value of ``mask`` in each segment.
+
+    Args:
+        segments (numpy.ndarray): non-decreasing segment number of each value.
+        mask (numpy.ndarray): boolean array (at least one ``True`` per segment).
+
+    Returns:
+        numpy.ndarray: position of the first ``True`` per segment.
+    """
+    positions = np.nonzero(mask)[0]
+    _, first = np.unique(segments[positions], return_index=True)
+    return positions[first]
+
+
+def _find_runs(i_period, values, thresholds):
+    """
+    Find the runs of consecutive periods above the thresholds in a chunk of data.
+
+    Runs at the start or end of the chunk may continue in the neighbouring chunks
+    and are joined with :func:`_merge_runs`.
+
+    Args:
+        i_period (int): number of the first period in the chunk.
+        values (numpy.ndarray): 2D-array (periods x columns).
+        thresholds (numpy.ndarray): threshold per column (NaN to skip the column).
+
+    Returns:
+        dict[str, numpy.ndarray]: per run: column position, first period, period after the last period,
+            peak value, period of the peak, sum of the values and number of periods.
+    """
+    n = values.shape[0]
+    # column by column, the runs are contiguous in memory
+    flat_values = values.T.ravel()
+    with np.errstate(invalid='ignore'):
+        flat_above = (values > thresholds).T.ravel()
+
+    is_start = flat_above.copy()
+    is_start[1:] &= ~flat_above[:-1]
+    is_start[::n] = flat_above[::n]
+    is_end = flat_above.copy()
+    is_end[:-1] &= ~flat_above[1:]
+    is_end[n - 1::n] = flat_above[n - 1::n]
+
+    starts = np.nonzero(is_start)[0]
+    if starts.size == 0:
+        return _empty_runs()
+    stops = np.nonzero(is_end)[0] + 1
+
+    # values outside the runs are neutral for the reduction, so each segment [start_k, start_k+1) reduces to run k
+    peak = np.maximum.reduceat(np.where(flat_above, flat_values, -np.inf), starts)
+    total = np.add.reduceat(np.where(flat_above, flat_values, 0), starts, dtype='f8')
+
+    in_run = np.nonzero(flat_above)[0]
+    segments = np.searchsorted(starts, in_run, side='right') - 1
+    i_peak = in_run[_first_in_segment(segments, flat_values[in_run] == peak[segments])]
+
+    return {
+        'column': starts // n,
+        'start': starts % n + i_period,
+        'stop': (stops - 1) % n + 1 + i_period,
+        'peak': peak.astype('f8'),
+        'i_peak': i_peak % n + i_period,
+        'sum': total,
+        'count': stops - starts,
+    }
+
+
+def _merge_runs(runs, min_gap):
+    """
+    Join runs of the same column which are separated by less than ``min_gap`` periods.
+
+    Runs without a gap (split at the border of two chunks) are always joined.
+
+    Args:
+        runs (dict[str, numpy.ndarray]): runs (see :func:`_find_runs`).
+        min_gap (float): minimum number of periods between two events.
+
+    Returns:
+        dict[str, numpy.ndarray]: joined runs sorted by column and start.
+    """
+    if runs['start'].size == 0:
+        return runs
+    order = np.lexsort((runs['start'], runs['column']))
+    runs = {field: array[order] for field, array in runs.items()}
+
+    column, start, stop = runs['column'], runs['start'], runs['stop']
+    is_new = np.r_[True, (column[1:] != column[:-1]) | (start[1:] - stop[:-1] >= max(min_gap, 1))]
+    first = np.nonzero(is_new)[0]
+    last = np.r_[first[1:] - 1, column.size - 1]
+
+    peak = np.maximum.reduceat(runs['peak'], first)
+    segments = np.cumsum(is_new) - 1
+    return {
+        'column': column[first],
+        'start': start[first],
+        'stop': stop[last],
+        'peak': peak,
+        'i_peak': runs['i_peak'][_first_in_segment(segments, runs['peak'] == peak[segments])],
+        'sum': np.add.reduceat(runs['sum'], first),
+        'count': np.add.reduceat(runs['count'], first),
+    }
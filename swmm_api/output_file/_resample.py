@@ -0,0 +1,123 @@
+import numpy as np
+
+RESAMPLE_FUNCTIONS = ['max', 'min', 'mean', 'sum']
+
+
+def _iter_every(chunks, every, i_period_start):
+    """
+    Keep only every n-th period of the chunks.
+
+    Args:
+        chunks (iterator[tuple[int, numpy.ndarray]]): number of the first period and the values of each chunk.
+        every (int): stride; keep the periods ``i_period_start``, ``i_period_start + every``, ...
+        i_period_start (int): number of the first kept period.
+
+    Yields:
+        tuple[int, numpy.ndarray]: number of the first kept period in the chunk and the kept values.
+    """
+    for i_period, values in chunks:
+        offset = (i_period_start - i_period) % every
+        if offset < values.shape[0]:
+            yield i_period + offset, values[offset::every]
+
+
+class _StreamingResampler:
+    """
+    Aggregate a time-series chunk by chunk into bins (i.e. hourly maxima).
+
+    The last bin of each chunk is carried to the next chunk, because it may continue there.
+    """
+
+    def __init__(self, how):
+        if how not in RESAMPLE_FUNCTIONS:
+            raise ValueError(f'Resample function "{how}" is not implemented. Use one of {RESAMPLE_FUNCTIONS}.')
+        self.how = how
+        # bin-number, aggregated values and count of the open bin
+        self._carry = None
+
+    def _reduce(self, values, starts):
+        if self.how == 'max':
+            return np.maximum.reduceat(values, starts, axis=0)
+        elif self.how == 'min':
+            return np.minimum.reduceat(values, starts, axis=0)
+        return np.add.reduceat(values, starts, axis=0, dtype='f8')
+
+    def _combine(self, a, b):
+        if self.how == 'max':
+            return np.maximum(a, b)
+        elif self.how == 'min':
+            return np.minimum(a, b)
+        return a + b
+
+    def _finish(self, values, counts):
+        if self.how == 'mean':
+            return values / counts[:, np.newaxis]
+        return values
+
+    def update(self, bins, values):
+        """
+        Add a chunk of data.
+
+        Args:
+            bins (numpy.ndarray): bin-number of each period in the chunk (non-decreasing).
+            values (numpy.ndarray): 2D-array (periods x columns).
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: bin-numbers and aggregated values of the completed bins.
+        """
+        if values.shape[0] == 0:
+            return bins[:0], values[:0]
+
+        starts = np.r_[0, np.nonzero(np.diff(bins))[0] + 1]
+        bin_numbers = bins[starts]
+        aggregated = self._reduce(values, starts)
+        counts = np.diff(np.r_[starts, values.shape[0]])
+
+        if self._carry is not None:
+            carry_bin, carry_values, carry_count = self._carry
+            if carry_bin == bin_numbers[0]:
+                aggregated[0] = self._combine(aggregated[0], carry_values)
+                counts[0] += carry_count
+            else:
+                bin_numbers = np.r_[carry_bin, bin_numbers]
+                aggregated = np.concatenate([carry_values[np.newaxis], aggregated])
+                counts = np.r_[carry_count, counts]
+
+        self._carry = bin_numbers[-1], aggregated[-1], counts[-1]
+        return bin_numbers[:-1], self._finish(aggregated[:-1], counts[:-1])
+
+    def close(self):
+        """
+        Get the last (open) bin.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: bin-number and aggregated values of the last bin.
+        """
+        if self._carry is None:
+            return np.array([], dtype=np.int64), None
+        carry_bin, carry_values, carry_count = self._carry
+        self._carry = None
+        return np.array([carry_bin]), self._finish(carry_values[np.newaxis], np.array([carry_count]))
+
+
+def _iter_resample(chunks, how, period_to_bin, every=1):
+    """
+    Aggregate the chunks into bins.
+
+    Args:
+        chunks (iterator[tuple[int, numpy.ndarray]]): number of the first period and the values of each chunk.
+        how (str): aggregation function. One of ``'max'``, ``'min'``, ``'mean'``, ``'sum'``.
+        period_to_bin (function): function converting an array of period numbers to bin-numbers.
+        every (int): step between the periods of the rows in the chunks (see :func:`_iter_every`).
+
+    Yields:
+        tuple[numpy.ndarray, numpy.ndarray]: bin-numbers and aggregated values of the completed bins.
+    """
+    resampler = _StreamingResampler(how)
+    for i_period, values in chunks:
+        bins, aggregated = resampler.update(period_to_bin(i_period + np.arange(values.shape[0]) * every), values)
+        if bins.size:
+            yield bins, aggregated
+    bins, aggregated = resampler.close()
+    if bins.size:
+        yield bins, aggregated
@@ -0,0 +1,123 @@
+import numpy as np
+
+STATISTICS = ['max', 'min', 'mean', 'sum', 'time_of_max', 'time_of_min', 'count']
+_DEFAULT_STATISTICS = ['max', 'min', 'mean', 'sum', 'time_of_max']
+
+
+class _StreamingStatistics:
+    """
+    Accumulator for column-wise statistics, updated chunk by chunk in a single pass over the data.
+
+    Attributes:
+        n (int): number of periods processed.
+        max (numpy.ndarray): maximum per column.
+        i_max (numpy.ndarray): number of the period of the (first) maximum per column.
+        min (numpy.ndarray): minimum per column.
+        i_min (numpy.ndarray): number of the period of the (first) minimum per column.
+        sum (numpy.ndarray): sum per column (as float64 to reduce rounding errors).
+        thresholds (numpy.ndarray): threshold per column (NaN if not used).
+        count_above (numpy.ndarray): number of periods above the threshold per column.
+    """
+
+    def __init__(self, n_columns, thresholds=None):
+        self.n = 0
+        self.max = np.full(n_columns, -np.inf)
+        self.i_max = np.zeros(n_columns, dtype=np.int64)
+        self.min = np.full(n_columns, np.inf)
+        self.i_min = np.zeros(n_columns, dtype=np.int64)
+        self.sum = np.zeros(n_columns, dtype='f8')
+        if thresholds is None:
+            thresholds = np.full(n_columns, np.nan)
+        self.thresholds = thresholds
+        self.count_above = np.zeros(n_columns, dtype=np.int64)
+
+    def update(self, i_period, values):
+        """
+        Add a chunk of data to the statistics.
+
+        Chunks must be added in chronological order.
+
+        Args:
+            i_period (int): number of the first period in the chunk.
+            values (numpy.ndarray): 2D-array (periods x columns).
+        """
+        if values.shape[0] == 0:
+            return
+        self.n += values.shape[0]
+
+        i = values.argmax(axis=0)
+        chunk_max = values[i, np.arange(values.shape[1])]
+        new = chunk_max > self.max
+        self.max[new] = chunk_max[new]
+        self.i_max[new] = i[new] + i_period
+
+        i = values.argmin(axis=0)
+        chunk_min = values[i, np.arange(values.shape[1])]
+        new = chunk_min < self.min
+        self.min[new] = chunk_min[new]
+        self.i_min[new] = i[new] + i_period
+
+        self.sum += values.sum(axis=0, dtype='f8')
+
+        # comparison with NaN is always False
+        with np.errstate(invalid='ignore'):
+            self.count_above += (values > self.thresholds).sum(axis=0)
+
+    def merge(self, other):
+        """
+        Merge the statistics of a later part of the time-series into this one.
+
+        Args:
+            other (_StreamingStatistics): statistics of the periods after the periods of this object.
+        """
+        self.n += other.n
+
+        new = other.max > self.max
+        self.max[new] = other.max[new]
+        self.i_max[new] = other.i_max[new]
+
+        new = other.min < self.min
+        self.min[new] = other.min[new]
+        self.i_min[new] = other.i_min[new]
+
+        self.sum += other.sum
+        self.count_above += other.count_above
+
+
+def _get_thresholds(columns, thresholds):
+    """
+    Get the threshold for each column.
+
+    Args:
+        columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+        thresholds (float | dict | None): one threshold for all columns or
+            a dictionary with the variable name, the column tuple or the column name (``'kind/label/variable'``)
+            as keys and the threshold as values. Column keys have a higher priority than variable keys.
+
+    Returns:
+        numpy.ndarray: threshold per column (NaN if no threshold is given)
+    """
+    if thresholds is None:
+        return np.full(len(columns), np.nan)
+    elif not isinstance(thresholds, dict):
+        return np.full(len(columns), float(thresholds))
+
+    values = []
+    for column in columns:
+        for key in (column, '/'.join(column), column[2]):
+            if key in thresholds:
+                values.append(thresholds[key])
+                break
+        else:
+            values.append(np.nan)
+    return np.array(values, dtype='f8')
+
+
+def _summarize_worker(filename, columns, i_period, n_periods, rows, thresholds):
+    """Calculate the statistics of a part of the periods in a separate process."""
+    from .out import SwmmOutput
+    with SwmmOutput(filename) as out:
+        statistics = _StreamingStatistics(len(columns), thresholds)
+        for i, values in out._iter_values(columns, i_period, n_periods, rows=rows):
+            statistics.update(i, values)
+    return statistics
@@ -0,0 +1,147 @@
+"""
+Object-major (transposed) companion file of the results block of an out-file.
+
+The out-file stores the results period by period (all objects of one period after each other).
+The transposed file stores the results column by column (all periods of one record after each other),
+so the full time-series of one column is one contiguous block.
+
+Layout:
+    header (64 bytes): file stamp, version, number of records, number of periods,
+                       size and modification time (ns) of the out-file when converted
+    data: float32 array with the shape (records, periods); records without the datetime of the period
+"""
+
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from ._basic_selective_results_numpy import _iter_selective_results, _get_rows_per_chunk
+
+_TRANSPOSED_SUFFIX = '.transposed'
+_FILESTAMP = b'SWMMTOUT'
+_VERSION = 1
+_HEADER_FORMAT = '<8siqqqq'
+_HEADER_SIZE = 64
+_RECORDSIZE = 4
+
+
+def _get_transposed_filename(filename):
+    return Path(filename).with_name(Path(filename).name + _TRANSPOSED_SUFFIX)
+
+
+def _get_source_signature(filename):
+    stats = Path(filename).stat()
+    return stats.st_size, stats.st_mtime_ns
+
+
+def _read_header(fn_transposed):
+    """
+    Read the header of the transposed file.
+
+    Returns:
+        tuple | None: number of records, number of periods, size and modification time of the out-file
+            or ``None`` if the file is not a (complete) transposed file.
+    """
+    with open(fn_transposed, 'rb') as f:
+        raw = f.read(struct.calcsize(_HEADER_FORMAT))
+    if len(raw) < struct.calcsize(_HEADER_FORMAT):
+        return
+    stamp, version, *values = struct.unpack(_HEADER_FORMAT, raw)
+    if (stamp != _FILESTAMP) or (version != _VERSION):
+        return
+    return tuple(values)
+
+
+def is_up_to_date(filename, n_records, n_periods):
+    """
+    Check if a transposed file exists for the out-file and is up to date.
+
+    Args:
+        filename (str | Path): path to the out-file.
+        n_records (int): number of records per period (without the datetime).
+        n_periods (int): number of periods.
+
+    Returns:
+        bool: if the transposed file can be used.
+    """
+    fn_transposed = _get_transposed_filename(filename)
+    if not fn_transposed.is_file():
+        return False
+    header = _read_header(fn_transposed)
+    return header == (n_records, n_periods, *_get_source_signature(filename))
+
+
+def write_transposed(out, fn_transposed=None, rows=None, show_progress=True):
+    """
+    Convert the results block of an out-file to an object-major (transposed) file.
+
+    Works out-of-core: only one chunk of periods is held in memory at a time.
+    The file stamp is written at the very end, so an aborted conversion is never used.
+
+    Args:
+        out (swmm_api.SwmmOutput): out-file.
+        fn_transposed (str | Path): path to the transposed file. Default: ``<out-filename>.transposed``.
+        rows (int): number of periods read at once. Default: as many as fit in about 64 MB.
+        show_progress (bool): show a progress bar.
+
+    Returns:
+        Path: path to the transposed file.
+    """
+    if fn_transposed is None:
+        fn_transposed = _get_transposed_filename(out.filename)
+
+    n_records = out._bytes_per_period // _RECORDSIZE - 2
+    n_periods = out.n_periods
+
+    if rows is None:
+        rows = _get_rows_per_chunk(out._bytes_per_period)
+
+    with open(fn_transposed, 'wb') as f:
+        f.write(b'\x00' * _HEADER_SIZE)
+        f.truncate(_HEADER_SIZE + n_records * n_periods * _RECORDSIZE)
+
+    if n_records * n_periods:
+        data = np.memmap(fn_transposed, dtype='f4', mode='r+', offset=_HEADER_SIZE, shape=(n_records, n_periods))
+
+        chunks = _iter_selective_results(out.fp, np.arange(2, n_records + 2) * _RECORDSIZE, out._pos_start_output,
+                                         n_periods, out._bytes_per_period, rows=rows)
+        if show_progress:
+            import tqdm
+            chunks = tqdm.tqdm(chunks, total=-(-n_periods // rows), desc=f'{repr(out)}.to_transposed')
+
+        i_period = 0
+        for values in chunks:
+            data[:, i_period:i_period + values.shape[0]] = values.T
+            i_period += values.shape[0]
+
+        data.flush()
+        del data
+
+    with open(fn_transposed, 'r+b') as f:
+        f.write(struct.pack(_HEADER_FORMAT, _FILESTAMP, _VERSION, n_records, n_periods,
+                            *_get_source_signature(out.filename)))
+
+    return Path(fn_transposed)
+
+
+def read_transposed(fn_transposed, record_index, i_period, n_periods, n_periods_total):
+    """
+    Read columns from the transposed file. Each column is read as one contiguous block.
+
+    Args:
+        fn_transposed (str | Path): path to the transposed file.
+        record_index (list[int]): index of the records (without the datetime) to read.
+        i_period (int): number of the first period to read.
+        n_periods (int): number of periods to read.
+        n_periods_total (int): number of periods in the file.
+
+    Returns:
+        numpy.ndarray: 2D-array (periods x columns) with float32 values.
+    """
+    values = np.empty((n_periods, len(record_index)), dtype='f4')
+    with open(fn_transposed, 'rb') as f:
+        for j, record in enumerate(record_index):
+            f.seek(_HEADER_SIZE + (record * n_periods_total + i_period) * _RECORDSIZE)
+            values[:, j] = np.fromfile(f, dtype='f4', count=n_periods)
+    return values
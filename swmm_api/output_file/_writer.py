@@ -0,0 +1,160 @@
+"""
+Writer for SWMM binary output files (.out).
+
+The layout of the file is the same as written by SWMM (see ``output.c`` of SWMM):
+
+- opening records: magic number, version, flow unit, number of subcatchments, nodes, links and pollutants
+- labels of all objects and pollutants (each one with its length as leading integer)
+- codes of the pollutant concentration units
+- property codes and values of the subcatchments, nodes and links
+- variable codes of the subcatchments, nodes, links and the system
+- report start date and report interval
+- results: per period the datetime (float64) and the values of all objects (float32)
+- closing records: start position of the labels, properties and results, number of periods, error code and magic number
+"""
+
+import datetime
+import struct
+
+import numpy as np
+
+from .definitions import OBJECTS
+from .extract import _MAGIC_NUMBER, _RECORDSIZE, _FLOW_UNITS, _CONCENTRATION_UNITS
+
+_BASE_DATE = datetime.datetime(1899, 12, 30)
+
+
+class _SwmmOutWriter:
+    """
+    Write a SWMM binary output file, with the header copied from another out-file.
+
+    The results are written chunk by chunk with :meth:`write_periods` and
+    the file is completed with the closing records in :meth:`close`.
+
+    Args:
+        filename (str | Path): Path to the new out-file.
+        template (SwmmOutExtract): out-file from which the header (variables, pollutants, properties) is copied.
+        objects (dict[str, list[int]]): index of the objects per kind (``'subcatchment'``, ``'node'``, ``'link'``) to write.
+            Default: all objects of the template.
+        start_date (datetime.datetime): datetime of the first period. Default: start date of the template.
+        report_interval (datetime.timedelta): interval between the periods. Default: report interval of the template.
+    """
+
+    def __init__(self, filename, template, objects=None, start_date=None, report_interval=None):
+        self.template = template
+        if objects is None:
+            objects = {}
+        self.objects = {kind: np.asarray(objects.get(kind, range(len(template.labels[kind]))), dtype=np.int64)
+                        for kind in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK]}
+        self.start_date = template.start_date if start_date is None else start_date
+        self.report_interval = template.report_interval if report_interval is None else report_interval
+        self.n_periods = 0
+
+        self.fp = open(filename, 'wb')
+        self._write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close(error_code=0 if exc_type is None else 1)
+
+    @property
+    def n_records(self):
+        """int: number of float32 values per period (without the datetime)."""
+        n = len(self.template.variables[OBJECTS.SYSTEM])
+        for kind, index in self.objects.items():
+            n += len(self.template.variables[kind]) * index.size
+        return n
+
+    def get_offsets(self):
+        """
+        Get the byte offsets of the written records within a period of the template.
+
+        Returns:
+            numpy.ndarray: offsets in the order of the records in the new file.
+        """
+        offsets = []
+        for kind in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK]:
+            n_vars = len(self.template.variables[kind])
+            records = (self.template._kind_record_start[kind] + self.objects[kind][:, np.newaxis] * n_vars
+                       + np.arange(n_vars)).ravel()
+            offsets.append(records)
+        offsets.append(self.template._kind_record_start[OBJECTS.SYSTEM] + np.arange(len(self.template.variables[OBJECTS.SYSTEM])))
+        return np.concatenate(offsets) * _RECORDSIZE
+
+    def _write_ints(self, values):
+        values = list(values)
+        self.fp.write(struct.pack(f'<{len(values)}i', *values))
+
+    def _write_header(self):
+        template = self.template
+        labels = {kind: [template.labels[kind][i] for i in index] for kind, index in self.objects.items()}
+        pollutants = template.labels[OBJECTS.POLLUTANT]
+
+        self._write_ints([_MAGIC_NUMBER, template.swmm_version, _FLOW_UNITS.index(template.flow_unit),
+                          len(labels[OBJECTS.SUBCATCHMENT]), len(labels[OBJECTS.NODE]), len(labels[OBJECTS.LINK]),
+                          len(pollutants)])
+
+        # ---
+        self._pos_start_labels = self.fp.tell()
+        for label in labels[OBJECTS.SUBCATCHMENT] + labels[OBJECTS.NODE] + labels[OBJECTS.LINK] + pollutants:
+            raw = label.encode(template.encoding)
+            self._write_ints([len(raw)])
+            self.fp.write(raw)
+
+        self._write_ints(_CONCENTRATION_UNITS.index(template.pollutant_units[p])
+                         if template.pollutant_units[p] in _CONCENTRATION_UNITS else len(_CONCENTRATION_UNITS)
+                         for p in pollutants)
+
+        # ---
+        self._pos_start_input = self.fp.tell()
+        for kind in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK]:
+            self._write_ints([len(template._property_codes[kind])] + template._property_codes[kind])
+            self.fp.write(template.model_properties_array[kind][self.objects[kind]].tobytes())
+
+        for kind in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK, OBJECTS.SYSTEM]:
+            self._write_ints([len(template._variable_codes[kind])] + template._variable_codes[kind])
+
+        # ---
+        # SWMM saves the report start date one reporting period prior to the first reported result
+        self.fp.write(struct.pack('<d', self._to_days(self.start_date - self.report_interval)))
+        self._write_ints([int(self.report_interval.total_seconds())])
+
+        self._pos_start_output = self.fp.tell()
+
+    @staticmethod
+    def _to_days(date):
+        return (date - _BASE_DATE) / datetime.timedelta(days=1)
+
+    def write_periods(self, values, datetimes=None):
+        """
+        Append periods to the results.
+
+        Args:
+            values (numpy.ndarray): 2D-array (periods x records) with the records in the order of :meth:`get_offsets`.
+            datetimes (numpy.ndarray): datetimes of the periods as days since 1899-12-30 (as stored in the out-file).
+                Default: consecutive datetimes, starting with ``start_date``.
+        """
+        n = values.shape[0]
+        block = np.empty(n, dtype=[('datetime', '<f8'), ('values', '<f4', (self.n_records,))])
+        if datetimes is None:
+            first = self._to_days(self.start_date + self.n_periods * self.report_interval)
+            datetimes = first + np.arange(n) * (self.report_interval / datetime.timedelta(days=1))
+        block['datetime'] = datetimes
+        block['values'] = values
+        block.tofile(self.fp)
+        self.n_periods += n
+
+    def close(self, error_code=0):
+        """
+        Complete the file with the closing records and close it.
+
+        Args:
+            error_code (int): error code of the run (0 = no error).
+        """
+        if self.fp.closed:
+            return
+        self._write_ints([self._pos_start_labels, self._pos_start_input, self._pos_start_output,
+                          self.n_periods, error_code, _MAGIC_NUMBER])
+        self.fp.close()
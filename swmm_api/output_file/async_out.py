@@ -0,0 +1,244 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .out import SwmmOutput
+from .result import SwmmOutputResult
+
+
+class _Handle:
+    """Open out-file with a lock for the file position and a counter of the running requests."""
+
+    def __init__(self, out, signature):
+        self.out = out
+        self.signature = signature
+        self.lock = threading.Lock()
+        self.users = 0
+
+    def close(self):
+        with self.lock:
+            self.out.close()
+
+
+class _Batch:
+    """Requests for columns of the same file and periods, which are read at once."""
+
+    def __init__(self):
+        self.columns = {}
+        self.task = None
+
+    def add(self, columns):
+        for column in columns:
+            self.columns.setdefault(column, len(self.columns))
+
+
+def _get_signature(path):
+    stats = path.stat()
+    return stats.st_size, stats.st_mtime_ns
+
+
+class AsyncSwmmOutput:
+    """
+    Read SWMM-output-files (___.out) in asyncio applications (i.e. web backends) without blocking the event loop.
+
+    - The blocking reads are done in a bounded pool of threads.
+    - The open files and parsed headers are cached per path (least recently used files are closed).
+      Changed files (size or modification time) are opened again.
+    - Concurrent requests for the same file and periods are coalesced into one read of the union of the requested columns.
+      Only requests with the identical period window (``start`` and ``end``), which are made in the same iteration
+      of the event loop, are coalesced; overlapping windows are read separately.
+
+    Use as async context manager or call :meth:`close` at the end.
+
+    Examples:
+        .. code-block:: python
+
+            reader = AsyncSwmmOutput(max_workers=4)
+            series = await reader.get_part('model.out', 'node', 'J1', 'depth')
+            await reader.close()
+    """
+
+    def __init__(self, max_workers=4, max_open_files=16, header_cache=False, encoding=''):
+        """
+        Asyncio reader for SWMM-output-files.
+
+        Args:
+            max_workers (int): maximum number of threads reading files at the same time.
+            max_open_files (int): maximum number of cached open files.
+            header_cache (bool): use the sidecar header cache of :class:`SwmmOutput`.
+            encoding (str): Encoding of the text in the binary-file (see :class:`SwmmOutput`).
+        """
+        self.max_open_files = max_open_files
+        self.header_cache = header_cache
+        self.encoding = encoding
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._handles = OrderedDict()
+        self._opening = {}
+        self._batches = {}
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(open_files={len(self._handles)})'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _acquire(self, filename):
+        """
+        Get the cached handle of the file (open it if needed) and mark it as used.
+
+        Returns:
+            _Handle: handle of the open file.
+        """
+        path = Path(filename).resolve()
+        signature = _get_signature(path)
+
+        handle = self._handles.get(path)
+        if (handle is not None) and (handle.signature != signature):
+            # file changed -> read the header again
+            del self._handles[path]
+            if handle.users == 0:
+                await self._run(handle.close)
+            handle = None
+
+        if handle is None:
+            # coalesce concurrent opening of the same file (in its own task, so a cancelled request doesn't cancel it)
+            opening = self._opening.get(path)
+            if opening is None:
+                opening = self._opening[path] = asyncio.ensure_future(self._open_handle(path, signature))
+            handle = await asyncio.shield(opening)
+
+        if path in self._handles:
+            self._handles.move_to_end(path)
+        handle.users += 1
+        try:
+            await self._evict()
+        except BaseException:
+            self._release(handle)
+            raise
+        return handle
+
+    async def _open_handle(self, path, signature):
+        """Open the file and add it to the cache."""
+        try:
+            handle = await self._run(self._open, path, signature)
+        finally:
+            del self._opening[path]
+        self._handles[path] = handle
+        return handle
+
+    def _open(self, path, signature):
+        return _Handle(SwmmOutput(path, encoding=self.encoding, header_cache=self.header_cache), signature)
+
+    async def _evict(self):
+        """Close the least recently used files, which are not in use, if there are too many open files."""
+        for path in list(self._handles):
+            if len(self._handles) <= self.max_open_files:
+                break
+            handle = self._handles[path]
+            if handle.users == 0:
+                del self._handles[path]
+                await self._run(handle.close)
+
+    def _release(self, handle):
+        handle.users -= 1
+        if (handle.users == 0) and (handle not in self._handles.values()):
+            # evicted or replaced while in use
+            self._executor.submit(handle.close)
+
+    @staticmethod
+    def _read(handle, columns, i_period, n_periods):
+        with handle.lock:
+            return handle.out._get_values(columns, i_period, n_periods)
+
+    async def _read_batch(self, key, batch, handle, i_period, n_periods):
+        """Read the union of the columns of all requests in the batch."""
+        try:
+            try:
+                # let the other pending requests join the batch
+                await asyncio.sleep(0)
+            finally:
+                self._batches.pop(key, None)
+            return await self._run(self._read, handle, list(batch.columns), i_period, n_periods)
+        finally:
+            self._release(handle)
+
+    async def header(self, filename):
+        """
+        Get the parsed header of an out-file.
+
+        Args:
+            filename (str | Path): Path to the output-file (.out).
+
+        Returns:
+            dict: ``labels``, ``variables``, ``start_date``, ``report_interval``, ``n_periods``, ``flow_unit`` and ``swmm_version``.
+        """
+        handle = await self._acquire(filename)
+        try:
+            out = handle.out
+            return {'labels': out.labels, 'variables': out.variables, 'start_date': out.start_date,
+                    'report_interval': out.report_interval, 'n_periods': out.n_periods,
+                    'flow_unit': out.flow_unit, 'swmm_version': out.swmm_version}
+        finally:
+            self._release(handle)
+
+    async def get_part(self, filename, kind=None, label=None, variable=None, start=None, end=None, as_frame=True):
+        """
+        Get specific columns of the data (see :meth:`SwmmOutput.get_part`).
+
+        Args:
+            filename (str | Path): Path to the output-file (.out).
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            start (datetime): start datetime for the period to read.
+            end (datetime): end datetime for the period to read.
+            as_frame (bool): if ``False`` return a :class:`~swmm_api.output_file.result.SwmmOutputResult` instead of pandas objects.
+
+        Returns:
+            pandas.DataFrame | pandas.Series | SwmmOutputResult: Filtered data.
+        """
+        handle = await self._acquire(filename)
+        try:
+            out = handle.out
+            columns = out._filter_part_columns(kind, label, variable)
+            i_period, n_periods = out._get_period_range(start, end)
+
+            key = (id(handle), i_period, n_periods)
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch()
+                batch.add(columns)
+                # the batch is read in its own task, so a cancelled request doesn't leave the other requests waiting
+                handle.users += 1
+                batch.task = asyncio.ensure_future(self._read_batch(key, batch, handle, i_period, n_periods))
+            else:
+                batch.add(columns)
+
+            values = await asyncio.shield(batch.task)
+            result = SwmmOutputResult(values[:, np.array([batch.columns[c] for c in columns], dtype=int)], columns,
+                                      periods=np.arange(i_period, i_period + values.shape[0]),
+                                      start_date=out.start_date, report_interval=out.report_interval)
+        finally:
+            self._release(handle)
+
+        if as_frame:
+            return await self._run(result.to_pandas)
+        return result
+
+    async def close(self):
+        """Close all cached files and shut down the thread pool."""
+        handles = list(self._handles.values())
+        self._handles.clear()
+        for handle in handles:
+            await self._run(handle.close)
+        self._executor.shutdown(wait=False)
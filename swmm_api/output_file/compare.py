@@ -0,0 +1,196 @@
+from pathlib import Path
+from warnings import warn
+
+import numpy as np
+import pandas as pd
+
+from .extract import SwmmExtractValueError
+from .out import SwmmOutput, SwmmOutputWarning
+
+
+class _StreamingDifference:
+    """
+    Accumulator for column-wise differences between two time-series, updated chunk by chunk.
+
+    Attributes:
+        n (int): number of periods processed.
+        max_abs_error (numpy.ndarray): maximum absolute difference per column.
+        max_rel_error (numpy.ndarray): maximum difference relative to the reference (second file) per column.
+        sum_squared_error (numpy.ndarray): sum of the squared differences per column.
+        n_diverging (numpy.ndarray): number of periods where the values are not close per column.
+        i_first_divergence (numpy.ndarray): number of the first period where the values are not close (-1 if never).
+    """
+
+    def __init__(self, n_columns, atol=0., rtol=1e-5):
+        self.atol = atol
+        self.rtol = rtol
+        self.n = 0
+        self.max_abs_error = np.zeros(n_columns)
+        self.max_rel_error = np.zeros(n_columns)
+        self.sum_squared_error = np.zeros(n_columns)
+        self.n_diverging = np.zeros(n_columns, dtype=np.int64)
+        self.i_first_divergence = np.full(n_columns, -1, dtype=np.int64)
+
+    def update(self, i_period, values, reference):
+        """
+        Add a chunk of both files.
+
+        Chunks must be added in chronological order.
+
+        Args:
+            i_period (int): number of the first period in the chunk.
+            values (numpy.ndarray): 2D-array (periods x columns) of the first file.
+            reference (numpy.ndarray): 2D-array (periods x columns) of the second file.
+        """
+        if values.shape[0] == 0:
+            return
+        self.n += values.shape[0]
+
+        values = values.astype('f8')
+        reference = reference.astype('f8')
+        both_nan = np.isnan(values) & np.isnan(reference)
+        error = np.where(both_nan, 0., np.abs(values - reference))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel_error = np.where(error == 0, 0., error / np.abs(reference))
+
+        # NaN in only one of the files is a difference
+        error_nan = np.where(np.isnan(error), np.inf, error)
+        self.max_abs_error = np.maximum(self.max_abs_error, error_nan.max(axis=0))
+        self.max_rel_error = np.maximum(self.max_rel_error, np.where(np.isnan(rel_error), np.inf, rel_error).max(axis=0))
+        self.sum_squared_error += (error_nan ** 2).sum(axis=0)
+
+        diverging = error_nan > self.atol + self.rtol * np.abs(np.nan_to_num(reference))
+        self.n_diverging += diverging.sum(axis=0)
+
+        first = diverging.argmax(axis=0)
+        new = (self.i_first_divergence == -1) & diverging.any(axis=0)
+        self.i_first_divergence[new] = first[new] + i_period
+
+
+def _get_aligned_window(out_a, out_b):
+    """
+    Get the common periods of both files (aligned by the datetime).
+
+    Returns:
+        tuple[int, int, int]: first period in file a, first period in file b and number of common periods.
+    """
+    if out_a.report_interval != out_b.report_interval:
+        raise SwmmExtractValueError(f'The report intervals of the out-files differ '
+                                    f'({out_a.report_interval} != {out_b.report_interval}).')
+    shift = (out_b.start_date - out_a.start_date) / out_a.report_interval
+    if shift != int(shift):
+        raise SwmmExtractValueError('The periods of the out-files are not on a common time grid.')
+    shift = int(shift)
+    i_a = max(shift, 0)
+    i_b = max(-shift, 0)
+    n_periods = max(min(out_a.n_periods - i_a, out_b.n_periods - i_b), 0)
+    return i_a, i_b, n_periods
+
+
+def _compare_worker(filename_a, filename_b, columns, atol, rtol, rows):
+    """Compare a group of columns in a separate process."""
+    with SwmmOutput(filename_a) as out_a, SwmmOutput(filename_b) as out_b:
+        return _compare(out_a, out_b, columns, atol, rtol, rows)
+
+
+def _compare(out_a, out_b, columns, atol, rtol, rows):
+    from ._basic_selective_results_numpy import _get_rows_per_chunk
+
+    i_a, i_b, n_periods = _get_aligned_window(out_a, out_b)
+    if rows is None:
+        # the same chunks for both files (even if they have different objects), sized by the larger period
+        rows = _get_rows_per_chunk(max(out_a._bytes_per_period, out_b._bytes_per_period))
+
+    difference = _StreamingDifference(len(columns), atol=atol, rtol=rtol)
+    for (i, values), (j, reference) in zip(out_a._iter_values(columns, i_a, n_periods, rows=rows),
+                                           out_b._iter_values(columns, i_b, n_periods, rows=rows)):
+        if i - i_a != j - i_b:
+            raise SwmmExtractValueError(f'The chunks of the out-files are not aligned (period {i} != {j + i_a - i_b}).')
+        # only if one of the files is incomplete
+        n = min(values.shape[0], reference.shape[0])
+        difference.update(i, values[:n], reference[:n])
+    return difference
+
+
+def compare_out_files(a, b, atol=0., rtol=1e-5, kind=None, label=None, variable=None, rows=None, processes=1):
+    """
+    Compare the results of two out-files numerically (i.e. for regression tests after a model or SWMM version change).
+
+    Both files are read in chunks of aligned periods, so the memory usage is constant and independent of the number of periods.
+    The columns are matched by the object kind, label and variable; only columns in both files are compared.
+    The periods are aligned by the datetime; only the common periods are compared.
+
+    Two values are close if ``|a - b| <= atol + rtol * |b|`` (like :func:`numpy.isclose`).
+
+    Args:
+        a (str | Path | SwmmOutput): first out-file.
+        b (str | Path | SwmmOutput): second out-file, used as reference for the relative errors.
+        atol (float): absolute tolerance.
+        rtol (float): relative tolerance.
+        kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+        label (str | list): name of the objekts
+        variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+        rows (int): maximum number of periods read at once. Default: as many as fit in about 64 MB.
+        processes (int): number of parallel processes, each comparing a group of columns.
+            Only available if both out-files are given as path.
+
+    Returns:
+        pandas.DataFrame: table with the column identifier (kind, label, variable) as index and the columns
+            ``'max_abs_error'``, ``'max_rel_error'``, ``'rmse'``, ``'n_diverging'``, ``'first_divergence'`` (datetime or NaT)
+            and ``'close'`` (if all values are close).
+    """
+    out_a = a if isinstance(a, SwmmOutput) else SwmmOutput(a)
+    out_b = b if isinstance(b, SwmmOutput) else SwmmOutput(b)
+
+    columns_a = out_a._filter_part_columns(kind, label, variable)
+    columns_b = set(out_b._filter_part_columns(kind, label, variable))
+    columns = [c for c in columns_a if c in columns_b]
+
+    n_missing = len(columns_a) + len(columns_b) - 2 * len(columns)
+    if n_missing:
+        warn(f'{n_missing} columns are only in one of the out-files and are not compared.', SwmmOutputWarning)
+
+    _, _, n_periods = _get_aligned_window(out_a, out_b)
+
+    if (processes > 1) and isinstance(out_a.filename, Path) and isinstance(out_b.filename, Path) and columns:
+        from multiprocessing import Pool
+        groups = [list(g) for g in np.array_split(np.arange(len(columns)), min(processes, len(columns)))]
+        with Pool(processes) as pool:
+            results = pool.starmap(_compare_worker, [
+                (out_a.filename, out_b.filename, [columns[i] for i in g], atol, rtol, rows) for g in groups
+            ])
+        difference = _StreamingDifference(len(columns), atol=atol, rtol=rtol)
+        for g, result in zip(groups, results):
+            difference.n = result.n
+            for attribute in ['max_abs_error', 'max_rel_error', 'sum_squared_error', 'n_diverging', 'i_first_divergence']:
+                getattr(difference, attribute)[g] = getattr(result, attribute)
+    else:
+        difference = _compare(out_a, out_b, columns, atol, rtol, rows)
+
+    first_divergence = pd.Series(pd.NaT, index=range(len(columns)), dtype='datetime64[ns]')
+    diverged = difference.i_first_divergence >= 0
+    first_divergence[diverged] = (pd.Timestamp(out_a.start_date)
+                                  + pd.to_timedelta(difference.i_first_divergence[diverged] * out_a.report_interval.total_seconds(), unit='s'))
+
+    with np.errstate(invalid='ignore'):
+        rmse = np.sqrt(difference.sum_squared_error / difference.n) if difference.n else np.full(len(columns), np.nan)
+
+    df = pd.DataFrame({
+        'max_abs_error': difference.max_abs_error,
+        'max_rel_error': difference.max_rel_error,
+        'rmse': rmse,
+        'n_diverging': difference.n_diverging,
+        'first_divergence': first_divergence.values,
+        'close': difference.n_diverging == 0,
+    }, index=pd.MultiIndex.from_tuples(columns, names=['kind', 'label', 'variable']))
+
+    if n_periods == 0:
+        warn('The out-files have no common periods.', SwmmOutputWarning)
+
+    if out_a is not a:
+        out_a.close()
+    if out_b is not b:
+        out_b.close()
+
+    return df
@@ -0,0 +1,266 @@
+from pathlib import Path
+from warnings import warn
+
+import numpy as np
+import pandas as pd
+
+from ._basic_selective_results_numpy import _iter_selective_results, _get_rows_per_chunk
+from .extract import SwmmExtractValueError, SwmmOutExtractWarning, _MAGIC_NUMBER, _RECORDSIZE, _HEADER_ATTRIBUTES
+from .out import SwmmOutput
+
+
+def _read_run(filename, offset_list, pos_start_output, n_periods, bytes_per_period):
+    """
+    Read the records of a range of periods of one out-file (used in a separate process).
+
+    Returns:
+        numpy.ndarray: 2D-array (periods x columns) with float32 values.
+    """
+    values = np.full((n_periods, len(offset_list)), np.nan, dtype='f4')
+    with open(filename, 'rb') as fp:
+        i = 0
+        for chunk in _iter_selective_results(fp, offset_list, pos_start_output, n_periods, bytes_per_period):
+            values[i:i + chunk.shape[0]] = chunk
+            i += chunk.shape[0]
+    return values
+
+
+class SwmmOutputEnsemble:
+    """
+    Multiple SWMM-output-files of the same model (i.e. Monte Carlo or design storm runs).
+
+    The header of the first file is parsed and the other files are checked for an identical header
+    (same objects, properties and variables), so the headers of the other files don't need to be parsed.
+
+    Attributes:
+        filenames (list[Path]): Paths to the output-files (.out).
+        reference (SwmmOutput): first output-file, which is used for the labels, variables and properties.
+        runs (list[SwmmOutput]): all output-files (header attributes are shared with the reference).
+        align (str): how the time-series of the runs are aligned (see :meth:`__init__`).
+        offsets (numpy.ndarray): number of the first period of each run on the common time axis.
+    """
+
+    def __init__(self, filenames, encoding='', align='datetime'):
+        """
+        Read multiple SWMM-output-files (___.out) of the same model.
+
+        Args:
+            filenames (list[str | Path]): Paths to the output-files (.out).
+            encoding (str): Encoding of the text in the binary-file (None -> auto-detect encoding ... takes a few seconds | '' -> use default = 'utf-8')
+            align (str): how the time-series of the runs are aligned.
+
+                - ``'datetime'``: common datetime axis of all runs (requires the same report interval)
+                - ``'period'``: by the number of the period since the start of each run (relative time)
+
+                Missing values (i.e. runs of different length) are filled with NaN.
+        """
+        self.filenames = [Path(fn) for fn in filenames]
+        self.reference = SwmmOutput(self.filenames[0], encoding=encoding)
+        self.align = align
+
+        # the header without the report dates must be identical for all runs
+        self.reference.fp.seek(0)
+        self._header_bytes = self.reference.fp.read(self.reference._pos_start_output - 3 * _RECORDSIZE)
+
+        self.runs = [self.reference] + [self._open_compatible(fn) for fn in self.filenames[1:]]
+
+        # ---
+        if align == 'datetime':
+            report_intervals = {run.report_interval for run in self.runs}
+            if len(report_intervals) > 1:
+                raise SwmmExtractValueError(f'Runs with different report intervals ({report_intervals}) can not be aligned by datetime.')
+            self.start_date = min(run.start_date for run in self.runs)
+            offsets = [(run.start_date - self.start_date) / self.reference.report_interval for run in self.runs]
+            if any(o != int(o) for o in offsets):
+                warn('Start dates of the runs are not on a common grid of the report interval. Rounding to the nearest period.', SwmmOutExtractWarning)
+            self.offsets = np.round(offsets).astype(int)
+        elif align == 'period':
+            self.start_date = None
+            self.offsets = np.zeros(len(self.runs), dtype=int)
+        else:
+            raise ValueError(f'align="{align}" is not valid. Use "datetime" or "period".')
+
+        self.n_periods = int(max(o + run.n_periods for o, run in zip(self.offsets, self.runs)))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(n_runs={len(self.runs)}, reference="{self.filenames[0]}")'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close all output-files."""
+        for run in self.runs:
+            run.close()
+
+    def _open_compatible(self, filename):
+        """
+        Open an output-file with the same header as the reference, without parsing the header.
+
+        Only the report dates, the number of periods and the closing records are read.
+
+        Args:
+            filename (Path): Path to the output-file (.out).
+
+        Returns:
+            SwmmOutput: output-file
+        """
+        run = SwmmOutput(filename, skip_init=True, encoding=self.reference.encoding)
+        run.fp.seek(0)
+        if run.fp.read(len(self._header_bytes)) != self._header_bytes:
+            raise SwmmExtractValueError(f'The header of the out-file "{filename}" does not match the header of "{self.filenames[0]}".')
+
+        for attribute in _HEADER_ATTRIBUTES:
+            setattr(run, attribute, getattr(self.reference, attribute))
+        run._read_report_dates()
+
+        *_, n_periods, error_code, magic_num_end = run._read_closing_records()
+        if magic_num_end == _MAGIC_NUMBER:
+            run.n_periods = n_periods
+            run.run_failed = error_code != 0
+        else:
+            run.fp.seek(0, 2)
+            run.n_periods = max((run.fp.tell() - run._pos_start_output) // run._bytes_per_period, 0)
+            run.run_failed = True
+            warn(f'The out-file "{filename}" is incomplete. Only the completely written periods are used.', SwmmOutExtractWarning)
+        return run
+
+    @property
+    def labels(self):
+        """dict[str, list]: dictionary of the object labels for each object type."""
+        return self.reference.labels
+
+    @property
+    def variables(self):
+        """dict[str, list]: variables per object-type inclusive the pollutants."""
+        return self.reference.variables
+
+    @property
+    def index(self):
+        """
+        Common time axis of all runs.
+
+        Returns:
+            pandas.DatetimeIndex | pandas.TimedeltaIndex: datetime index (``align='datetime'``)
+                or time since the start of the runs (``align='period'``).
+        """
+        if self.align == 'datetime':
+            return pd.date_range(self.start_date, periods=self.n_periods, freq=self.reference.report_interval)
+        return pd.timedelta_range(0, periods=self.n_periods, freq=self.reference.report_interval)
+
+    def _get_columns(self, kind=None, label=None, variable=None):
+        columns = self.reference._filter_part_columns(kind, label, variable)
+        return columns, self.reference._get_labels_and_offsets(columns)[1]
+
+    def _run_window(self, i_run, i_period, n_periods):
+        """
+        Get the periods of a run which are in a window of the common time axis.
+
+        Returns:
+            tuple[int, int, int]: first period in the run, number of periods and the position in the window.
+        """
+        run_start = i_period - self.offsets[i_run]
+        first = max(run_start, 0)
+        last = min(run_start + n_periods, self.runs[i_run].n_periods)
+        return int(first), int(max(last - first, 0)), int(first - run_start)
+
+    def to_numpy(self, kind=None, label=None, variable=None, processes=1):
+        """
+        Get specific columns of all runs as 3D-array.
+
+        Args:
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            processes (int): number of parallel processes, each reading one file at a time.
+
+        Returns:
+            numpy.ndarray: float32-array with the dimensions (run, time, column).
+                The columns are in the order of :meth:`SwmmOutput._filter_part_columns`.
+        """
+        columns, offset_list = self._get_columns(kind, label, variable)
+        values = np.full((len(self.runs), self.n_periods, len(columns)), np.nan, dtype='f4')
+
+        args = []
+        for i_run, run in enumerate(self.runs):
+            first, n, i_window = self._run_window(i_run, 0, self.n_periods)
+            args.append((run.filename, offset_list, run._pos_start_output + first * run._bytes_per_period, n, run._bytes_per_period))
+
+        if processes > 1:
+            from multiprocessing import Pool
+            with Pool(processes) as pool:
+                results = pool.starmap(_read_run, args)
+        else:
+            results = (_read_run(*a) for a in args)
+
+        for i_run, run_values in enumerate(results):
+            values[i_run, self.offsets[i_run]:self.offsets[i_run] + run_values.shape[0]] = run_values
+
+        return values
+
+    def to_xarray(self, kind=None, label=None, variable=None, processes=1):
+        """
+        Get specific columns of all runs as :class:`xarray.DataArray`.
+
+        Requires the package ``xarray``.
+
+        Args:
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            processes (int): number of parallel processes, each reading one file at a time.
+
+        Returns:
+            xarray.DataArray: data with the dimensions (run, time, column).
+        """
+        import xarray as xr
+        columns, _ = self._get_columns(kind, label, variable)
+        return xr.DataArray(self.to_numpy(kind, label, variable, processes=processes),
+                            dims=('run', 'time', 'column'),
+                            coords={'run': [str(fn) for fn in self.filenames],
+                                    'time': self.index,
+                                    'column': ['/'.join(c) for c in columns]})
+
+    def reduce(self, func, kind=None, label=None, variable=None, rows=None, **kwargs):
+        """
+        Reduce specific columns across all runs in chunks of periods.
+
+        Only one chunk of periods of all runs is held in memory at a time.
+
+        Args:
+            func (function): reduction function with the signature ``func(values, axis=0, **kwargs)``,
+                where ``values`` is a 3D-array (run, time, column) with NaN for missing values.
+                I.e. :func:`numpy.nanmean`, :func:`numpy.nanmax` or :func:`numpy.nanpercentile` (``q=[5, 50, 95]``).
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            rows (int): number of periods per chunk. Default: as many as fit in about 64 MB for all runs.
+            **kwargs: additional keyword arguments for ``func``.
+
+        Returns:
+            numpy.ndarray: reduced values with time as second to last and the columns as last dimension.
+                I.e. (time, column) for :func:`numpy.nanmean` and (quantile, time, column) for :func:`numpy.nanpercentile`.
+        """
+        columns, offset_list = self._get_columns(kind, label, variable)
+
+        if rows is None:
+            rows = _get_rows_per_chunk(len(self.runs) * max(len(columns), 1) * _RECORDSIZE)
+
+        results = []
+        for i_period in range(0, self.n_periods, rows):
+            n_periods = min(rows, self.n_periods - i_period)
+            values = np.full((len(self.runs), n_periods, len(columns)), np.nan, dtype='f4')
+            for i_run, run in enumerate(self.runs):
+                first, n, i_window = self._run_window(i_run, i_period, n_periods)
+                if n == 0:
+                    continue
+                # the reading buffer of each run is sized by its whole period, not by the window of the reduction
+                for chunk in _iter_selective_results(run.fp, offset_list, run._pos_start_output + first * run._bytes_per_period,
+                                                     n, run._bytes_per_period):
+                    values[i_run, i_window:i_window + chunk.shape[0]] = chunk
+            results.append(func(values, axis=0, **kwargs))
+
+        return np.concatenate(results, axis=-2)
@@ -10,11 +10,16 @@
 import copy
 
 import datetime
+import math
+import pickle
+import struct
 from io import SEEK_END, SEEK_SET
 from pathlib import Path
 
 from warnings import warn
 
+import numpy as np
+
 from .definitions import OBJECTS, VARIABLES
 from .._io_helpers._read_bin import BinaryReader
 
@@ -38,6 +43,15 @@ _LINK_TYPES = ['CONDUIT', 'PUMP', 'ORIFICE', 'WEIR', 'OUTLET']
 
 _ERROR_MESSAGE_PREFIX = '*   '
 
+_HEADER_CACHE_SUFFIX = '.idx'
+_HEADER_CACHE_VERSION = 1
+# attributes set by SwmmOutExtract._read_header
+_HEADER_ATTRIBUTES = ['run_failed', 'swmm_version', 'flow_unit', 'labels', 'variables', 'pollutant_units',
+                      '_label_index', '_variable_index', '_kind_record_start',
+                      '_property_codes', 'model_properties_array', '_model_properties', '_variable_codes',
+                      '_base_date', 'report_interval', '_bytes_per_period', '_pos_start_output', 'start_date',
+                      'n_periods']
+
 
 class SwmmExtractValueError(Exception):
     def __init__(self, message):
@@ -56,6 +70,9 @@ class SwmmOutExtract(BinaryReader):
         flow_unit (str): Flow unit. One of [``'CMS', 'LPS', 'MLD', 'CFS', 'GPM', 'MGD'``]
         labels (dict[str, list]): dictionary of the object labels as list (value) for each object type
             (keys are: ``'link'``, ``'node'``, ``'subcatchment'``)
+        model_properties_array (dict[str, numpy.ndarray]): property values for the subcatchments, nodes and links
+            as structured arrays (one field per property, the ``type`` as integer code).
+            See :meth:`model_properties_frame` for a table per object kind.
         model_properties (dict[str, [dict[str, list]]]): property values for the subcatchments, nodes and links. 
             The Properties for the objects are.
         
@@ -84,16 +101,31 @@ class SwmmOutExtract(BinaryReader):
     Args:
         filename (str): Path to the .out-file.
         encoding (str): Encoding of the text in the binary-file (None -> auto-detect encoding ... takes a few seconds | '' -> use default = 'utf-8')
+        header_cache (bool): if ``True``, save the parsed header in a sidecar file (``<filename>.idx``)
+            and reuse it when the file is opened again (see :meth:`_read_header_cache`).
     """
     filename: str or Path
 
-    def __init__(self, filename, skip_init=False, encoding=''):
+    def __init__(self, filename, skip_init=False, encoding='', header_cache=False):
         super().__init__(filename, encoding)
 
         if skip_init:
             return
+
+        use_cache = header_cache and isinstance(self.filename, Path)
+        if use_cache and self._read_header_cache():
+            return
+
+        self._read_header()
+
+        if use_cache and not self.run_failed:
+            self._write_header_cache()
+
+    def _read_header(self):
+        """
+        Read the header of the file (everything except the results) and set the attributes.
+        """
         # ____
-        self.fp.seek(-6 * _RECORDSIZE, SEEK_END)
         (
             _pos_start_labels,  # starting file position of ID names
             _pos_start_input,  # starting file position of input data
@@ -101,7 +133,7 @@ class SwmmOutExtract(BinaryReader):
             self.n_periods,  # Number of reporting periods
             error_code,
             magic_num_end,
-        ) = self._next(6)
+        ) = self._read_closing_records()
 
         # ____
         self.fp.seek(0, SEEK_SET)
@@ -137,9 +169,16 @@ class SwmmOutExtract(BinaryReader):
         # ____
         # Read in the names
         # get the dictionary of the object labels for each object type (link, node, subcatchment)
+        counts = [n_subcatch, n_nodes, n_links, n_pollutants]
+        if magic_num_end == _MAGIC_NUMBER:
+            # size of the labels-block is known -> read it at once (without the pollutant units)
+            labels = self._next_labels(sum(counts), size=_pos_start_input - _pos_start_labels - n_pollutants * _RECORDSIZE)
+        else:
+            labels = self._next_labels(sum(counts))
+
         self.labels = {}
-        for kind, n in zip(OBJECTS.LIST_, [n_subcatch, n_nodes, n_links, n_pollutants, 0]):
-            self.labels[kind] = [self._next(n=self._next(), dtype='s') for _ in range(n)]
+        for kind, n in zip(OBJECTS.LIST_, counts):
+            self.labels[kind], labels = labels[:n], labels[n:]
 
         # ____
         # print(self.fp.tell(), _pos_start_input)
@@ -155,6 +194,10 @@ class SwmmOutExtract(BinaryReader):
         # System vars do not have names per se, but made names = number labels
         self.labels[OBJECTS.SYSTEM] = ['']  # self.variables[OBJECTS.SYSTEM]
 
+        # ____
+        # hash index of the labels and variables for fast lookups
+        self._set_label_index()
+
         # ____
         # Read codes of pollutant concentration UNITS = Number of pollutants * 4 byte integers
         _pollutant_unit_labels = [_CONCENTRATION_UNITS[p] if p < len(_CONCENTRATION_UNITS) else 'NaN'
@@ -169,33 +212,33 @@ class SwmmOutExtract(BinaryReader):
         #     type, invert, & max. depth
         #   link
         #     type, offsets [ht. above start node invert (ft), ht. above end node invert (ft)], max. depth, & length
-        self.model_properties = {}
+        self._property_codes = {}
+        self.model_properties_array = {}
+        self._model_properties = None
         for kind in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK]:
-            self.model_properties[kind] = {}
             # ------
             # read the property labels per object type
+            self._property_codes[kind] = list(self._next(self._next(), flat=False))
             property_labels = []
-            for i in list(self._next(self._next(), flat=False)):
+            for i in self._property_codes[kind]:
                 property_label = _PROPERTY_LABELS[i]
                 if property_label in property_labels:
                     property_label += '_2'
                 property_labels.append(property_label)
             # ------
-            # read the values per object and per property
-            for label in self.labels[kind]:
-                self.model_properties[kind][label] = {}
-                for property_label in property_labels:
-                    value = self._next(dtype={'type': 'i'}.get(property_label, 'f'))
-                    if property_label == 'type':
-                        value = {OBJECTS.NODE: _NODES_TYPES, OBJECTS.LINK: _LINK_TYPES}[kind][value]
-                    self.model_properties[kind][label][property_label] = value
+            # read the values of all objects at once
+            dtype = np.dtype([(p, '<i4' if p == 'type' else '<f4') for p in property_labels])
+            n_objects = len(self.labels[kind])
+            self.model_properties_array[kind] = np.frombuffer(self.fp.read(dtype.itemsize * n_objects),
+                                                              dtype=dtype, count=n_objects)
 
         # ____
         # double check variables
+        self._variable_codes = {}
         for kind in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK, OBJECTS.SYSTEM]:
             n_vars = self._next()
             assert n_vars == len(self.variables[kind])
-            self._next(n_vars)
+            self._variable_codes[kind] = list(self._next(n_vars, flat=False))
 
         # ____
 
@@ -219,14 +262,30 @@ class SwmmOutExtract(BinaryReader):
             return ErrorCode;
         }
         """
+        self._bytes_per_period = self._infer_bytes_per_period()
+        self._read_report_dates()
+
+        # ____
+        if magic_num_end != _MAGIC_NUMBER:
+            self._infer_n_periods()
+            warn('Infer time periods of the output file due to a corrupt SWMM .out-file.', SwmmOutExtractWarning)
+
+        if self.n_periods == 0:
+            warn('There are zero time periods in the output file.', SwmmOutExtractWarning)
+            # raise SwmmExtractValueError('There are zero time periods in the output file.')
+
+    def _read_report_dates(self):
+        """
+        Read the report start date and the report interval, which are at the end of the header.
+
+        The stream must be at the position of the report start date.
+        Sets the attributes ``report_interval``, ``_pos_start_output`` and ``start_date``.
+        """
         self._base_date = datetime.datetime(1899, 12, 30)
         _offset_start_td = datetime.timedelta(days=self._next(dtype='d'))
         # self.start_date_ = _base_date + _offset_start_td
         self.report_interval = datetime.timedelta(seconds=self._next())
 
-        # ____
-        self._bytes_per_period = self._infer_bytes_per_period()
-
         # ____
         # print(self.fp.tell(), _pos_start_output)
         # assert _pos_start_output == self.fp.tell()
@@ -236,22 +295,175 @@ class SwmmOutExtract(BinaryReader):
 
         # ____
         # date-offset of the first index in the timeseries
-        _offset_first_index_td = datetime.timedelta(days=self._next(dtype='d'))
+        first_index = self.fp.read(2 * _RECORDSIZE)
+        if len(first_index) < 2 * _RECORDSIZE:
+            # no period written yet (i.e. SWMM has just started)
+            # -> the saved report start date is one report step prior to the first reported result
+            _factor = 1
+        else:
+            _offset_first_index_td = datetime.timedelta(days=struct.unpack('d', first_index)[0])
 
-        # rounding error in first offset (can only be an integer multiple of report_interval)
-        _factor = (_offset_first_index_td - _offset_start_td) / self.report_interval
+            # rounding error in first offset (can only be an integer multiple of report_interval)
+            _factor = (_offset_first_index_td - _offset_start_td) / self.report_interval
 
         # get real start date of the timeseries
         self.start_date = self._base_date + _offset_start_td + self.report_interval * int(_factor)
 
-        # ____
-        if magic_num_end != _MAGIC_NUMBER:
-            self._infer_n_periods()
-            warn('Infer time periods of the output file due to a corrupt SWMM .out-file.', SwmmOutExtractWarning)
+    @property
+    def _header_cache_filename(self):
+        """Path to the sidecar file of the header cache."""
+        return self.filename.with_name(self.filename.name + _HEADER_CACHE_SUFFIX)
 
-        if self.n_periods == 0:
-            warn('There are zero time periods in the output file.', SwmmOutExtractWarning)
-            # raise SwmmExtractValueError('There are zero time periods in the output file.')
+    def _get_file_signature(self):
+        """
+        Get the values used to validate the header cache.
+
+        Returns:
+            tuple: file size, modification time (ns), starting magic number and the closing records.
+        """
+        stats = self.filename.stat()
+        self.fp.seek(0, SEEK_SET)
+        magic_num_start = self._next()
+        return stats.st_size, stats.st_mtime_ns, magic_num_start, self._read_closing_records()
+
+    def _read_header_cache(self):
+        """
+        Set the header attributes from the sidecar file of the header cache.
+
+        The cache is only used if the file size, the modification time,
+        the magic numbers and the closing records of the out-file are unchanged.
+
+        .. Important::
+            The cache is a pickle-file. Only use it for files from a trusted source.
+
+        Returns:
+            bool: if the header was read from the cache.
+        """
+        fn_cache = self._header_cache_filename
+        if not fn_cache.is_file():
+            return False
+
+        try:
+            with open(fn_cache, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception:
+            return False
+
+        if (cache.get('version') != _HEADER_CACHE_VERSION) or (cache.get('signature') != self._get_file_signature()):
+            return False
+
+        self.__dict__.update(cache['header'])
+        return True
+
+    def _write_header_cache(self):
+        """
+        Write the parsed header to the sidecar file of the header cache.
+
+        Only complete files are cached. If the file can not be written (i.e. missing permissions) a warning is shown.
+        """
+        cache = {
+            'version': _HEADER_CACHE_VERSION,
+            'signature': self._get_file_signature(),
+            'header': {a: getattr(self, a) for a in _HEADER_ATTRIBUTES},
+        }
+        try:
+            with open(self._header_cache_filename, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            warn(f'Could not write the header cache of the out-file: {e}', SwmmOutExtractWarning)
+
+    def _next_labels(self, n, size=None):
+        """
+        Read the next ``n`` labels (each one with its length as leading integer) in the binary .out-file.
+
+        The labels are read in large blocks and decoded from the buffer,
+        instead of two reads per label.
+
+        Args:
+            n (int): number of labels to read.
+            size (int): size of the labels-block in bytes if known.
+
+        Returns:
+            list[str]: labels
+        """
+        pos_start = self.fp.tell()
+        buffer = self.fp.read(size) if size else b''
+        chunk_size = 2 ** 20
+
+        def _read_until(end):
+            nonlocal buffer
+            while len(buffer) < end:
+                block = self.fp.read(max(chunk_size, end - len(buffer)))
+                if not block:
+                    raise EOFError(f'The out-file ended in the labels block (after {len(labels)} of {n} labels).')
+                buffer += block
+
+        labels = []
+        i = 0
+        for _ in range(n):
+            _read_until(i + _RECORDSIZE)
+            length = int.from_bytes(buffer[i:i + _RECORDSIZE], 'little')
+            i += _RECORDSIZE
+            _read_until(i + length)
+            labels.append(str(buffer[i:i + length], encoding=self.encoding, errors="replace"))
+            i += length
+
+        self.fp.seek(pos_start + i, SEEK_SET)
+        return labels
+
+    @property
+    def model_properties(self):
+        """
+        Property values for the subcatchments, nodes and links as dictionary.
+
+        Created on first access from :attr:`model_properties_array`.
+
+        Returns:
+            dict[str, [dict[str, dict]]]: properties per object kind and label.
+        """
+        if self._model_properties is None:
+            self._model_properties = {}
+            for kind, array in self.model_properties_array.items():
+                columns = {}
+                for property_label in array.dtype.names:
+                    values = array[property_label].tolist()
+                    if property_label == 'type':
+                        types = {OBJECTS.NODE: _NODES_TYPES, OBJECTS.LINK: _LINK_TYPES}[kind]
+                        values = [types[i] for i in values]
+                    columns[property_label] = values
+                self._model_properties[kind] = {label: dict(zip(columns, values))
+                                                for label, *values in zip(self.labels[kind], *columns.values())}
+        return self._model_properties
+
+    def model_properties_frame(self, kind):
+        """
+        Get the property values of one object kind as table.
+
+        Args:
+            kind (str): one of ``'subcatchment'``, ``'node'`` or ``'link'``.
+
+        Returns:
+            pandas.DataFrame: table with the labels as index and the properties as columns.
+        """
+        import pandas as pd
+        array = self.model_properties_array[kind]
+        df = pd.DataFrame(array, index=pd.Index(self.labels[kind]))
+        if 'type' in df:
+            df['type'] = pd.Categorical.from_codes(df['type'], {OBJECTS.NODE: _NODES_TYPES, OBJECTS.LINK: _LINK_TYPES}[kind])
+        return df
+
+    def _read_closing_records(self):
+        """
+        Read the closing records at the end of the file.
+
+        If the file is not complete (i.e. SWMM is still running), these values are meaningless.
+
+        Returns:
+            tuple[int]: start position of the labels, start position of the input data,
+                start position of the output data, number of periods, error code and the ending magic number.
+        """
+        self.fp.seek(-6 * _RECORDSIZE, SEEK_END)
+        return self._next(6)
 
     def _infer_bytes_per_period(self):
         """
@@ -267,62 +479,93 @@ class SwmmOutExtract(BinaryReader):
         _bytes_per_period *= _RECORDSIZE
         return _bytes_per_period
 
+    def _set_label_index(self):
+        """
+        Build the hash index (dict) of the positions of the labels and variables per object kind.
+
+        Sets the attributes ``_label_index``, ``_variable_index`` and ``_kind_record_start``.
+        """
+        self._label_index = {kind: {label: i for i, label in enumerate(self.labels[kind])} for kind in OBJECTS.LIST_}
+        self._variable_index = {kind: {variable: i for i, variable in enumerate(self.variables[kind])} for kind in OBJECTS.LIST_}
+
+        # index of the first record (4 bytes) of each object kind in a period (after the datetime = 2 records)
+        self._kind_record_start = {}
+        record_start = 2
+        for kind in OBJECTS.LIST_:
+            self._kind_record_start[kind] = record_start
+            if kind != OBJECTS.POLLUTANT:
+                record_start += len(self.labels[kind]) * len(self.variables[kind])
+
     def _get_labels_and_offsets(self, columns):
-        n_vars_subcatch = len(self.variables[OBJECTS.SUBCATCHMENT])
-        n_vars_node = len(self.variables[OBJECTS.NODE])
-        n_vars_link = len(self.variables[OBJECTS.LINK])
+        """
+        Get the column names and the byte offsets of the columns relative to the start of a period.
 
-        n_subcatch = len(self.labels[OBJECTS.SUBCATCHMENT])
-        n_nodes = len(self.labels[OBJECTS.NODE])
-        n_links = len(self.labels[OBJECTS.LINK])
+        Args:
+            columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
 
+        Returns:
+            tuple[list[str], list[int]]: column names ('/' as separator) and the byte offsets
+        """
         offset_list = []
         label_list = []
 
         for kind, label, variable in columns:
             label_list.append('/'.join([kind, label, variable]))
-
-            index_kind = OBJECTS.LIST_.index(kind)
-            index_variable = self.variables[kind].index(variable)
-            item_index = self.labels[kind].index(str(label))
-            offset_list.append((2 + index_variable + {
-                0: (item_index * n_vars_subcatch),
-                1: (n_subcatch * n_vars_subcatch +
-                    item_index * n_vars_node),
-                2: (n_subcatch * n_vars_subcatch +
-                    n_nodes * n_vars_node +
-                    item_index * n_vars_link),
-                4: (n_subcatch * n_vars_subcatch +
-                    n_nodes * n_vars_node +
-                    n_links * n_vars_link)
-            }[index_kind]) * _RECORDSIZE)
+            offset_list.append((self._kind_record_start[kind]
+                                + self._label_index[kind][str(label)] * len(self.variables[kind])
+                                + self._variable_index[kind][variable]) * _RECORDSIZE)
 
         return label_list, offset_list
 
-    def _get_start_position_and_periods(self, start=None, end=None):
-        if all([i is None for i in [start, end]]):
-            return self._pos_start_output, self.n_periods
+    def _get_period_range(self, start=None, end=None):
+        """
+        Get the number of the first period and the number of periods in a time window.
+
+        The period numbers are calculated directly from the start date and the report interval,
+        without creating or scanning the datetime index.
+
+        Args:
+            start (datetime): start datetime for the period to read (inclusive).
+            end (datetime): end datetime for the period to read (inclusive).
 
+        Returns:
+            tuple[int, int]: number of the first period and number of periods in the window.
+        """
         if start is None:
             i_period_start = 0
         else:
-            i_period_start = (start - self.start_date) / self.report_interval
+            # first period at or after start
+            i_period_start = max(math.ceil((start - self.start_date) / self.report_interval - 1e-9), 0)
 
         if end is None:
-            i_period_end = self.n_periods - i_period_start
+            i_period_end = self.n_periods - 1
         else:
-            i_period_end = (end - self.start_date) / self.report_interval
+            # last period at or before end
+            i_period_end = min(math.floor((end - self.start_date) / self.report_interval + 1e-9), self.n_periods - 1)
+
+        return int(i_period_start), int(max(i_period_end - i_period_start + 1, 0))
 
-        n_periods = i_period_end - i_period_start + 1
-        pos_start_output = self._pos_start_output + i_period_start * self._bytes_per_period
-        return int(pos_start_output), int(n_periods)
+    def _get_start_position_and_periods(self, start=None, end=None):
+        """
+        Get the byte position of the first period and the number of periods in a time window.
+
+        Args:
+            start (datetime): start datetime for the period to read (inclusive).
+            end (datetime): end datetime for the period to read (inclusive).
+
+        Returns:
+            tuple[int, int]: byte position of the first period and number of periods in the window.
+        """
+        i_period_start, n_periods = self._get_period_range(start, end)
+        return self._pos_start_output + i_period_start * self._bytes_per_period, n_periods
 
     def _get_selective_results(self, columns, show_progress=True, start=None, end=None):
         """
         Get results of selective columns in .out-file.
 
-        This function is due to its iterative reading slow,
-        but has its advantages with out-files with many columns (>1000) and fewer time-steps
+        The periods are read in large chunks and only the requested columns are kept.
+        This has its advantages with out-files with many columns (>1000),
+        as the memory usage only depends on the number of requested columns.
 
         Args:
             columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
@@ -331,7 +574,7 @@ class SwmmOutExtract(BinaryReader):
             end (datetime): end datetime for the period to read.
 
         Returns:
-            dict[str, list]: dictionary where keys are the column names ('/' as separator) and values are the list of result values
+            dict[str, numpy.ndarray]: dictionary where keys are the column names ('/' as separator) and values are the float32-arrays of result values
         """
         progress_desc = f'{repr(self)}.get_selective_results(n_cols={len(columns)})'
 
@@ -340,7 +583,8 @@ class SwmmOutExtract(BinaryReader):
 
         # ---
         # from ._basic_selective_results import _get_selective_results  # cpython
-        from ._basic_selective_results_python import _get_selective_results
+        # from ._basic_selective_results_python import _get_selective_results  # seek and read every single value
+        from ._basic_selective_results_numpy import _get_selective_results
         v = _get_selective_results(self.fp, label_list, offset_list, pos_start_output,
                                    n_periods, self._bytes_per_period, progress_desc, show_progress)
         return v
@@ -369,7 +613,7 @@ class SwmmOutExtract(BinaryReader):
         est_n_periods = int((last_offset - self._pos_start_output) / self._bytes_per_period)-1
         # self.n_periods
 
-        step = int(est_n_periods / 4)
+        step = max(int(est_n_periods / 4), 1)
         period = 0
 
         # 1289386
@@ -383,7 +627,6 @@ class SwmmOutExtract(BinaryReader):
         # self.start_date + est_n_periods * self.report_interval
 
         # self.fp.tell()
-        import math
 
         # period = est_n_periods-1
 
@@ -6,8 +6,10 @@ __version__ = "0.1"
 __license__ = "MIT"
 
 import datetime
+import time
 import warnings
 from itertools import product
+from io import SEEK_END, SEEK_SET
 from pathlib import Path
 
 import numpy as np
@@ -15,7 +17,7 @@ import pandas as pd
 
 from pandas._libs import OutOfBoundsDatetime
 
-from .extract import SwmmOutExtract
+from .extract import SwmmOutExtract, _MAGIC_NUMBER, _RECORDSIZE
 from .definitions import OBJECTS, VARIABLES
 
 from . import parquet_helpers as parquet
@@ -35,6 +37,8 @@ class SwmmOutput(SwmmOutExtract):
         index (pandas.DatetimeIndex): Index of the timeseries of the data.
         flow_unit (str): Flow unit. One of [``'CMS', 'LPS', 'MLD', 'CFS', 'GPM', 'MGD'``]
         labels (dict[str, list]): dictionary of the object labels as list (value) for each object type (keys are: ``'link'``, ``'node'``, ``'subcatchment'``)
+        model_properties_array (dict[str, numpy.ndarray]): property values for the subcatchments, nodes and links
+            as structured arrays. See :meth:`SwmmOutput.model_properties_frame` for a table per object kind.
         model_properties (dict[str, [dict[str, list]]]): property values for the subcatchments, nodes and links.
             The Properties for the objects are...
 
@@ -59,28 +63,50 @@ class SwmmOutput(SwmmOutExtract):
     """
     filename: Path = ...
 
-    def __init__(self, filename, skip_init=False, encoding=''):
+    def __init__(self, filename, skip_init=False, encoding='', memmap=False, header_cache=False):
         """
         Read a SWMM-output-file (___.out).
 
         Args:
             filename(str | Path): Path to the output-file (.out).
             encoding (str): Encoding of the text in the binary-file (None -> auto-detect encoding ... takes a few seconds | '' -> use default = 'utf-8')
+            memmap (bool): if ``True``, the results are not read into memory,
+                but accessed through a read-only memory-map (:class:`numpy.memmap`) of the file.
+                Only the pages of the file which are actually used are read from the disk,
+                and several processes reading the same file share the operating system page cache.
+                Only available if ``filename`` is a path and not a stream.
+            header_cache (bool): if ``True``, save the parsed header (labels, properties, variables, start date, ...)
+                in a small sidecar file (``<filename>.idx``) and reuse it when the file is opened again.
+                The cache is validated by the file size, the modification time and the magic numbers of the file.
+                Only available if ``filename`` is a path and not a stream.
         """
-        SwmmOutExtract.__init__(self, filename, skip_init=skip_init, encoding=encoding)
+        SwmmOutExtract.__init__(self, filename, skip_init=skip_init, encoding=encoding, header_cache=header_cache)
 
         self._frame = None
         self._data = None
+        self._memmap = memmap and isinstance(self.filename, Path)
 
-        if skip_init:
-            return
+        # the main datetime index for the results (created on first access)
+        self._index = None
 
-        # the main datetime index for the results
-        self.index = self._get_index()
+        # if SWMM has finished writing the file (set by refresh)
+        self._finished = None
 
     def __enter__(self):
         return self
 
+    @property
+    def index(self):
+        """
+        Main datetime index of the results.
+
+        Returns:
+            pandas.DatetimeIndex: Index of the timeseries of the data.
+        """
+        if self._index is None:
+            self._index = self._get_index()
+        return self._index
+
     def _get_dtypes(self):
         """
         Get the dtypes of the data.
@@ -90,6 +116,15 @@ class SwmmOutput(SwmmOutExtract):
         """
         return 'f8' + ',f4' * self.number_columns
 
+    def _get_structured_dtype(self):
+        """
+        Get the structured numpy dtype of one period (=row) in the results block.
+
+        Returns:
+            numpy.dtype: dtype with the field ``'datetime'`` and one field per column (``'kind/label/variable'``)
+        """
+        return np.dtype([('datetime', 'f8')] + [('/'.join(i), 'f4') for i in self._columns_raw])
+
     @property
     def number_columns(self):
         """
@@ -117,25 +152,79 @@ class SwmmOutput(SwmmOutExtract):
         return columns
 
     def _get_index(self, start=None, end=None):
-        if start is None:
-            start = self.start_date
+        """
+        Get the datetime index for a time window.
 
-        # n_periods = number of time-steps (rows) to read (including start time-step (row))
-        if end is None:
-            n_periods = int(self.n_periods - (start - self.start_date) / self.report_interval)
-        else:
-            n_periods = int((end - start) / self.report_interval) + 1
+        Args:
+            start (datetime): start datetime of the window.
+            end (datetime): end datetime of the window.
+
+        Returns:
+            pandas.DatetimeIndex: index of the periods in the window.
+        """
+        return self._get_index_periods(*self._get_period_range(start, end))
 
+    def _get_index_periods(self, i_period, n_periods, every=1):
+        """
+        Get the datetime index for a range of periods.
+
+        Args:
+            i_period (int): number of the first period.
+            n_periods (int): number of periods.
+            every (int): step between the periods.
+
+        Returns:
+            pandas.DatetimeIndex: index of the periods.
+        """
+        start = self.start_date + i_period * self.report_interval
+        freq = self.report_interval * every
         try:
-            return pd.date_range(start, periods=n_periods, freq=self.report_interval)
+            return pd.date_range(start, periods=n_periods, freq=freq)
         except OutOfBoundsDatetime:
             warnings.warn('Can not create a pandas.DatetimeIndex in given date-range. Default to pandas.Index.')
-            return pd.Index([start + self.report_interval * i for i in range(n_periods)])
+            return pd.Index([start + freq * i for i in range(n_periods)])
+
+    def _get_resample_bins(self, freq, every=None):
+        """
+        Get the bins to aggregate the periods into.
+
+        The bins start at midnight of the start day of the simulation.
+
+        Args:
+            freq (str | datetime.timedelta): size of the bins (as understood by :class:`pandas.Timedelta`).
+            every (int): step between the used periods (only to check if the bins are larger than the step).
+
+        Returns:
+            tuple[function, function]: function converting an array of period numbers to bin numbers
+                and function converting an array of bin numbers to the datetime index (left edge of the bins).
+        """
+        bin_size = pd.Timedelta(freq)
+        if bin_size <= pd.Timedelta(0):
+            raise ValueError(f'The resample frequency must be positive, not "{freq}".')
+        if bin_size < self.report_interval * (every or 1):
+            warnings.warn(f'The resample frequency "{freq}" is smaller than the step between the periods. '
+                          f'The result has gaps.')
+
+        origin = pd.Timestamp(self.start_date).normalize()
+        # integer arithmetic in microseconds to avoid rounding errors at the bin edges
+        offset = (pd.Timestamp(self.start_date) - origin) // pd.Timedelta(microseconds=1)
+        step = pd.Timedelta(self.report_interval) // pd.Timedelta(microseconds=1)
+        size = bin_size // pd.Timedelta(microseconds=1)
+
+        def period_to_bin(periods):
+            return (offset + periods.astype(np.int64) * step) // size
+
+        def bin_to_index(bins):
+            return origin + pd.to_timedelta(bins * size, unit='us')
+
+        return period_to_bin, bin_to_index
 
     def to_numpy(self, ignore_filesize=False, start=None, end=None):
         """
         Convert all data to a numpy-array.
 
+        If the file was opened with ``memmap=True``, the returned array is a read-only memory-map of the file.
+
         Args:
             ignore_filesize (bool): hide a warning when reading a huge output-file.
             start (datetime): start datetime for the period to read.
@@ -144,6 +233,9 @@ class SwmmOutput(SwmmOutExtract):
         Returns:
             numpy.ndarray: all data
         """
+        if self._memmap:
+            return self._to_numpy_memmap(start=start, end=end)
+
         if self._data is None:
 
             if not ignore_filesize and isinstance(self.filename, Path):
@@ -156,27 +248,28 @@ class SwmmOutput(SwmmOutExtract):
                                   f"If you are only interested in a specific portion of the file, "
                                   f"please utilize the .get_part() function with the slim=True parameter. "
                                   f"This way, only the necessary data is read from the file. "
+                                  f"Alternatively open the file with memmap=True to access the data without loading it into memory. "
                                   f"To disregard and suppress this message, use the ignore_filesize=True parameter.", SwmmOutputWarning)
 
-            types = [('datetime', 'f8')] + [('/'.join(i), 'f4') for i in self._columns_raw]
+            types = self._get_structured_dtype()
 
             pos_start_output, n_periods = self._get_start_position_and_periods(start, end)
 
             self.fp.seek(pos_start_output, 0)
 
             if isinstance(self.filename, str) and (self.filename == '<stream>'):
-                array = np.frombuffer(self.fp.read1(), dtype=np.dtype(types), count=n_periods)
+                array = np.frombuffer(self.fp.read1(), dtype=types, count=n_periods)
             else:
                 try:
-                    array = np.fromfile(self.fp, dtype=np.dtype(types), count=n_periods)
+                    array = np.fromfile(self.fp, dtype=types, count=n_periods)
                 except:
-                    array = np.frombuffer(self.fp.read1(), dtype=np.dtype(types), count=n_periods)
-
-            # if file is incomplete n_periods can be different to inferred number of periods
-            self.n_periods = int(array.size)
-            self.index = self._get_index(start, end)
+                    array = np.frombuffer(self.fp.read1(), dtype=types, count=n_periods)
 
             if all([i is None for i in [start, end]]):
+                # if file is incomplete n_periods can be different to inferred number of periods
+                if self.n_periods != array.size:
+                    self.n_periods = int(array.size)
+                    self._index = None
                 # if the data is not sliced, save it as an attribute
                 self._data = array
 
@@ -185,12 +278,44 @@ class SwmmOutput(SwmmOutExtract):
         # if the attribute self._data is already set
         if not all([i is None for i in [start, end]]):
             # slice data
-            i_start = (self.index < start).sum()
-            i_end = (self.index > end).sum()
-            return self._data[i_start:-i_end]
+            i_start, n_periods = self._get_period_range(start, end)
+            return self._data[i_start:i_start + n_periods]
 
         return self._data
 
+    def _to_numpy_memmap(self, start=None, end=None):
+        """
+        Get the data as memory-mapped structured array (without copying the data into memory).
+
+        The whole results block is mapped once and time slices are just views on this map.
+
+        Args:
+            start (datetime): start datetime for the period to read.
+            end (datetime): end datetime for the period to read.
+
+        Returns:
+            numpy.memmap: all data as read-only memory-map
+        """
+        if self._data is None:
+            types = self._get_structured_dtype()
+            # if file is incomplete, only map the periods which are completely written
+            n_periods_in_file = (self.filename.stat().st_size - self._pos_start_output) // types.itemsize
+            n_periods = max(min(self.n_periods, n_periods_in_file), 0)
+            if n_periods == 0:
+                self._data = np.empty(0, dtype=types)
+            else:
+                self._data = np.memmap(self.filename, dtype=types, mode='r',
+                                       offset=self._pos_start_output, shape=(n_periods,))
+            if self.n_periods != n_periods:
+                self.n_periods = n_periods
+                self._index = None
+
+        if all([i is None for i in [start, end]]):
+            return self._data
+
+        i_start, n_periods = self._get_period_range(start, end)
+        return self._data[i_start:i_start + n_periods]
+
     def to_frame(self, ignore_filesize=False):
         """
         Convert all the data to a pandas-DataFrame.
@@ -210,7 +335,8 @@ class SwmmOutput(SwmmOutExtract):
             del self._frame['datetime']
         return self._frame
 
-    def get_part(self, kind=None, label=None, variable=None, slim=False, show_progress=True, ignore_filesize=False, start=None, end=None):
+    def get_part(self, kind=None, label=None, variable=None, slim=False, show_progress=True, ignore_filesize=False, start=None, end=None,
+                 as_frame=True, every=None, resample=None):
         """
         Get specific columns of the data.
 
@@ -263,27 +389,520 @@ class SwmmOutput(SwmmOutExtract):
                     - ``PET`` or :attr:`~swmm_api.output_file.definitions.SYSTEM_VARIABLES.PET`
 
             slim (bool): set to ``True`` to speedup the code if there are a lot of objects and just few time-steps in the out-file.
+                If a transposed companion file exists (see :meth:`SwmmOutput.to_transposed`), it is used in any case.
             processes (int): number of parallel processes for the slim-reading.
             show_progress (bool): show a progress bar for the slim-reading.
             ignore_filesize (bool): hide a warning when reading a huge output-file.
             start (datetime): start datetime for the period to read.
             end (datetime): end datetime for the period to read.
+            as_frame (bool): if ``False`` return a lightweight :class:`~swmm_api.output_file.result.SwmmOutputResult`
+                with a 2D-float32-array instead of pandas objects,
+                which avoids the costs of building a DataFrame with MultiIndex-columns for many columns.
+            every (int): only read every n-th period (starting with the first period in the window).
+            resample (tuple[str, str]): aggregate the periods into bins while reading, i.e. ``('1h', 'max')``.
+                Frequency as understood by :class:`pandas.Timedelta`
+                and one of the functions ``'max'``, ``'min'``, ``'mean'`` or ``'sum'``.
+                The bins start at midnight of the start day of the simulation and are labeled with their left edge
+                (like the default of :meth:`pandas.DataFrame.resample`).
+                If ``every`` or ``resample`` is set, the data is read and reduced in chunks of periods,
+                so the full-resolution time-series is never held in memory.
 
         Returns:
-            pandas.DataFrame | pandas.Series: Filtered data.
+            pandas.DataFrame | pandas.Series | SwmmOutputResult: Filtered data.
                 (return Series if only one column is selected otherwise return a DataFrame)
         """
         columns = self._filter_part_columns(kind, label, variable)
 
-        if slim:
+        if (every is not None) or (resample is not None):
+            label_list, _ = self._get_labels_and_offsets(columns)
+            chunks = list(self._iter_chunks(columns, *self._get_period_range(start, end), as_frame=False,
+                                            every=every, resample=resample))
+            if not as_frame:
+                from .result import SwmmOutputResult
+                if not chunks:
+                    return SwmmOutputResult(np.empty((0, len(columns)), dtype='f4'), columns, index=pd.DatetimeIndex([]))
+                return SwmmOutputResult(np.concatenate([v for _, v in chunks]), columns,
+                                        index=chunks[0][0].append([i for i, _ in chunks[1:]]))
+            if not chunks:
+                return self._to_pandas({})
+            index = chunks[0][0].append([i for i, _ in chunks[1:]])
+            values = np.concatenate([v for _, v in chunks])
+            return self._to_pandas(dict(zip(label_list, values.T)), index, drop_useless=True)
+
+        if not as_frame:
+            from .result import SwmmOutputResult
+            i_period, n_periods = self._get_period_range(start, end)
+            values = self._get_values(columns, i_period, n_periods)
+            return SwmmOutputResult(values, columns, periods=np.arange(i_period, i_period + values.shape[0]),
+                                    start_date=self.start_date, report_interval=self.report_interval)
+
+        if (self._data is None) and self._has_transposed():
+            values = self._get_transposed_results(columns, start=start, end=end)
+        elif slim:
             values = self._get_selective_results(columns, show_progress=show_progress, start=start, end=end)
         else:
             values = self.to_numpy(ignore_filesize=ignore_filesize, start=start, end=end)[list(map('/'.join, columns))]
 
-        index = self._get_index(start, end)
+        if all([i is None for i in [start, end]]):
+            index = self.index
+        else:
+            index = self._get_index(start, end)
 
         return self._to_pandas(values, index, drop_useless=True)
 
+    def _get_values(self, columns, i_period, n_periods):
+        """
+        Get the values of the columns for a range of periods as one 2D-array.
+
+        Uses the cached data, the transposed companion file or reads the file in chunks (in this order).
+
+        Args:
+            columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+            i_period (int): number of the first period to read.
+            n_periods (int): number of periods to read.
+
+        Returns:
+            numpy.ndarray: 2D-array (periods x columns) of float32 values.
+        """
+        if self._data is not None:
+            values = np.empty((n_periods, len(columns)), dtype='f4')
+            for j, column in enumerate(columns):
+                values[:, j] = self._data['/'.join(column)][i_period:i_period + n_periods]
+            return values
+
+        if self._has_transposed():
+            from ._transposed import read_transposed, _get_transposed_filename
+            _, offset_list = self._get_labels_and_offsets(columns)
+            return read_transposed(_get_transposed_filename(self.filename), [o // _RECORDSIZE - 2 for o in offset_list],
+                                   i_period, n_periods, self.n_periods)
+
+        values = np.empty((n_periods, len(columns)), dtype='f4')
+        n = 0
+        for i, chunk in self._iter_values(columns, i_period, n_periods):
+            values[n:n + chunk.shape[0]] = chunk
+            n += chunk.shape[0]
+        return values[:n]
+
+    def to_shared_memory(self, kind=None, label=None, variable=None, start=None, end=None, name=None):
+        """
+        Read specific columns once into shared memory, so other processes can use them without reading the file again.
+
+        Other processes attach with :meth:`SwmmOutputSharedResult.attach(name) <swmm_api.output_file.shared.SwmmOutputSharedResult.attach>`
+        and get a zero-copy numpy view with the same column metadata.
+        Without filters, the whole results block (without the datetimes) is published.
+
+        This process owns the segment and must free it with
+        :meth:`~swmm_api.output_file.shared.SwmmOutputSharedResult.unlink` (or use the result as context manager).
+
+        Requires Python >= 3.8.
+
+        Args:
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            start (datetime): start datetime for the period to read.
+            end (datetime): end datetime for the period to read.
+            name (str): name of the shared memory segment. Default: random name.
+
+        Returns:
+            swmm_api.output_file.shared.SwmmOutputSharedResult: results in the shared memory.
+        """
+        from .shared import SwmmOutputSharedResult
+        columns = self._filter_part_columns(kind, label, variable)
+        i_period, n_periods = self._get_period_range(start, end)
+        return SwmmOutputSharedResult._publish(self, columns, i_period, n_periods, name=name)
+
+    def to_transposed(self, rows=None, show_progress=True):
+        """
+        Convert the results to an object-major (transposed) companion file (``<filename>.transposed``).
+
+        The out-file stores the results period by period,
+        so reading the full time-series of one object touches the whole file.
+        In the transposed file the time-series of each column is one contiguous block.
+        Once the file exists and is up to date, :meth:`SwmmOutput.get_part` uses it automatically.
+
+        The conversion is done in chunks of periods with bounded memory usage.
+        The transposed file is as big as the out-file.
+
+        Args:
+            rows (int): number of periods read at once. Default: as many as fit in about 64 MB.
+            show_progress (bool): show a progress bar.
+
+        Returns:
+            Path: path to the transposed file.
+        """
+        from ._transposed import write_transposed
+        return write_transposed(self, rows=rows, show_progress=show_progress)
+
+    def _has_transposed(self):
+        """
+        Check if an up-to-date transposed companion file exists (see :meth:`SwmmOutput.to_transposed`).
+
+        Returns:
+            bool: if the transposed file can be used.
+        """
+        if not isinstance(self.filename, Path):
+            return False
+        from ._transposed import is_up_to_date
+        return is_up_to_date(self.filename, self._bytes_per_period // _RECORDSIZE - 2, self.n_periods)
+
+    def _get_transposed_results(self, columns, start=None, end=None):
+        """
+        Get results of selective columns from the transposed companion file.
+
+        Args:
+            columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+            start (datetime): start datetime for the period to read.
+            end (datetime): end datetime for the period to read.
+
+        Returns:
+            dict[str, numpy.ndarray]: dictionary where keys are the column names ('/' as separator) and values are the float32-arrays of result values
+        """
+        from ._transposed import read_transposed, _get_transposed_filename
+        label_list, offset_list = self._get_labels_and_offsets(columns)
+        i_period, n_periods = self._get_period_range(start, end)
+        values = read_transposed(_get_transposed_filename(self.filename), [o // _RECORDSIZE - 2 for o in offset_list],
+                                 i_period, n_periods, self.n_periods)
+        return {label: values[:, i] for i, label in enumerate(label_list)}
+
+    def iter_chunks(self, kind=None, label=None, variable=None, rows=1000, start=None, end=None, as_frame=True,
+                    every=None, resample=None):
+        """
+        Iterate over specific columns of the data in chunks of periods.
+
+        Only one chunk is held in memory at a time,
+        which makes it possible to process huge out-files with constant memory usage.
+
+        Args:
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            rows (int): maximum number of periods (=rows) per chunk.
+            start (datetime): start datetime for the period to read.
+            end (datetime): end datetime for the period to read.
+            as_frame (bool): if ``True`` yield pandas objects like :meth:`SwmmOutput.get_part`,
+                else yield a tuple of the index and a 2D-numpy-array (float32)
+                with the columns in the order of :meth:`SwmmOutput._filter_part_columns`.
+            every (int): only read every n-th period (see :meth:`SwmmOutput.get_part`).
+            resample (tuple[str, str]): aggregate the periods into bins, i.e. ``('1h', 'max')`` (see :meth:`SwmmOutput.get_part`).
+                A bin which continues in the next chunk is yielded with the next chunk,
+                so the chunks may contain fewer rows than ``rows``.
+
+        Yields:
+            pandas.DataFrame | pandas.Series | tuple[pandas.DatetimeIndex, numpy.ndarray]: chunk of the filtered data.
+        """
+        columns = self._filter_part_columns(kind, label, variable)
+        i_period, n_periods = self._get_period_range(start, end)
+        yield from self._iter_chunks(columns, i_period, n_periods, rows=rows, as_frame=as_frame, every=every, resample=resample)
+
+    def _iter_chunks(self, columns, i_period, n_periods, rows=None, as_frame=True, every=None, resample=None):
+        """
+        Iterate over the columns in chunks for a range of periods.
+
+        Args:
+            columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+            i_period (int): number of the first period to read.
+            n_periods (int): number of periods to read.
+            rows (int): maximum number of periods per chunk.
+            as_frame (bool): if ``True`` yield pandas objects, else yield a tuple of the index and a 2D-numpy-array.
+            every (int): only use every n-th period.
+            resample (tuple[str, str]): frequency and function to aggregate the periods into bins.
+
+        Yields:
+            pandas.DataFrame | pandas.Series | tuple[pandas.DatetimeIndex, numpy.ndarray]: chunk of the data.
+        """
+        from ._resample import _iter_every, _iter_resample
+
+        label_list, _ = self._get_labels_and_offsets(columns)
+
+        if every is not None:
+            every = int(every)
+            if every < 1:
+                raise ValueError(f'every must be a positive integer, not {every}.')
+            if rows is not None:
+                # rows refers to the periods in the output
+                rows *= every
+
+        chunks = self._iter_values(columns, i_period, n_periods, rows=rows)
+
+        if every is not None:
+            chunks = _iter_every(chunks, every, i_period)
+
+        if resample is not None:
+            freq, how = resample
+            period_to_bin, bin_to_index = self._get_resample_bins(freq, every)
+            chunks = ((bin_to_index(bins), values) for bins, values in _iter_resample(chunks, how, period_to_bin, every or 1))
+        else:
+            chunks = ((self._get_index_periods(i, values.shape[0], every=every or 1), values) for i, values in chunks)
+
+        for index, values in chunks:
+            if as_frame:
+                yield self._to_pandas(dict(zip(label_list, values.T)), index, drop_useless=True)
+            else:
+                yield index, values
+
+    def refresh(self):
+        """
+        Update the number of periods of an out-file which is still being written by SWMM.
+
+        While SWMM is running, the closing records of the file are missing
+        and the number of completely written periods is calculated from the file size.
+        When the run is finished, the number of periods is read from the closing records.
+        Cached data is dropped if the number of periods has changed.
+
+        Returns:
+            int: number of new periods since the last call.
+        """
+        n_periods_old = self.n_periods
+
+        self.fp.seek(0, SEEK_END)
+        filesize = self.fp.tell()
+
+        *_, n_periods, error_code, magic_num_end = self._read_closing_records()
+
+        if (magic_num_end == _MAGIC_NUMBER) and \
+                (filesize == self._pos_start_output + n_periods * self._bytes_per_period + 6 * _RECORDSIZE):
+            self._finished = True
+            self.run_failed = error_code != 0
+        else:
+            self._finished = False
+            n_periods = max((filesize - self._pos_start_output) // self._bytes_per_period, 0)
+
+        if (n_periods_old == 0) and n_periods:
+            # the start date was derived from the report start date while no period was written
+            self.fp.seek(self._pos_start_output - 3 * _RECORDSIZE, SEEK_SET)
+            self._read_report_dates()
+
+        if n_periods != n_periods_old:
+            self.n_periods = n_periods
+            self._index = None
+            self._data = None
+            self._frame = None
+
+        return n_periods - n_periods_old
+
+    def follow(self, kind=None, label=None, variable=None, interval=1., timeout=None, rows=None, from_start=False, as_frame=True):
+        """
+        Follow an out-file which is still being written by SWMM and yield the newly written periods.
+
+        Checks the file every ``interval`` seconds for new periods with :meth:`SwmmOutput.refresh`
+        and stops when SWMM has finished writing the file.
+
+        Args:
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            interval (float): seconds to wait between the checks for new periods.
+            timeout (float): stop if no new periods were written for this number of seconds. Default: wait forever.
+            rows (int): maximum number of periods per chunk.
+            from_start (bool): if ``True`` yield the periods already written before the first call, too.
+            as_frame (bool): if ``True`` yield pandas objects like :meth:`SwmmOutput.get_part`,
+                else yield a tuple of the index and a 2D-numpy-array (float32).
+
+        Yields:
+            pandas.DataFrame | pandas.Series | tuple[pandas.DatetimeIndex, numpy.ndarray]: newly written data.
+        """
+        columns = self._filter_part_columns(kind, label, variable)
+
+        self.refresh()
+        i_period = 0 if from_start else self.n_periods
+        last_update = time.monotonic()
+
+        while True:
+            if self.n_periods > i_period:
+                yield from self._iter_chunks(columns, i_period, self.n_periods - i_period, rows=rows, as_frame=as_frame)
+                i_period = self.n_periods
+                last_update = time.monotonic()
+
+            if self._finished:
+                break
+
+            if (timeout is not None) and (time.monotonic() - last_update > timeout):
+                break
+
+            time.sleep(interval)
+            self.refresh()
+
+    def summarize(self, kind=None, label=None, variable=None, stats=None, thresholds=None, start=None, end=None,
+                  rows=None, processes=1):
+        """
+        Get statistics of specific columns in one pass over the data.
+
+        The data is read in chunks, so the memory usage is constant and independent of the number of periods.
+
+        Args:
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            stats (list[str]): statistics to calculate.
+                Possible values: ``'max'``, ``'min'``, ``'mean'``, ``'sum'``, ``'time_of_max'``, ``'time_of_min'``, ``'count'``.
+                Default: ``['max', 'min', 'mean', 'sum', 'time_of_max']``
+            thresholds (float | dict): threshold to count the periods where the values are above.
+                One value for all columns or a dictionary with the variable name (i.e. ``{'flooding': 0, 'capacity': 0.9}``),
+                the column tuple or the column name (``'kind/label/variable'``) as keys.
+                Adds the columns ``'threshold'``, ``'count_above'`` and ``'duration_above'`` to the result.
+            start (datetime): start datetime for the period to read.
+            end (datetime): end datetime for the period to read.
+            rows (int): maximum number of periods read at once. Default: as many as fit in about 64 MB.
+            processes (int): number of parallel processes, each reading a part of the periods.
+                Only available if the out-file is read from a path.
+
+        Returns:
+            pandas.DataFrame: table with the column identifier (kind, label, variable) as index and the statistics as columns.
+                For an empty window the extremes and the mean are NaN and the times are NaT.
+        """
+        from ._statistics import _StreamingStatistics, _get_thresholds, _summarize_worker, _DEFAULT_STATISTICS
+
+        if stats is None:
+            stats = _DEFAULT_STATISTICS
+
+        columns = self._filter_part_columns(kind, label, variable)
+        i_period, n_periods = self._get_period_range(start, end)
+        threshold_values = _get_thresholds(columns, thresholds)
+
+        if (processes > 1) and isinstance(self.filename, Path):
+            from multiprocessing import Pool
+            bounds = np.linspace(i_period, i_period + n_periods, processes + 1).astype(int)
+            with Pool(processes) as pool:
+                results = pool.starmap(_summarize_worker, [
+                    (self.filename, columns, i, j - i, rows, threshold_values) for i, j in zip(bounds[:-1], bounds[1:])
+                ])
+            statistics = results[0]
+            for other in results[1:]:
+                statistics.merge(other)
+
+        else:
+            statistics = _StreamingStatistics(len(columns), threshold_values)
+            for i, values in self._iter_values(columns, i_period, n_periods, rows=rows):
+                statistics.update(i, values)
+
+        # an empty window has no extremes -> NaN and NaT instead of the initial values of the accumulator
+        empty = statistics.n == 0
+
+        def _or_nan(values):
+            return np.full(len(columns), np.nan) if empty else values
+
+        def _to_datetime(i):
+            if empty:
+                return pd.DatetimeIndex([pd.NaT] * len(columns))
+            return pd.Timestamp(self.start_date) + pd.to_timedelta(i * self.report_interval.total_seconds(), unit='s')
+
+        result = {
+            'max': lambda: _or_nan(statistics.max),
+            'min': lambda: _or_nan(statistics.min),
+            'mean': lambda: _or_nan(statistics.sum / max(statistics.n, 1)),
+            'sum': lambda: statistics.sum,
+            'time_of_max': lambda: _to_datetime(statistics.i_max),
+            'time_of_min': lambda: _to_datetime(statistics.i_min),
+            'count': lambda: np.full(len(columns), statistics.n),
+        }
+
+        df = pd.DataFrame({stat: result[stat]() for stat in stats},
+                          index=pd.MultiIndex.from_tuples(columns, names=['kind', 'label', 'variable']))
+
+        if thresholds is not None:
+            df['threshold'] = threshold_values
+            df['count_above'] = statistics.count_above
+            df['duration_above'] = statistics.count_above * pd.Timedelta(self.report_interval)
+
+        return df
+
+    def detect_events(self, kind=None, label=None, variable=None, threshold=0., min_gap=None, min_duration=None,
+                      start=None, end=None, rows=None):
+        """
+        Detect events where the values are above a threshold (i.e. flooding of nodes or overflows of weirs and outfalls).
+
+        An event is a run of consecutive periods above the threshold.
+        Events of the same column which are separated by less than ``min_gap`` (inter-event time) are joined.
+
+        The data is read in chunks and the events are detected vectorized for all columns at once;
+        events continuing over the border of two chunks are joined.
+
+        Args:
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            threshold (float | dict): the values must be above this threshold.
+                One value for all columns or a dictionary with the variable name (i.e. ``{'flooding': 0, 'flow': 0.5}``),
+                the column tuple or the column name (``'kind/label/variable'``) as keys. Columns without a threshold are skipped.
+            min_gap (datetime.timedelta | str): minimum inter-event time. Default: events are only separated by at least one period.
+            min_duration (datetime.timedelta | str): minimum duration of an event. Shorter events are dropped.
+            start (datetime): start datetime for the period to read.
+            end (datetime): end datetime for the period to read.
+            rows (int): maximum number of periods read at once. Default: as many as fit in about 64 MB.
+
+        Returns:
+            pandas.DataFrame: table of the events with the columns
+                ``'kind'``, ``'label'``, ``'variable'``,
+                ``'start'`` (first period above), ``'end'`` (last period above),
+                ``'duration'`` (``end - start + report_interval``),
+                ``'peak'``, ``'time_of_peak'``,
+                ``'volume'`` (sum of the values above the threshold times the report interval in seconds, i.e. the volume for flows)
+                and ``'n_periods'`` (number of periods above the threshold).
+        """
+        from ._events import _find_runs, _merge_runs, _empty_runs, _RUN_FIELDS
+        from ._statistics import _get_thresholds
+
+        columns = self._filter_part_columns(kind, label, variable)
+        i_period, n_periods = self._get_period_range(start, end)
+        thresholds = _get_thresholds(columns, threshold)
+
+        min_gap = 0 if min_gap is None else pd.Timedelta(min_gap) / self.report_interval
+
+        runs = []
+        for i, values in self._iter_values(columns, i_period, n_periods, rows=rows):
+            runs.append(_find_runs(i, values, thresholds))
+        if runs:
+            runs = {field: np.concatenate([r[field] for r in runs]) for field in _RUN_FIELDS}
+        else:
+            runs = _empty_runs()
+        events = _merge_runs(runs, min_gap)
+
+        def _to_datetime(i):
+            return pd.Timestamp(self.start_date) + pd.to_timedelta(i * self.report_interval.total_seconds(), unit='s')
+
+        duration = pd.to_timedelta((events['stop'] - events['start']) * self.report_interval.total_seconds(), unit='s')
+        df = pd.DataFrame({
+            'kind': [columns[j][0] for j in events['column']],
+            'label': [columns[j][1] for j in events['column']],
+            'variable': [columns[j][2] for j in events['column']],
+            'start': _to_datetime(events['start']),
+            'end': _to_datetime(events['stop'] - 1),
+            'duration': duration,
+            'peak': events['peak'],
+            'time_of_peak': _to_datetime(events['i_peak']),
+            'volume': events['sum'] * self.report_interval.total_seconds(),
+            'n_periods': events['count'],
+        })
+
+        if min_duration is not None:
+            df = df[df['duration'] >= pd.Timedelta(min_duration)].reset_index(drop=True)
+
+        return df
+
+    def _iter_values(self, columns, i_period, n_periods, rows=None):
+        """
+        Iterate over the values of the columns in chunks of periods.
+
+        Args:
+            columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+            i_period (int): number of the first period to read.
+            n_periods (int): number of periods to read.
+            rows (int): maximum number of periods per chunk. Default: as many as fit in about 64 MB.
+
+        Yields:
+            tuple[int, numpy.ndarray]: number of the first period in the chunk and the 2D-array (periods x columns) of float32 values.
+        """
+        from ._basic_selective_results_numpy import _iter_selective_results
+
+        _, offset_list = self._get_labels_and_offsets(columns)
+        pos_start_output = self._pos_start_output + i_period * self._bytes_per_period
+
+        for values in _iter_selective_results(self.fp, offset_list, pos_start_output, n_periods,
+                                              self._bytes_per_period, rows=rows):
+            yield i_period, values
+            i_period += values.shape[0]
+
     def _filter_part_columns(self, kind=None, label=None, variable=None):
         """
         filter which columns should be extracted
@@ -297,11 +916,14 @@ class SwmmOutput(SwmmOutExtract):
             list: filtered list of tuple(kind, label, variable)
         """
 
-        def _filter(i, possibilities, error_label):
+        def _filter(i, possibilities, error_label, index=None):
+            # index: dict of the possibilities for a fast lookup
+            if index is None:
+                index = possibilities
             if i is None:
                 return possibilities
             elif isinstance(i, str):
-                if i in possibilities:
+                if i in index:
                     return [i]
                 elif kind is None:
                     return []
@@ -312,7 +934,7 @@ class SwmmOutput(SwmmOutExtract):
                 # return [j for j in i if j in possibilities]
                 l = []
                 for j in i:
-                    if j in possibilities:
+                    if j in index:
                         l.append(j)
                     elif kind is None:
                         continue
@@ -323,8 +945,8 @@ class SwmmOutput(SwmmOutExtract):
         columns = []
         for k in _filter(kind, OBJECTS.LIST_, 'object kind'):
             columns += list(product([k],
-                                    _filter(label, self.labels[k], f'{k} label'),
-                                    _filter(variable, self.variables[k], f'{k} variable')))
+                                    _filter(label, self.labels[k], f'{k} label', self._label_index[k]),
+                                    _filter(variable, self.variables[k], f'{k} variable', self._variable_index[k])))
         return columns
 
     def _to_pandas(self, data, index: pd.DatetimeIndex = None, drop_useless=False):
@@ -396,94 +1018,263 @@ class SwmmOutput(SwmmOutExtract):
         import pyarrow as pa
         import pyarrow.parquet as pq
 
-        types = np.dtype([('datetime', 'f8')] + [('/'.join(i), 'f4') for i in self._columns_raw])
-        self.fp.seek(self._pos_start_output, 0)
-
         parq_writer = None
         columns = self._filter_part_columns(kind, label, variable)
         use_columns = ['datetime'] + ['/'.join(c) for c in columns]
 
+        # ---
+        if slim:
+            chunks = (pd.DataFrame(values, index=index, columns=use_columns[1:])
+                      for index, values in self.iter_chunks(kind, label, variable, rows=rows_at_a_time, as_frame=False))
+
+        else:
+            def _iter_chunks_full():
+                types = self._get_structured_dtype()
+                self.fp.seek(self._pos_start_output, 0)
+                for _ in range(0, self.n_periods, rows_at_a_time):
+                    df = pd.DataFrame(np.fromfile(self.fp, dtype=types, count=rows_at_a_time)[use_columns])
+                    df.index = (pd.Timedelta(days=1) * df.pop('datetime') + self._base_date).dt.round('s')
+                    yield df
+
+            chunks = _iter_chunks_full()
+
         # ---
         if show_progress:
             import tqdm
-            iterator = tqdm.trange(0, self.n_periods, rows_at_a_time)
-        else:
-            iterator = range(0, self.n_periods, rows_at_a_time)
+            chunks = tqdm.tqdm(chunks, total=-(-self.n_periods // rows_at_a_time))
+
+        # ---
+        for df in chunks:
+            table = pa.Table.from_pandas(df)
+
+            # for the first chunk of records
+            if parq_writer is None:
+                # create a parquet write object giving it an output file
+                parq_writer = pq.ParquetWriter(fn, table.schema, compression='brotli')
+            parq_writer.write_table(table)
+
+        # close the parquet writer
+        if parq_writer:
+            parq_writer.close()
+
+    def to_parquet_dataset(self, path, kind=None, label=None, variable=None, partition_by_year=False, rows=None,
+                           row_group_size=2 ** 20, compression='zstd', compression_level=None, threads=None,
+                           show_progress=True):
+        """
+        Write the data as partitioned (hive-style) parquet dataset.
+
+        Layout: ``<path>/kind=<kind>/variable=<variable>/[year=<year>/]part-<chunk>.parquet``
+
+        Each file holds a table in long format with the columns ``datetime``, ``label`` and ``value`` (float32),
+        sorted by label and datetime. All files share the same schema,
+        so the dataset can be queried without loading it completely,
+        i.e. with ``pyarrow.dataset.dataset(path, partitioning='hive')`` or with DuckDB, Spark or polars.
+        The flow unit, SWMM version, run status and report interval are stored in the schema metadata.
+
+        The out-file is read in chunks of periods (one file per chunk and partition)
+        and the parquet files are encoded and compressed in parallel in a pool of threads.
+
+        Requires the package ``pyarrow``.
+
+        Args:
+            path (str | Path): directory of the dataset.
+            kind (str | list): [``'subcatchment'``, ``'node'`, ``'link'``, ``'system'``] (see :meth:`SwmmOutput.get_part`)
+            label (str | list): name of the objekts
+            variable (str | list): variable names (see :meth:`SwmmOutput.get_part`)
+            partition_by_year (bool): add a partition level for the year.
+            rows (int): number of periods per chunk (=file). Default: as many as fit in about 64 MB.
+            row_group_size (int): maximum number of rows per row group in the parquet files.
+            compression (str): compression codec, i.e. ``'zstd'``, ``'lz4'``, ``'snappy'`` or ``'brotli'``.
+            compression_level (int): compression level of the codec. Default: default of the codec.
+            threads (int): number of threads to encode the files. Default: number of CPUs.
+            show_progress (bool): show a progress bar.
+
+        Returns:
+            Path: path to the dataset.
+        """
+        from ._dataset import write_dataset
+        columns = self._filter_part_columns(kind, label, variable)
+        return write_dataset(self, path, columns, rows=rows, partition_by_year=partition_by_year,
+                             row_group_size=row_group_size, compression=compression,
+                             compression_level=compression_level, threads=threads, show_progress=show_progress)
+
+    def to_netcdf(self, fn, kind=None, rows=None, complevel=4, show_progress=True):
+        """
+        Write the data in a chunked and compressed netCDF4-file.
+
+        The data is read and written in chunks of periods, so the memory usage is independent of the number of periods.
+
+        Each object kind is a dimension (with the labels as coordinate variable) and
+        each variable is stored as ``<kind>_<variable>`` with the dimensions (time, kind).
+        The system variables are stored as ``system_<variable>`` with the dimension (time).
+        The model properties are stored as ``<kind>_<property>`` with the dimension (kind)
+        and the flow unit, SWMM version and pollutant units as global attributes.
+
+        Open the file lazily with i.e. ``xarray.open_dataset(fn, chunks={})``.
+
+        Requires the package ``netCDF4``.
+
+        Args:
+            fn (str | Path): path to the resulting file.
+            kind (str | list): object kinds to write. Default: all kinds.
+            rows (int): number of periods read and written at once. Default: as many as fit in about 64 MB.
+            complevel (int): zlib compression level (0-9). ``0`` for no compression.
+            show_progress (bool): show a progress bar.
+        """
+        import netCDF4
+        from ._basic_selective_results_numpy import _iter_selective_results, _get_rows_per_chunk
+
+        kinds = [k for k in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK, OBJECTS.SYSTEM]
+                 if ((kind is None) or (k == kind) or (isinstance(kind, list) and (k in kind))) and self.labels[k]]
+
+        if rows is None:
+            rows = _get_rows_per_chunk(self._bytes_per_period)
+
+        ds = netCDF4.Dataset(fn, mode='w', format='NETCDF4')
+        ds.flow_unit = self.flow_unit
+        ds.swmm_version = self.swmm_version
+        ds.run_failed = int(self.run_failed)
+        for pollutant, unit in self.pollutant_units.items():
+            ds.setncattr(f'pollutant_unit_{pollutant}', unit)
 
         # ---
-        for i in iterator:
-            # print(self.fp.tell())
-            if slim:
-                progress_desc = f'{repr(self)}.get_selective_results(n_cols={len(columns)})'
+        ds.createDimension('time', None)
+        nc_time = ds.createVariable('time', 'f8', ('time',))
+        nc_time.units = f'seconds since {self.start_date:%Y-%m-%d %H:%M:%S}'
+        nc_time.calendar = 'standard'
 
-                label_list, offset_list = self._get_labels_and_offsets(columns)
+        # ---
+        nc_variables = {}
+        for k in kinds:
+            if k == OBJECTS.SYSTEM:
+                dimensions = ('time',)
+                chunksizes = (min(rows, max(self.n_periods, 1)),)
+            else:
+                n_objects = len(self.labels[k])
+                ds.createDimension(k, n_objects)
+                nc_labels = ds.createVariable(k, str, (k,))
+                nc_labels[:] = np.array(self.labels[k], dtype=object)
+
+                for property_label in self.model_properties_array[k].dtype.names:
+                    nc_property = ds.createVariable(f'{k}_{property_label}', self.model_properties_array[k].dtype[property_label], (k,))
+                    nc_property[:] = self.model_properties_array[k][property_label]
+                    if property_label == 'type':
+                        from .extract import _NODES_TYPES, _LINK_TYPES
+                        types = {OBJECTS.NODE: _NODES_TYPES, OBJECTS.LINK: _LINK_TYPES}[k]
+                        nc_property.flag_values = np.arange(len(types), dtype='i4')
+                        nc_property.flag_meanings = ' '.join(types)
+
+                dimensions = ('time', k)
+                # chunks of about 1 MB
+                chunksizes = (max(min(rows, 2 ** 18 // n_objects, max(self.n_periods, 1)), 1), n_objects)
+
+            for variable in self.variables[k]:
+                nc_variables[(k, variable)] = ds.createVariable(f'{k}_{variable}', 'f4', dimensions,
+                                                                zlib=complevel > 0, complevel=complevel,
+                                                                chunksizes=chunksizes)
 
-                from ._basic_selective_results import _get_selective_results
+        # ---
+        # read all records except the datetime
+        offset_list = np.arange(2, self._bytes_per_period // _RECORDSIZE) * _RECORDSIZE
+        chunks = _iter_selective_results(self.fp, offset_list, self._pos_start_output, self.n_periods,
+                                         self._bytes_per_period, rows=rows)
+        if show_progress:
+            import tqdm
+            chunks = tqdm.tqdm(chunks, total=-(-self.n_periods // rows), desc=f'{repr(self)}.to_netcdf')
+
+        i_period = 0
+        for values in chunks:
+            n = values.shape[0]
+            nc_time[i_period:i_period + n] = np.arange(i_period, i_period + n) * self.report_interval.total_seconds()
+
+            for k in kinds:
+                n_variables = len(self.variables[k])
+                start = self._kind_record_start[k] - 2
+                stop = start + len(self.labels[k]) * n_variables
+                block = values[:, start:stop].reshape(n, len(self.labels[k]), n_variables)
+                for j, variable in enumerate(self.variables[k]):
+                    if k == OBJECTS.SYSTEM:
+                        nc_variables[(k, variable)][i_period:i_period + n] = block[:, 0, j]
+                    else:
+                        nc_variables[(k, variable)][i_period:i_period + n, :] = block[:, :, j]
 
-                _pos_start_output = self._pos_start_output + i * self._bytes_per_period
+            i_period += n
 
-                data = _get_selective_results(self.fp, label_list, offset_list, _pos_start_output,
-                                              rows_at_a_time, self._bytes_per_period, progress_desc)
+        ds.close()
 
-                df = pd.DataFrame(data)
+    def write_subset(self, fn, kind=None, label=None, start=None, end=None, every=None, rows=None, show_progress=True):
+        """
+        Write a subset of the objects and periods to a new, valid SWMM output file.
 
-                df.index = pd.date_range(self.start_date + i*self.report_interval, periods=rows_at_a_time, freq=self.report_interval)
+        The new file has the same layout as a file written by SWMM
+        (header, labels, properties, variable codes, results and closing records),
+        so it can be read with :class:`SwmmOutput` or opened in the EPA SWMM GUI.
 
+        All variables of the selected objects are written,
+        because the number of variables per object kind is fixed in the out-file format.
+        The system variables and the pollutants are always part of the file.
+
+        The data is read and written in chunks of periods with bounded memory usage.
+
+        Args:
+            fn (str | Path): path to the new out-file.
+            kind (str | list): object kinds to keep [``'subcatchment'``, ``'node'`, ``'link'``]. Default: all.
+            label (str | list): name of the objekts to keep. Default: all objects of the selected kinds.
+            start (datetime): start datetime of the periods to keep.
+            end (datetime): end datetime of the periods to keep.
+            every (int): only keep every n-th period (the report interval of the new file is ``every`` times larger).
+            rows (int): number of periods read at once. Default: as many as fit in about 64 MB.
+            show_progress (bool): show a progress bar.
+
+        Returns:
+            Path: path to the new out-file.
+        """
+        from ._writer import _SwmmOutWriter
+        from ._resample import _iter_every
+        from ._basic_selective_results_numpy import _iter_selective_results, _get_rows_per_chunk
+
+        kinds = [kind] if isinstance(kind, str) else kind
+        labels = [label] if isinstance(label, str) else label
+
+        objects = {}
+        for k in [OBJECTS.SUBCATCHMENT, OBJECTS.NODE, OBJECTS.LINK]:
+            if (kinds is not None) and (k not in kinds):
+                objects[k] = []
+            elif labels is None:
+                objects[k] = range(len(self.labels[k]))
             else:
-                data = np.fromfile(self.fp, dtype=types, count=rows_at_a_time)[use_columns]
+                objects[k] = sorted(self._label_index[k][l] for l in labels if l in self._label_index[k])
 
-                df = pd.DataFrame(data)
+        every = 1 if every is None else int(every)
+        i_period, n_periods = self._get_period_range(start, end)
 
-                df.index = (pd.Timedelta(days=1) * df.pop('datetime') + self._base_date).dt.round('s')
+        if rows is None:
+            rows = _get_rows_per_chunk(self._bytes_per_period)
 
-            table = pa.Table.from_pandas(df)
+        with _SwmmOutWriter(fn, self, objects=objects,
+                            start_date=self.start_date + i_period * self.report_interval,
+                            report_interval=self.report_interval * every) as writer:
 
-            # for the first chunk of records
-            if parq_writer is None:
-                # create a parquet write object giving it an output file
-                parq_writer = pq.ParquetWriter(fn, table.schema, compression='brotli')
-            parq_writer.write_table(table)
+            # the datetime of the period (float64) is read as two float32 records and copied unchanged
+            offset_list = np.r_[0, _RECORDSIZE, writer.get_offsets()]
 
-        # close the parquet writer
-        if parq_writer:
-            parq_writer.close()
+            def _iter_periods():
+                i = i_period
+                for values in _iter_selective_results(self.fp, offset_list,
+                                                      self._pos_start_output + i_period * self._bytes_per_period,
+                                                      n_periods, self._bytes_per_period, rows=rows):
+                    yield i, values
+                    i += values.shape[0]
+
+            chunks = _iter_every(_iter_periods(), every, i_period)
+            if show_progress:
+                import tqdm
+                chunks = tqdm.tqdm(chunks, total=-(-n_periods // (rows * every)), desc=f'{repr(self)}.write_subset')
 
-    # def to_netcdf(self, fn_nc):
-    #     import xarray as xr
-    #     df = self.to_frame()
-    #     ds = df.to_xarray()
-    #     ds.to_netcdf("example.nc")
-    #
-    #     reopened = xr.open_dataset('Example6-Final.nc')
-    #
-    #     print()
-    #
-    #     # ---------------------
-    #     import netCDF4 as nc
-    #     import numpy as np
-    #
-    #     netcdf_output = nc.Dataset(fn_nc, mode='w', format="NETCDF4")
-    #
-    #     # -----
-    #     # Timestamps
-    #     netcdf_output.createDimension(dimname='datetime', size=None)
-    #     nc_time_variable = netcdf_output.createVariable(
-    #         varname="datetime",
-    #         datatype=datetime.datetime,
-    #         dimensions=("datetime",),
-    #     )
-    #
-    #     nc_time_variable[:] = self.index
-    #
-    #     nc_time_variable.units = "hours since 0001-01-01 00:00:00.0"
-    #     nc_time_variable.calendar = "gregorian"
-    #
-    #     nc_time_variable[:] = cftime.date2num(
-    #         [datetime.datetime.fromtimestamp(t) for t in swmm_output_timestamps],
-    #         units=nc_time_variable.units,
-    #         calendar=nc_time_variable.calendar
-    #     )
+            for _, values in chunks:
+                writer.write_periods(values[:, 2:], datetimes=np.ascontiguousarray(values[:, :2]).view('<f8')[:, 0])
 
+        return Path(fn)
 
 read_out_file = SwmmOutput
 
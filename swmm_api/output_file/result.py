@@ -0,0 +1,155 @@
+import pandas as pd
+
+from .helpers import drop_useless_column_levels
+
+
+class SwmmOutputResult:
+    """
+    Lightweight, array-backed container for a part of the results of an out-file.
+
+    Returned by :meth:`SwmmOutput.get_part` with ``as_frame=False``.
+    Holds the values as 2D-float32-array without building a :class:`pandas.DataFrame`,
+    which is expensive for many columns.
+    The pandas objects are only created on demand with :meth:`to_pandas`.
+
+    Attributes:
+        values (numpy.ndarray): 2D-float32-array (periods x columns).
+        columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+        periods (numpy.ndarray | None): number of the period of each row in the out-file
+            (``None`` if the rows are aggregated periods i.e. with ``resample``).
+    """
+
+    def __init__(self, values, columns, periods=None, start_date=None, report_interval=None, index=None):
+        """
+        Container for a part of the results of an out-file.
+
+        Args:
+            values (numpy.ndarray): 2D-float32-array (periods x columns).
+            columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+            periods (numpy.ndarray): number of the period of each row in the out-file.
+            start_date (datetime.datetime): datetime of the first period in the out-file (to convert the periods to datetimes).
+            report_interval (datetime.timedelta): interval between the periods in the out-file.
+            index (pandas.Index): datetime index of the rows. Default: calculated from the periods when needed.
+        """
+        self.values = values
+        self.columns = list(columns)
+        self.periods = periods
+        self._start_date = start_date
+        self._report_interval = report_interval
+        self._index = index
+        self._column_index = None
+        self._frames = {}
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(periods={self.values.shape[0]}, columns={len(self.columns)})'
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    @property
+    def shape(self):
+        """tuple[int, int]: number of rows (periods) and columns."""
+        return self.values.shape
+
+    @property
+    def index(self):
+        """pandas.DatetimeIndex: datetime of each row (calculated on first access)."""
+        if self._index is None:
+            self._index = pd.DatetimeIndex(pd.Timestamp(self._start_date)
+                                           + pd.to_timedelta(self.periods * self._report_interval.total_seconds(), unit='s'))
+        return self._index
+
+    @property
+    def column_names(self):
+        """list[str]: column names with ``'/'`` as separator (like in :meth:`SwmmOutput.to_numpy`)."""
+        return ['/'.join(c) for c in self.columns]
+
+    def get_column_index(self, key):
+        """
+        Get the position of a column.
+
+        Args:
+            key (tuple | str): column identifier tuple (kind, label, variable) or column name (``'kind/label/variable'``).
+
+        Returns:
+            int: position of the column in :attr:`values`.
+        """
+        if self._column_index is None:
+            self._column_index = {c: i for i, c in enumerate(self.columns)}
+        if isinstance(key, str):
+            key = tuple(key.split('/'))
+        return self._column_index[key]
+
+    def __getitem__(self, key):
+        """
+        Get the values of one column (without copy).
+
+        Args:
+            key (tuple | str): column identifier tuple (kind, label, variable) or column name (``'kind/label/variable'``).
+
+        Returns:
+            numpy.ndarray: 1D-float32-array.
+        """
+        return self.values[:, self.get_column_index(key)]
+
+    def __contains__(self, key):
+        try:
+            self.get_column_index(key)
+            return True
+        except KeyError:
+            return False
+
+    def select(self, kind=None, label=None, variable=None):
+        """
+        Get a subset of the columns.
+
+        Args:
+            kind (str | list): object kind(s) to keep.
+            label (str | list): object label(s) to keep.
+            variable (str | list): variable(s) to keep.
+
+        Returns:
+            SwmmOutputResult: container with the selected columns.
+        """
+        def _as_set(i):
+            return None if i is None else ({i} if isinstance(i, str) else set(i))
+
+        filters = [_as_set(kind), _as_set(label), _as_set(variable)]
+        positions = [j for j, column in enumerate(self.columns)
+                     if all((f is None) or (c in f) for f, c in zip(filters, column))]
+        return SwmmOutputResult(self.values[:, positions], [self.columns[j] for j in positions], periods=self.periods,
+                                start_date=self._start_date, report_interval=self._report_interval, index=self._index)
+
+    def to_numpy(self):
+        """
+        Get the values.
+
+        Returns:
+            numpy.ndarray: 2D-float32-array (periods x columns) without copy.
+        """
+        return self.values
+
+    def to_pandas(self, drop_useless=True):
+        """
+        Convert the results to pandas (like :meth:`SwmmOutput.get_part`).
+
+        The pandas object is created on the first call and cached.
+
+        Args:
+            drop_useless (bool): remove column levels with only one value.
+
+        Returns:
+            pandas.DataFrame | pandas.Series: data (Series if only one column is selected otherwise a DataFrame)
+        """
+        if drop_useless not in self._frames:
+            if not self.columns:
+                frame = pd.DataFrame()
+            elif len(self.columns) == 1:
+                frame = pd.Series(self.values[:, 0], index=self.index, name=self.column_names[0], dtype=float)
+            else:
+                frame = pd.DataFrame(self.values, index=self.index, dtype=float,
+                                     columns=pd.MultiIndex.from_tuples(self.columns))
+                if drop_useless:
+                    drop_useless_column_levels(frame)
+            self._frames[drop_useless] = frame
+        return self._frames[drop_useless]
@@ -0,0 +1,226 @@
+"""
+Publish results of an out-file in shared memory for other processes (:mod:`multiprocessing.shared_memory`).
+
+Layout of the shared memory segment:
+    header: stamp (8 bytes), length of the metadata (uint64), metadata as JSON, padding to 64 bytes
+    data: float32 array with the shape (periods, columns)
+"""
+
+import datetime
+import json
+import struct
+
+import numpy as np
+
+from .result import SwmmOutputResult
+
+_STAMP = b'SWMMSHM1'
+_HEADER_FORMAT = '<8sQ'
+_ALIGNMENT = 64
+
+
+def _get_shared_memory_class():
+    # requires Python >= 3.8
+    from multiprocessing.shared_memory import SharedMemory
+    return SharedMemory
+
+
+class _NoResourceTracker:
+    @staticmethod
+    def register(name, rtype):
+        pass
+
+    @staticmethod
+    def unregister(name, rtype):
+        pass
+
+
+def _attach_untracked(name):
+    """
+    Attach to an existing shared memory segment without registering it in the resource tracker.
+
+    Otherwise, the resource tracker of an attaching process removes the segment of the owner when the process ends.
+    """
+    from multiprocessing import shared_memory
+    try:
+        # Python >= 3.13
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    resource_tracker = shared_memory.resource_tracker
+    shared_memory.resource_tracker = _NoResourceTracker
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        shared_memory.resource_tracker = resource_tracker
+
+
+class SwmmOutputSharedResult:
+    """
+    Results of an out-file in a shared memory segment.
+
+    One process publishes the results with :meth:`SwmmOutput.to_shared_memory` (the owner)
+    and other processes attach to the segment by its name with :meth:`SwmmOutputSharedResult.attach`.
+    All processes get a zero-copy numpy view of the same memory.
+
+    Lifecycle:
+        - every process calls :meth:`close` when it doesn't need the data anymore (or uses the object as context manager).
+        - the owner calls :meth:`unlink` to free the segment (done automatically when the owner is used as context manager).
+        - the views (:attr:`values`) must not be used after :meth:`close`.
+
+    Attributes:
+        name (str): name of the shared memory segment (used to attach).
+        columns (list[tuple]): list of column identifier tuple with [(kind, label, variable), ...]
+        values (numpy.ndarray): 2D-float32-array (periods x columns) in the shared memory (read-only for attached processes).
+        periods (numpy.ndarray): number of the period of each row in the out-file.
+        metadata (dict): start date, report interval, flow unit, SWMM version and filename of the out-file.
+        is_owner (bool): if this process created the segment.
+    """
+
+    def __init__(self, shm, metadata, offset, is_owner):
+        self._shm = shm
+        self.metadata = metadata
+        self.is_owner = is_owner
+        self.columns = [tuple(c) for c in metadata['columns']]
+        self.periods = np.arange(metadata['i_period'], metadata['i_period'] + metadata['n_periods'])
+        self.values = np.ndarray((metadata['n_periods'], len(self.columns)), dtype='f4', buffer=shm.buf, offset=offset)
+        if not is_owner:
+            self.values.flags.writeable = False
+        self._result = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(name="{self.name}", periods={self.values.shape[0]}, columns={len(self.columns)})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        if self.is_owner:
+            self.unlink()
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def start_date(self):
+        """datetime.datetime: datetime of the first period of the out-file."""
+        return datetime.datetime.fromisoformat(self.metadata['start_date'])
+
+    @property
+    def report_interval(self):
+        """datetime.timedelta: interval between the periods."""
+        return datetime.timedelta(seconds=self.metadata['report_interval'])
+
+    @classmethod
+    def _publish(cls, out, columns, i_period, n_periods, name=None):
+        """
+        Read the columns of an out-file into a new shared memory segment.
+
+        See :meth:`SwmmOutput.to_shared_memory`.
+        """
+        metadata = {
+            'columns': [list(c) for c in columns],
+            'i_period': int(i_period),
+            'n_periods': int(n_periods),
+            'start_date': out.start_date.isoformat(),
+            'report_interval': out.report_interval.total_seconds(),
+            'flow_unit': out.flow_unit,
+            'swmm_version': out.swmm_version,
+            'filename': str(out.filename),
+        }
+        raw = json.dumps(metadata).encode()
+        offset = -(-(struct.calcsize(_HEADER_FORMAT) + len(raw)) // _ALIGNMENT) * _ALIGNMENT
+
+        shm = _get_shared_memory_class()(name=name, create=True, size=max(offset + n_periods * len(columns) * 4, 1))
+        try:
+            shm.buf[:struct.calcsize(_HEADER_FORMAT)] = struct.pack(_HEADER_FORMAT, _STAMP, len(raw))
+            shm.buf[struct.calcsize(_HEADER_FORMAT):struct.calcsize(_HEADER_FORMAT) + len(raw)] = raw
+            shared = cls(shm, metadata, offset, is_owner=True)
+
+            # read directly into the shared memory
+            n = 0
+            for _, values in out._iter_values(columns, i_period, n_periods):
+                shared.values[n:n + values.shape[0]] = values
+                n += values.shape[0]
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return shared
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attach to the results published by another process.
+
+        Args:
+            name (str): name of the shared memory segment (:attr:`name` of the owner).
+
+        Returns:
+            SwmmOutputSharedResult: results with a read-only zero-copy view of the shared memory.
+        """
+        shm = _attach_untracked(name)
+
+        stamp, length = struct.unpack_from(_HEADER_FORMAT, shm.buf)
+        if stamp != _STAMP:
+            shm.close()
+            raise ValueError(f'The shared memory segment "{name}" does not contain results of an out-file.')
+        start = struct.calcsize(_HEADER_FORMAT)
+        metadata = json.loads(bytes(shm.buf[start:start + length]))
+        offset = -(-(start + length) // _ALIGNMENT) * _ALIGNMENT
+        return cls(shm, metadata, offset, is_owner=False)
+
+    def __getitem__(self, key):
+        """
+        Get the values of one column (without copy).
+
+        Args:
+            key (tuple | str): column identifier tuple (kind, label, variable) or column name (``'kind/label/variable'``).
+
+        Returns:
+            numpy.ndarray: 1D-float32-array.
+        """
+        return self.to_result()[key]
+
+    def to_result(self):
+        """
+        Get the results as lightweight container (without copy).
+
+        Returns:
+            SwmmOutputResult: results (see :meth:`SwmmOutput.get_part` with ``as_frame=False``).
+        """
+        if self._result is None:
+            self._result = SwmmOutputResult(self.values, self.columns, periods=self.periods,
+                                            start_date=self.start_date, report_interval=self.report_interval)
+        return self._result
+
+    def to_pandas(self):
+        """
+        Get the results as pandas objects (copy of the data).
+
+        Returns:
+            pandas.DataFrame | pandas.Series: data (like :meth:`SwmmOutput.get_part`).
+        """
+        return self.to_result().to_pandas()
+
+    def close(self):
+        """
+        Release the view and detach from the shared memory segment.
+
+        All other views of the data (i.e. from :meth:`__getitem__`) must be deleted before.
+        """
+        if self._shm is None:
+            return
+        self.values = None
+        self._result = None
+        self._shm.close()
+        if not self.is_owner:
+            self._shm = None
+
+    def unlink(self):
+        """Free the shared memory segment (only the owner). The other processes can't attach anymore."""
+        if self.is_owner and (self._shm is not None):
+            self._shm.unlink()
+            self._shm = None
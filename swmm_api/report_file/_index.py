@@ -0,0 +1,180 @@
+"""
+Index of the parts of a report file.
+
+The file is opened as memory-map and only the byte offsets of the parts are searched when the file is opened.
+A part is decoded when it is accessed the first time.
+
+A part starts with a title box (a line of ``****`` after an empty line) and ends before the next title box.
+The first part contains the version, title, warnings and errors
+and the last three lines of the file contain the analysis times (``'Simulation Infos'``).
+"""
+
+import mmap
+import os
+import warnings
+from collections.abc import Mapping
+
+from .helpers import _get_title_of_part, _remove_lines
+from .._io_helpers._read_txt import decode_txt
+
+_TITLE_BOX = b'\n  ****'
+_HEAD_LINES = 5
+
+
+def _open_buffer(filename):
+    """
+    Get the content of the report file as memory-map.
+
+    Args:
+        filename (str or pathlib.Path or io.BufferedReader): Path to the rpt file or an opened (binary) file.
+
+    Returns:
+        mmap.mmap | bytes: content of the file (``bytes`` for file objects or empty files).
+    """
+    if not isinstance(filename, (str, bytes, os.PathLike)):
+        try:
+            return filename.read()
+        except AttributeError:
+            raise IOError('Provided file can\'t be read')
+
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # an empty file can't be mapped
+            return b''
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _ReportIndex(Mapping):
+    """
+    Raw parts of a report file, decoded from the memory-mapped file on the first access.
+
+    Behaves like a read-only dictionary with the title of the part as key and the text of the part as value
+    (the text without empty lines).
+    """
+
+    def __init__(self, filename, encoding):
+        """
+        Build the index of the parts of the report file.
+
+        Args:
+            filename (str or pathlib.Path or io.BufferedReader): Path to the rpt file.
+            encoding (str): Encoding of the text-file.
+        """
+        self._filename = filename
+        self._encoding = encoding
+        self._buffer = _open_buffer(filename)
+        # title of the part: list of (start, end) byte offsets (titles can occur multiple times)
+        self.spans = {}
+        self._parts = {}
+
+        if not self._buffer:
+            warnings.warn(f'SWMM-report-file ({filename}) is empty.')
+            return
+
+        self._build()
+
+    def _build(self):
+        buffer = self._buffer
+
+        # last three lines of the file
+        end = len(buffer)
+        for _ in range(3):
+            end = buffer.rfind(b'\n', 0, end)
+            if end == -1:
+                break
+        self.spans['Simulation Infos'] = [(end + 1, len(buffer))]
+
+        # start of each part
+        starts = [0]
+        ends = []
+        position = buffer.find(_TITLE_BOX, 0, max(end, 0))
+        while position != -1:
+            # the title box must be preceded by an empty line
+            line_start = buffer.rfind(b'\n', 0, position)
+            if (line_start != -1) and (buffer[line_start + 1:position].replace(b'\r', b'') in (b'', b'  ')):
+                starts.append(position + 1)
+                ends.append(line_start)
+            position = buffer.find(_TITLE_BOX, position + 1, end)
+        ends.append(max(end, 0))
+
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            key = _get_title_of_part(self.decode(self._get_head(start, end)), i)
+            self.spans.setdefault(key, []).append((start, end))
+
+    def _get_head(self, start, end):
+        """Get the first lines of a part, which contain the title."""
+        head_end = start
+        for _ in range(_HEAD_LINES):
+            head_end = self._buffer.find(b'\n', head_end + 1, end)
+            if head_end == -1:
+                return self._buffer[start:end]
+        return self._buffer[start:head_end]
+
+    def decode(self, binary):
+        """Decode a part of the file with the encoding of the file."""
+        return decode_txt(binary, self._encoding, self._filename)
+
+    def find(self, sub, start, end):
+        """Lowest byte offset of ``sub`` between ``start`` and ``end`` or ``-1`` if not found."""
+        return self._buffer.find(sub, start, end)
+
+    def get_bytes(self, start, end):
+        """Content of the file between two byte offsets."""
+        return self._buffer[start:end]
+
+    def get_text(self, start, end):
+        """
+        Get the decoded text between two byte offsets of the file.
+
+        Args:
+            start (int): first byte.
+            end (int): byte after the last byte.
+
+        Returns:
+            str: decoded text.
+        """
+        return self.decode(self.get_bytes(start, end))
+
+    def _read_part(self, key):
+        if key == 'Simulation Infos':
+            return self.get_text(*self.spans[key][0])
+
+        def _concat_lines(a, b):
+            index_continuity = 28
+            if a[:index_continuity] == b[:index_continuity]:
+                return a + b[index_continuity:]
+            else:
+                return a + b
+
+        part = None
+        for start, end in self.spans[key]:
+            new_lines = _remove_lines(self.get_text(start, end), title=False, empty=True, sep=False)
+            if part is None:
+                part = new_lines
+            elif new_lines.count('\n') == part.count('\n'):
+                # tables which are split into multiple parts with the same title (i.e. for many pollutants)
+                part = '\n'.join([_concat_lines(a, b) for a, b in zip(part.split('\n'), new_lines.split('\n'))])
+        return part
+
+    def __getitem__(self, key):
+        if key not in self._parts:
+            if key not in self.spans:
+                raise KeyError(key)
+            self._parts[key] = self._read_part(key)
+        return self._parts[key]
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def load(self):
+        """Decode all parts."""
+        for key in self.spans:
+            self[key]
+
+    def close(self):
+        """Close the memory-map. Parts which were not accessed before can't be read anymore."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
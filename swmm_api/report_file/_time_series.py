@@ -0,0 +1,210 @@
+"""
+Time series tables of the objects in a report file.
+
+If subcatchments, nodes or links are selected in the ``[REPORT]`` section of the input file,
+SWMM writes one table per object in the parts ``'Subcatchment Results'``, ``'Node Results'`` and ``'Link Results'``::
+
+    <<< Node J1 >>>
+    --------------------------------------------------------------------------
+                             Inflow  Flooding     Depth      Head       TSS
+    Date        Time            CFS       CFS      feet      feet      MG/L
+    --------------------------------------------------------------------------
+     01/01/2007 00:05:00      0.141     0.000     0.012  4973.012     0.000
+
+The values are right aligned in columns with a fixed width.
+"""
+
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from ..output_file.definitions import OBJECTS
+
+_TIME_SERIES_PARTS = {
+    OBJECTS.SUBCATCHMENT: 'Subcatchment Results',
+    OBJECTS.NODE: 'Node Results',
+    OBJECTS.LINK: 'Link Results',
+}
+
+_TABLE_START = b'\n  <<< '
+_TABLE_LABEL_END = ' >>>'
+_TOKEN = re.compile(rb'\S+')
+
+# range of a pandas.DatetimeIndex with nanoseconds
+_MIN_DATETIME = np.datetime64(pd.Timestamp.min.ceil('s'), 's')
+_MAX_DATETIME = np.datetime64(pd.Timestamp.max.floor('s'), 's')
+
+
+def _index_tables(index, kind):
+    """
+    Find the tables of the objects in the time series part of the report file.
+
+    Only the lines with the labels of the objects are read.
+
+    Args:
+        index (swmm_api.report_file._index._ReportIndex): index of the report file.
+        kind (str): one of ``'subcatchment'``, ``'node'`` or ``'link'``.
+
+    Returns:
+        dict[str, tuple[int, int]]: label of the object and byte offsets of the table (start, end).
+    """
+    tables = {}
+    for start, end in index.spans.get(_TIME_SERIES_PARTS[kind], []):
+        position = index.find(_TABLE_START, start, end)
+        while position != -1:
+            line_end = index.find(b'\n', position + 1, end)
+            if line_end == -1:
+                line_end = end
+            # i.e. "Node J1 >>>"
+            title = index.get_text(position + len(_TABLE_START), line_end).strip()
+            label = title[:title.rfind(_TABLE_LABEL_END)].split(' ', 1)[1]
+
+            position = index.find(_TABLE_START, line_end, end)
+            tables[label] = (line_end + 1, end if position == -1 else position)
+    return tables
+
+
+def _get_datetimes(dates, times):
+    """
+    Convert the dates and times of the table.
+
+    Args:
+        dates (numpy.ndarray): 2D-uint8-array (rows x characters) of the dates (``MM/DD/YYYY``).
+        times (numpy.ndarray): 2D-uint8-array (rows x characters) of the times (``HH:MM:SS``).
+
+    Returns:
+        pandas.Index: datetime index
+    """
+    dates = dates.astype(np.int64) - ord('0')
+    times = times.astype(np.int64) - ord('0')
+    months = (dates[:, 6] * 1000 + dates[:, 7] * 100 + dates[:, 8] * 10 + dates[:, 9] - 1970) * 12 + dates[:, 0] * 10 + dates[:, 1] - 1
+    seconds = (times[:, 0] * 10 + times[:, 1]) * 3600 + (times[:, 3] * 10 + times[:, 4]) * 60 + times[:, 6] * 10 + times[:, 7]
+    datetimes = (months.astype('datetime64[M]').astype('datetime64[D]') + (dates[:, 3] * 10 + dates[:, 4] - 1)
+                 ).astype('datetime64[s]') + seconds
+
+    if datetimes.size and ((datetimes.min() < _MIN_DATETIME) or (datetimes.max() > _MAX_DATETIME)):
+        warnings.warn('Can not create a pandas.DatetimeIndex in given date-range. Default to pandas.Index.')
+        return pd.Index(datetimes.astype(object), name='datetime')
+    return pd.DatetimeIndex(datetimes.astype('datetime64[ns]'), name='datetime')
+
+
+def _to_float(cells):
+    """Convert a byte-string-array to floats (values which are no numbers, i.e. ``-nan(ind)``, are NaN)."""
+    try:
+        return cells.astype('f8')
+    except ValueError:
+        values = pd.to_numeric(pd.Series(np.char.strip(cells).astype(str).ravel()), errors='coerce')
+        return values.values.astype('f8').reshape(cells.shape)
+
+
+def _get_column_names(header, ends, decode):
+    """
+    Get the names of the value columns from the header of the table.
+
+    The words of the header are assigned to the column of the values where its center lies
+    (the header is right aligned to the values, but longer words exceed the column).
+    The words of a column are joined with ``'_'`` over the header lines (i.e. ``'Depth_feet'``).
+
+    Args:
+        header (list[bytes]): lines of the header.
+        ends (list[int]): right end of each column (date, time, values).
+        decode (function): function to decode the header.
+
+    Returns:
+        list[str]: names of the value columns.
+    """
+    value_ends = np.array(ends[2:])
+    cells = [[] for _ in value_ends]
+    for line in header:
+        words = {}
+        for m in _TOKEN.finditer(line):
+            center = (m.start() + m.end()) / 2
+            if center < ends[1]:
+                # date and time
+                continue
+            words.setdefault(min(int(np.searchsorted(value_ends, center)), value_ends.size - 1), []).append(m.group())
+        for i, w in words.items():
+            cells[i].append(b' '.join(w))
+    return [decode(b'_'.join(c)).replace('/_', '/') or str(i) for i, c in enumerate(cells)]
+
+
+def _read_table(binary, decode):
+    """
+    Convert the table of an object to a frame.
+
+    The rows are converted as a fixed-width table if all rows have the same length
+    (otherwise as whitespace separated values).
+
+    Args:
+        binary (bytes): table of the object (from the line after the label).
+        decode (function): function to decode the header of the table.
+
+    Returns:
+        pandas.DataFrame: time series of the object (index is the datetime and columns are the variables with units).
+    """
+    binary = binary.replace(b'\r', b'')
+
+    # header between two separator lines
+    header = []
+    separators = 0
+    position = 0
+    while (separators < 2) and (position < len(binary)):
+        line_end = binary.find(b'\n', position)
+        if line_end == -1:
+            line_end = len(binary)
+        line = binary[position:line_end]
+        if line.strip() and not line.strip(b' -'):
+            separators += 1
+        elif separators == 1:
+            header.append(line)
+        position = line_end + 1
+
+    body = binary[position:].rstrip()
+    if not body:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='datetime'), dtype=float)
+
+    # right end of each column (date, time, values) in the first row
+    ends = [m.end() for m in _TOKEN.finditer(body.split(b'\n', 1)[0])]
+    columns = _get_column_names(header, ends, decode)
+
+    n_rows = body.count(b'\n') + 1
+    width = (len(body) + 1) // n_rows
+    characters = np.frombuffer(body + b'\n', dtype=np.uint8)
+    if (characters.size == n_rows * width) and (characters[width - 1::width] == ord('\n')).all():
+        # fixed width
+        characters = characters.reshape(n_rows, width)
+        dates = characters[:, ends[0] - 10:ends[0]]
+        times = characters[:, ends[1] - 8:ends[1]]
+        values = np.column_stack([
+            _to_float(np.ascontiguousarray(characters[:, start:end]).view(f'S{end - start}')[:, 0])
+            for start, end in zip(ends[1:-1], ends[2:])])
+    else:
+        tokens = np.array(body.split()).reshape(n_rows, len(ends))
+        dates = tokens[:, 0].astype('S10').view(np.uint8).reshape(n_rows, 10)
+        times = tokens[:, 1].astype('S8').view(np.uint8).reshape(n_rows, 8)
+        values = _to_float(tokens[:, 2:])
+
+    return pd.DataFrame(values, index=_get_datetimes(dates, times), columns=columns)
+
+
+def _iter_tables(index, tables, labels=None):
+    """
+    Iterate over the time series tables of the objects.
+
+    Args:
+        index (swmm_api.report_file._index._ReportIndex): index of the report file.
+        tables (dict[str, tuple[int, int]]): byte offsets of the tables (see :func:`_index_tables`).
+        labels (list[str]): labels of the objects to read (default: all in the order of the report file).
+
+    Yields:
+        tuple[str, pandas.DataFrame]: label of the object and its time series.
+    """
+    if labels is None:
+        labels = tables
+    else:
+        labels = set(labels)
+        labels = [label for label in tables if label in labels]
+    for label in labels:
+        yield label, _read_table(index.get_bytes(*tables[label]), index.decode)
@@ -6,10 +6,15 @@ __version__ = "0.1"
 __license__ = "MIT"
 
 from io import StringIO
+import numpy as np
 import pandas as pd
 import re
 from numpy import NaN
 
+# code points of the whitespace characters (as in ``str.split()``)
+_WHITESPACE = np.array([c for c in range(0x3001) if chr(c).isspace()], dtype='<u4')
+_FIXED_WIDTH_DELIMITERS = ' \t\r\n'
+
 
 def _get_title_of_part(part, alt):
     """
@@ -112,6 +117,61 @@ def _options_part_to_dict(raw):
     return res
 
 
+def _get_codes(text):
+    """Get the unicode code points of a text as array (one element per character)."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+
+def _tokenize(text):
+    """
+    Split each line of a text into the whitespace separated tokens (like ``[line.split() for line in text.split('\\n')]``).
+
+    The positions of the tokens are found in one pass over the code points of the whole text.
+
+    Args:
+        text (str): lines of a table.
+
+    Returns:
+        numpy.ndarray: 2D-object-array (lines x tokens) padded with ``None``.
+    """
+    codes = _get_codes(text)
+    is_token = ~np.isin(codes, _WHITESPACE)
+    starts = np.flatnonzero(is_token & np.r_[True, ~is_token[:-1]])
+
+    # line number and position in the line of each token
+    rows = np.cumsum(codes == 10)[starts]
+    columns = np.arange(starts.size) - np.searchsorted(rows, rows)
+
+    tokens = np.empty((text.count('\n') + 1, columns.max() + 1 if columns.size else 0), dtype=object)
+    tokens[rows, columns] = text.split()
+    return tokens
+
+
+def _read_fixed_width(text):
+    """
+    Split the lines of a fixed-width table header into cells.
+
+    The column boundaries are the positions where no line has a character (like :func:`pandas.read_fwf`).
+
+    Args:
+        text (str): lines of the table header.
+
+    Returns:
+        list[list[str]]: not-empty cells of each column.
+    """
+    lines = text.split('\n')
+    codes = np.full((len(lines), max(map(len, lines)) + 2), 32, dtype='<u4')
+    for i, line in enumerate(lines):
+        codes[i, 1:len(line) + 1] = _get_codes(line)
+    is_filled = (~np.isin(codes, [ord(c) for c in _FIXED_WIDTH_DELIMITERS])).any(axis=0)
+    edges = np.flatnonzero(is_filled[1:] != is_filled[:-1])
+
+    cells = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        cells.append([c for c in (line[start:end].strip(_FIXED_WIDTH_DELIMITERS) for line in lines) if c])
+    return cells
+
+
 def _part_to_frame(part, replace_parts=None):
     """
     convert the table of a part of the report file to a dataframe
@@ -147,7 +207,7 @@ def _part_to_frame(part, replace_parts=None):
         header, data = subs
     else:
         notes, header, data = subs
-    header = ['_'.join([i for i in c if i is not NaN]) for c in pd.read_fwf(StringIO(header), header=None).values.T]
+    header = ['_'.join(c) for c in _read_fixed_width(header)]
 
     # Pumping Summary
     if '% Time Off_Pump Curve_Low   High' in header:
@@ -155,7 +215,7 @@ def _part_to_frame(part, replace_parts=None):
         header.append('% Time Off_Pump Curve_Low')
         header.append('% Time Off_Pump Curve_High')
 
-    df = pd.DataFrame(line.split() for line in data.split('\n'))
+    df = pd.DataFrame(_tokenize(data))
 
     last_col_values = df.iloc[:, -1].unique()
     if 'ltr' in last_col_values or 'gal' in last_col_values:
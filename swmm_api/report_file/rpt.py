@@ -7,16 +7,16 @@ __license__ = "MIT"
 
 import datetime
 import os.path
-import warnings
 
 import pandas as pd
 
-from .helpers import (_get_title_of_part, _remove_lines, _part_to_frame,
+from ._index import _ReportIndex
+from ._time_series import _TIME_SERIES_PARTS, _index_tables, _iter_tables
+from .helpers import (_remove_lines, _part_to_frame,
                       _continuity_part_to_dict, ReportUnitConversion,
                       _routing_part_to_dict, _quality_continuity_part_to_dict,
                       _transect_street_shape_converter, _options_part_to_dict, )
 from .._io_helpers._encoding import get_default_encoding
-from .._io_helpers._read_txt import read_txt_file
 from ..input_file.helpers import natural_keys
 
 
@@ -37,17 +37,20 @@ class SwmmReport:
             For more information see SWMM 5.1 User Manual | 9.1 Viewing a Status Report | S. 136
             Landuse Labels are not allowed to be longer than 13 characters!
 
+            The file is opened as memory-map and only the positions of the parts are searched when the file is opened.
+            Each part is read when it is accessed the first time.
+            Use the object as context manager or call :meth:`close` at the end.
+
         .. Important::
             The summary results displayed in these tables are based on results found at every
             computational time step and not just on the results from each reporting time step.
         """
         self._filename = filename
         # ________________
-        self._raw_parts = {}
         self._converted_parts = {}
         # ________________
-        # split report file to a dict
-        self._report_to_dict(encoding=encoding)
+        # index of the parts of the report file
+        self._index_report(encoding=encoding)
 
         # ________________
         self._version_title = None
@@ -111,9 +114,18 @@ class SwmmReport:
 
         self._control_actions_taken = None
 
+        # byte offsets of the time series tables per kind of object
+        self._time_series_tables = {}
+
     def __repr__(self):
         return f'SwmmReport(file="{self._filename}")'
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def summary(self):
         """Prints overview of the content in the rpt-file."""
         print(repr(self), 'Headers:', *list(self._raw_parts.keys()), sep='\n  - ')
@@ -132,47 +144,29 @@ class SwmmReport:
         """Bool if file exists."""
         return os.path.isfile(self._filename)
 
-    def _report_to_dict(self, encoding=''):
+    def _index_report(self, encoding=''):
         """
-        Convert the report file into a dictionary depending on the different parts.
+        Open the report file and build the index of the parts of the report file.
+
+        Only the positions of the parts are searched, the parts are decoded when they are accessed the first time.
 
         Args:
             encoding (str): Encoding of the text-file (None -> auto-detect encoding ... takes a few seconds | '' -> use default = 'utf-8')
-
-        Returns:
-            dict[str, str]: dictionary of parts of the report file
         """
         self._encoding = get_default_encoding(encoding, self._filename)
+        self._raw_parts = _ReportIndex(self._filename, encoding=self._encoding)
 
-        txt = read_txt_file(self._filename, encoding=self._encoding)
-        lines = txt.split('\n')
-
-        if not txt:
-            warnings.warn(f'SWMM-report-file ({self._filename}) is empty.')
-            return
-
-        self._raw_parts['Simulation Infos'] = '\n'.join(lines[-3:])
-        lines = lines[:-3]
-        parts0 = '\n'.join(lines).replace('\n\n  ****', '\n  \n  ****').split('\n  \n  ****')
+    def load(self):
+        """Read all parts of the report file into memory (i.e. to use them after the file is closed or deleted)."""
+        self._raw_parts.load()
 
-        def _concat_lines(a, b):
-            index_continuity = 28
-            if a[:index_continuity] == b[:index_continuity]:
-                return a + b[index_continuity:]
-            else:
-                return a + b
-
-        for i, part in enumerate(parts0):
-            if part.startswith('*'):
-                part = '  ****' + part
+    def close(self):
+        """
+        Close the report file.
 
-            key = _get_title_of_part(part, i)
-            new_lines = _remove_lines(part, title=False, empty=True, sep=False)
-            if key in self._raw_parts:
-                if new_lines.count('\n') == self._raw_parts[key].count('\n'):
-                    self._raw_parts[key] = '\n'.join([_concat_lines(a, b) for a, b in zip(self._raw_parts[key].split('\n'), new_lines.split('\n'))])
-            else:
-                self._raw_parts[key] = new_lines
+        Parts of the report file which were not accessed (or loaded with :meth:`load`) before can't be read anymore.
+        """
+        self._raw_parts.close()
 
     def _get_converted_part(self, key):
         if key not in self._converted_parts:
@@ -814,6 +808,68 @@ class SwmmReport:
         return self._street_summary
         pass
 
+    def _get_time_series_tables(self, kind):
+        if kind not in _TIME_SERIES_PARTS:
+            raise ValueError(f'Time series tables are only available for {list(_TIME_SERIES_PARTS)}, not "{kind}".')
+        if kind not in self._time_series_tables:
+            self._time_series_tables[kind] = _index_tables(self._raw_parts, kind)
+        return self._time_series_tables[kind]
+
+    def get_time_series_labels(self, kind):
+        """
+        Labels of the objects with a time series table in the report file.
+
+        Args:
+            kind (str): one of ``'subcatchment'``, ``'node'`` or ``'link'``.
+
+        Returns:
+            list[str]: labels of the objects (in the order of the report file)
+        """
+        return list(self._get_time_series_tables(kind))
+
+    def iter_time_series(self, kind, labels=None):
+        """
+        Iterate over the time series tables of the objects in the report file.
+
+        SWMM writes a time series table per object,
+        if the objects are selected in the ``[REPORT]`` section (``SUBCATCHMENTS``, ``NODES`` or ``LINKS``).
+        Only the positions of the tables are searched at first and each table is read when it is yielded,
+        so the tables of large report files can be processed one at a time.
+
+        Args:
+            kind (str): one of ``'subcatchment'``, ``'node'`` or ``'link'``.
+            labels (str | list[str]): only read the tables of these objects. Default: all objects.
+
+        Yields:
+            tuple[str, pandas.DataFrame]: label of the object and its time series
+                (index is the datetime and columns are the variables with units).
+
+        Examples:
+            .. code-block:: python
+
+                with SwmmReport('model.rpt') as rpt:
+                    for label, df in rpt.iter_time_series('node', ['J1', 'J2']):
+                        print(label, df['Depth_feet'].max())
+        """
+        if isinstance(labels, str):
+            labels = [labels]
+        yield from _iter_tables(self._raw_parts, self._get_time_series_tables(kind), labels)
+
+    def get_time_series(self, kind, label):
+        """
+        Get the time series table of an object in the report file.
+
+        Args:
+            kind (str): one of ``'subcatchment'``, ``'node'`` or ``'link'``.
+            label (str): label of the object.
+
+        Returns:
+            pandas.DataFrame: time series of the object (index is the datetime and columns are the variables with units).
+        """
+        if label not in self._get_time_series_tables(kind):
+            raise KeyError(f'No time series table for the {kind} "{label}" in the report file.')
+        return next(self.iter_time_series(kind, label))[1]
+
     # @property
     # def most_frequent_nonconverging_nodes(self):
     #     'Most Frequent Nonconverging Nodes'
@@ -15,3 +15,4 @@ from .run_epaswmm import swmm5_run_epa
 from .run_swmm_toolkit import swmm5_run_owa
 from .run_pyswmm import swmm5_run_progress
 from .run import swmm5_run
+from .run_parallel import swmm5_run_parallel
@@ -49,8 +49,8 @@ def delete_swmm_files(fn_inp, including_inp=False):
 
 def get_report_errors(fn_rpt):
     if os.path.isfile(fn_rpt):
-        rpt = SwmmReport(fn_rpt)
-        errors = rpt.get_errors()
+        with SwmmReport(fn_rpt) as rpt:
+            errors = rpt.get_errors()
         if errors:
             return rpt._pretty_dict(errors)
         else:
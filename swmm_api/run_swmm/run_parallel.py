@@ -0,0 +1,270 @@
+import datetime
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .run import swmm5_run
+from ._run_helpers import SWMMRunError, get_result_filenames, delete_swmm_files
+from ..input_file import SEC
+from ..input_file._type_converter import time2delta
+from ..input_file.sections import FilesSection
+from ..output_file import SwmmOutput
+from ..output_file.out import SwmmOutputWarning
+from ..output_file.extract import _RECORDSIZE
+
+
+def _get_slab_boundaries(start, end, slabs, report_interval):
+    """
+    Get the boundaries of the slabs.
+
+    Args:
+        start (datetime.datetime): start of the reporting.
+        end (datetime.datetime): end of the simulation.
+        slabs (int | list[datetime.datetime]): number of slabs of equal length or the datetimes where a new slab starts.
+        report_interval (datetime.timedelta): report interval (the boundaries are on the reporting time grid).
+
+    Returns:
+        list[datetime.datetime]: start of each slab and the end of the last slab.
+    """
+    if isinstance(slabs, int):
+        n_periods = (end - start) // report_interval
+        if not 1 <= slabs <= n_periods:
+            raise SWMMRunError(f'The number of slabs ({slabs}) must be between 1 and the number of reporting periods ({n_periods}).')
+        boundaries = [start + int(round(n_periods * i / slabs)) * report_interval for i in range(1, slabs)]
+    else:
+        boundaries = sorted(slabs)
+        for boundary in boundaries:
+            if ((boundary - start) % report_interval) or not (start < boundary < end):
+                raise SWMMRunError(f'The slab boundary "{boundary}" is not on the reporting time grid between {start} and {end}.')
+    boundaries = [start] + sorted(set(boundaries)) + [end]
+    for slab_start, slab_end in zip(boundaries[:-1], boundaries[1:]):
+        if slab_end - slab_start < report_interval:
+            raise SWMMRunError(f'The slab from {slab_start} to {slab_end} is shorter than one report step ({report_interval}).')
+    return boundaries
+
+
+def _prepare_slab_inp(inp, fn_inp, report_start, end, spin_up, hotstart, first):
+    """
+    Write the inp-file of a slab.
+
+    Args:
+        inp (swmm_api.SwmmInput): inp-file-data of the whole simulation.
+        fn_inp (Path): path of the new inp-file.
+        report_start (datetime.datetime): start of the reporting of the slab.
+        end (datetime.datetime): end of the simulation of the slab.
+        spin_up (datetime.timedelta): duration of the simulation before the reporting starts.
+        hotstart (str | Path): hotstart file with the state at the start of the simulation.
+        first (bool): if it is the first slab (the original simulation start and hotstart files are kept).
+    """
+    from ..input_file.macros.macros import set_times
+
+    inp = inp.copy()
+    sim_start = inp.OPTIONS.get_start()
+
+    # saved interface files would be written by all slabs at the same time
+    files = inp.FILES if SEC.FILES in inp else FilesSection()
+    for key in list(files.keys()):
+        if key.startswith(FilesSection.KEYS.SAVE) or (not first and key == f'{FilesSection.KEYS.USE} {FilesSection.KEYS.HOTSTART}'):
+            del files[key]
+
+    if hotstart is not None:
+        files.use(FilesSection.KEYS.HOTSTART, str(Path(hotstart).absolute()))
+        head = None
+    elif first:
+        head = report_start - sim_start
+    else:
+        head = spin_up
+
+    if files:
+        inp[SEC.FILES] = files
+    elif SEC.FILES in inp:
+        del inp[SEC.FILES]
+
+    set_times(inp, report_start, end, head=head)
+    inp.write_file(fn_inp, fast=True, encoding='utf-8')
+
+
+def _stitch(fn_out, outs, boundaries):
+    """
+    Join the out-files of the slabs to one continuous out-file.
+
+    Each slab contributes the periods after its start boundary up to (and including) its end boundary.
+    The datetimes of the periods are copied unchanged.
+
+    Args:
+        fn_out (Path): path to the new out-file.
+        outs (list[SwmmOutput]): out-files of the slabs (in chronological order).
+        boundaries (list[datetime.datetime]): start of each slab and the end of the last slab.
+    """
+    from ..output_file._writer import _SwmmOutWriter
+    from ..output_file._basic_selective_results_numpy import _iter_selective_results, _get_rows_per_chunk
+
+    template = outs[0]
+    for out in outs[1:]:
+        if (out.labels != template.labels) or (out._bytes_per_period != template._bytes_per_period):
+            raise SWMMRunError(f'The out-files of the slabs have different objects ({out.filename}).')
+
+    i_period, _ = template._get_period_range(start=boundaries[0])
+    with _SwmmOutWriter(fn_out, template, start_date=template.start_date + i_period * template.report_interval) as writer:
+        # the datetime of the period (float64) is read as two float32 records and copied unchanged
+        offset_list = np.r_[0, _RECORDSIZE, writer.get_offsets()]
+        rows = _get_rows_per_chunk(template._bytes_per_period)
+
+        expected_start = None
+        for out, start, end in zip(outs, boundaries[:-1], boundaries[1:]):
+            # the first slab starts at the report start, the others after the end of the previous slab
+            i_period, n_periods = out._get_period_range(start=start if out is template else start + out.report_interval,
+                                                        end=end)
+            first_date = out.start_date + i_period * out.report_interval
+            if (expected_start is not None) and (first_date != expected_start):
+                raise SWMMRunError(f'The out-file of the slab starting at {start} has a gap ({first_date} != {expected_start}).')
+            expected_start = first_date + n_periods * out.report_interval
+
+            for values in _iter_selective_results(out.fp, offset_list, out._pos_start_output + i_period * out._bytes_per_period,
+                                                  n_periods, out._bytes_per_period, rows=rows):
+                writer.write_periods(values[:, 2:], datetimes=np.ascontiguousarray(values[:, :2]).view('<f8')[:, 0])
+
+
+def _check_continuity(outs, boundaries, atol, rtol):
+    """
+    Compare the overlapping periods of consecutive slabs.
+
+    Returns:
+        pandas.DataFrame: one row per boundary between two slabs.
+    """
+    from ..output_file.compare import _get_aligned_window, _StreamingDifference
+
+    records = []
+    for out_previous, out, boundary in zip(outs[:-1], outs[1:], boundaries[1:-1]):
+        columns = out._filter_part_columns()
+        i, i_previous, n_periods = _get_aligned_window(out, out_previous)
+        # SWMM reports an interpolated state in the first period after a delayed report start -> not compared
+        i, i_previous, n_periods = i + 1, i_previous + 1, max(n_periods - 1, 0)
+
+        difference = _StreamingDifference(len(columns), atol=atol, rtol=rtol)
+        for (i_period, values), (_, reference) in zip(out._iter_values(columns, i, n_periods),
+                                                      out_previous._iter_values(columns, i_previous, n_periods)):
+            difference.update(i_period, values, reference)
+
+        close = difference.n_diverging == 0
+        records.append({
+            'boundary': boundary,
+            'n_periods': difference.n,
+            'max_abs_error': difference.max_abs_error.max(initial=0),
+            'max_rel_error': difference.max_rel_error.max(initial=0),
+            'worst_column': '/'.join(columns[int(np.argmax(difference.max_abs_error))]) if columns else None,
+            'n_diverging_columns': int((~close).sum()),
+            'close': bool(close.all()),
+        })
+    return pd.DataFrame.from_records(records, index='boundary', columns=[
+        'boundary', 'n_periods', 'max_abs_error', 'max_rel_error', 'worst_column', 'n_diverging_columns', 'close'])
+
+
+def swmm5_run_parallel(inp, fn_out, slabs=4, spin_up=datetime.timedelta(days=7), overlap=datetime.timedelta(hours=6),
+                       hotstarts=None, processes=None, run=swmm5_run, working_dir=None, atol=1e-3, rtol=1e-2,
+                       cleanup=True):
+    """
+    Run a long continuous simulation in parallel time slabs and join the results to one out-file.
+
+    The simulation period is split into slabs, which are simulated in separate processes.
+    Each slab (except the first) starts with a spin-up period before its reporting starts,
+    or from a hotstart file with the state at the start of the slab.
+    The out-files of the slabs are joined to one continuous out-file.
+
+    The reporting of each slab (except the first) starts ``overlap`` before the end of the previous slab.
+    These overlapping periods are compared to validate the continuity at the boundaries between the slabs;
+    differences indicate that the spin-up period is too short.
+
+    Be aware that time series without dates (relative to the simulation start) are shifted for each slab.
+
+    Args:
+        inp (swmm_api.SwmmInput): inp-file-data of the whole simulation (start, report start and end in the ``OPTIONS``).
+        fn_out (str | Path): path to the joined out-file.
+        slabs (int | list[datetime.datetime]): number of slabs of equal length or the datetimes where a new slab starts.
+        spin_up (datetime.timedelta): simulation duration before the reporting of a slab starts
+            (a multiple of the report step).
+        overlap (datetime.timedelta): duration of the overlap of two consecutive slabs, compared for the continuity validation
+            (a multiple of the report step).
+        hotstarts (dict[int, str | Path]): hotstart files with the state at the start of the simulation of the slab
+            (i.e. ``overlap`` before the slab starts) for the slab number, which then run without spin-up.
+            Saved by SWMM (``SAVE HOTSTART``) or created with :meth:`~swmm_api.SwmmHotstart.from_out`.
+        processes (int): number of parallel processes. Default: number of CPUs.
+        run (function): function to run a simulation with the inp-filename as argument
+            (i.e. :func:`~swmm_api.run_swmm.run.swmm5_run` or :func:`~swmm_api.run_swmm.run_epaswmm.swmm5_run_epa`).
+            Must be picklable (defined at module level or a :func:`functools.partial` of such a function).
+        working_dir (str | Path): directory for the files of the slabs.
+            Default: a new directory ``<fn_out without suffix>_slabs_<random>`` next to ``fn_out``.
+            Relative paths in the inp-file must be valid in this directory.
+        atol (float): absolute tolerance for the continuity validation.
+        rtol (float): relative tolerance for the continuity validation.
+        cleanup (bool): delete the files of the slabs (``slab_*.inp``, ``.rpt`` and ``.out``) after joining the results.
+            The working directory itself is only deleted if it was created by this function.
+
+    Returns:
+        pandas.DataFrame: continuity validation with one row per boundary between two slabs
+            with the number of compared periods, maximum absolute and relative error, the column with the maximum error,
+            the number of columns which are not close and if all columns are close.
+    """
+    from multiprocessing import Pool
+
+    if hotstarts is None:
+        hotstarts = {}
+
+    # validate everything before any file is written or any process is started
+    report_interval = time2delta(inp.OPTIONS['REPORT_STEP'])
+    boundaries = _get_slab_boundaries(inp.OPTIONS.get_report_start(), inp.OPTIONS.get_end(), slabs, report_interval)
+
+    if (overlap < datetime.timedelta(0)) or (overlap % report_interval):
+        raise SWMMRunError(f'The overlap ({overlap}) must be a multiple of the report step ({report_interval}).')
+    if any(i not in hotstarts for i in range(1, len(boundaries) - 1)) and (
+            (spin_up < datetime.timedelta(0)) or (spin_up % report_interval)):
+        raise SWMMRunError(f'The spin-up ({spin_up}) must be a multiple of the report step ({report_interval}).')
+
+    fn_out = Path(fn_out)
+    if working_dir is None:
+        fn_out.parent.mkdir(parents=True, exist_ok=True)
+        working_dir = Path(tempfile.mkdtemp(prefix=f'{fn_out.stem}_slabs_', dir=fn_out.parent))
+        created_working_dir = True
+    else:
+        working_dir = Path(working_dir)
+        created_working_dir = not working_dir.exists()
+        working_dir.mkdir(parents=True, exist_ok=True)
+
+    filenames = []
+    for i, (start, end) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        fn_inp = working_dir / f'slab_{i:03d}.inp'
+        _prepare_slab_inp(inp, fn_inp, start if i == 0 else start - overlap, end, spin_up, hotstarts.get(i), i == 0)
+        filenames.append(fn_inp)
+
+    with Pool(processes) as pool:
+        pool.map(run, filenames)
+
+    outs = [SwmmOutput(get_result_filenames(fn_inp)[1]) for fn_inp in filenames]
+    try:
+        for out in outs:
+            if out.run_failed:
+                raise SWMMRunError(f'The simulation of the slab "{out.filename}" failed.')
+
+        continuity = _check_continuity(outs, boundaries, atol, rtol)
+        if not continuity['close'].all():
+            warnings.warn(f'The results of the slabs are not continuous at '
+                          f'{list(continuity.index[~continuity["close"]])}. The spin-up period may be too short.',
+                          SwmmOutputWarning)
+
+        _stitch(fn_out, outs, boundaries)
+    finally:
+        for out in outs:
+            out.close()
+
+    if cleanup:
+        # other files in a given working directory are kept
+        for fn_inp in filenames:
+            delete_swmm_files(fn_inp, including_inp=True)
+        if created_working_dir:
+            shutil.rmtree(working_dir)
+
+    return continuity
@@ -23,7 +23,9 @@ class SwmmResults:
     @property
     def rpt(self):
         if self._rpt is None:
-            self._rpt = SwmmReport(self._fn_rpt)
+            with SwmmReport(self._fn_rpt) as rpt:
+                rpt.load()
+            self._rpt = rpt
         return self._rpt
 
     @property
@@ -72,7 +74,8 @@ def dummy_run(inp, skip_rpt=False, skip_out=False):
     if skip_rpt:
         rpt = None
     else:
-        rpt = SwmmReport(fn_rpt)
+        with SwmmReport(fn_rpt) as rpt:
+            rpt.load()
 
     if skip_out:
         out = None
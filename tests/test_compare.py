@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+
+from swmm_api import SwmmOutput
+from swmm_api.output_file import compare_out_files, _basic_selective_results_numpy
+
+FN_OUT = Path(__file__).parent.parent / 'examples' / 'epaswmm5_apps_manual' / 'Example7-Final.out'
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Read only about 4 kB at a time, so the files are read in many chunks."""
+    get_rows_per_chunk = _basic_selective_results_numpy._get_rows_per_chunk
+    monkeypatch.setattr(_basic_selective_results_numpy, '_get_rows_per_chunk',
+                        lambda bytes_per_period, chunk_bytes=None: get_rows_per_chunk(bytes_per_period, 2 ** 12))
+
+
+def test_compare_different_layouts(tmp_path, small_chunks):
+    with SwmmOutput(FN_OUT) as out:
+        fn_subset = out.write_subset(tmp_path / 'subset.out', kind='node', show_progress=False)
+
+    with SwmmOutput(fn_subset) as subset, SwmmOutput(FN_OUT) as out:
+        assert subset._bytes_per_period != out._bytes_per_period
+        assert out.n_periods > 4096 // out._bytes_per_period
+
+        df = compare_out_files(FN_OUT, fn_subset, kind='node')
+    assert df['close'].all()
+    assert df['max_abs_error'].max() == 0
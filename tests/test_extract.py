@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from swmm_api import SwmmOutput
+
+FN_OUT = Path(__file__).parent.parent / 'examples' / 'epaswmm5_apps_manual' / 'Example7-Final.out'
+
+
+def test_truncated_labels(tmp_path):
+    fn = tmp_path / 'truncated.out'
+    # cut off in the labels block, which starts after the 7 integers of the opening records
+    fn.write_bytes(FN_OUT.read_bytes()[:7 * 4 + 50])
+    with pytest.warns(Warning), pytest.raises(EOFError):
+        SwmmOutput(fn)
+
+
+def test_follow_from_header_only(tmp_path):
+    with SwmmOutput(FN_OUT) as reference:
+        pos_start_output = reference._pos_start_output
+        bytes_per_period = reference._bytes_per_period
+        start_date = reference.start_date
+        n_periods = reference.n_periods
+        expected = reference.get_part('node', None, 'depth')
+    data = FN_OUT.read_bytes()
+
+    # state of the file right after SWMM has started: complete header, but no period
+    fn = tmp_path / 'running.out'
+    fn.write_bytes(data[:pos_start_output])
+    with pytest.warns(Warning):
+        out = SwmmOutput(fn)
+    with out:
+        assert out.n_periods == 0
+        assert out.start_date == start_date
+
+        with open(fn, 'ab') as f:
+            f.write(data[pos_start_output:pos_start_output + 10 * bytes_per_period + 5])
+        assert out.refresh() == 10
+        assert out.start_date == start_date
+
+        # the rest of the periods and the closing records
+        with open(fn, 'ab') as f:
+            f.write(data[pos_start_output + 10 * bytes_per_period + 5:])
+        chunks = list(out.follow('node', None, 'depth', interval=0, from_start=True))
+        assert out.n_periods == n_periods
+        assert chunks[0].index[0] == expected.index[0]
+        assert (pd.concat(chunks) == expected).all().all()